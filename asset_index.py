@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Website Asset Index
+One scan of texts/ and pdfs/{published,unpublished} per website update,
+mapping case numbers to their PDF, opinion text and brief text, so the
+updaters' path resolvers are dictionary lookups instead of a directory
+glob per episode
+
+A case number matches a file when it is one of the letter/digit runs in
+the file name, the way the pipelines name every file
+(B333052_Conservatorship_of_ANNE_S_published.pdf,
+B333052_(Case_Brief)_..._(published).txt). When several files match, the
+first by name wins.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+_TOKEN = re.compile(r'[A-Za-z0-9]+')
+
+# Kinds of asset recorded per case number
+BRIEF = 'brief'        # texts/<case>..._Case_Brief... (name starts with the case number)
+OPINION = 'opinion'    # texts/ opinion text, not a brief
+TEXT = 'text'          # any texts/ file naming the case
+PDF = 'pdf'            # pdfs/published/ first, then pdfs/unpublished/
+
+OPINION_KEYWORDS = ('published', 'unpublished', 'estate', 'conservatorship')
+
+
+def is_brief_name(filename: str) -> bool:
+    lower = filename.lower()
+    return 'case_brief' in lower or '_brief' in lower
+
+
+class AssetIndex:
+    """Case number → {pdf, opinion, brief, text} web paths for one website directory"""
+
+    def __init__(self, website_dir, texts_subdir: str = "texts",
+                 pdf_subdirs: Tuple[str, ...] = ("published", "unpublished")):
+        self.website_dir = Path(website_dir)
+        self.texts_subdir = texts_subdir
+        self.pdf_subdirs = pdf_subdirs
+        self.cases: Dict[str, Dict[str, str]] = {}
+        self.texts: Dict[str, str] = {}        # file name -> web path
+        self.texts_lower: Dict[str, str] = {}  # lowercased file name -> web path
+        self.pdfs: Dict[str, str] = {}         # file name -> web path, published first
+        self.refresh()
+
+    def refresh(self):
+        """Rescan the asset directories"""
+        self.cases, self.texts, self.texts_lower, self.pdfs = {}, {}, {}, {}
+
+        texts_dir = self.website_dir / self.texts_subdir
+        for name in self._names(texts_dir, "*.txt"):
+            web_path = f"{self.texts_subdir}/{name}"
+            self.texts[name] = web_path
+            self.texts_lower.setdefault(name.lower(), web_path)
+            tokens = {token.upper() for token in _TOKEN.findall(name)}
+            for token in tokens:
+                self._add(token, TEXT, web_path)
+            lower = name.lower()
+            if 'case_brief' in lower:
+                leading = _TOKEN.match(name)
+                if leading:
+                    self._add(leading.group().upper(), BRIEF, web_path)
+            elif not is_brief_name(name) and any(keyword in lower for keyword in OPINION_KEYWORDS):
+                for token in tokens:
+                    self._add(token, OPINION, web_path)
+
+        for subdir in self.pdf_subdirs:
+            for name in self._names(self.website_dir / "pdfs" / subdir, "*.pdf"):
+                web_path = f"pdfs/{subdir}/{name}"
+                self.pdfs.setdefault(name, web_path)
+                for token in {token.upper() for token in _TOKEN.findall(name)}:
+                    self._add(token, PDF, web_path)
+
+    @staticmethod
+    def _names(directory: Path, pattern: str):
+        if not directory.is_dir():
+            return []
+        return sorted(path.name for path in directory.glob(pattern) if path.is_file())
+
+    def _add(self, case_number: str, kind: str, web_path: str):
+        self.cases.setdefault(case_number, {}).setdefault(kind, web_path)
+
+    def lookup(self, case_number: str, kind: str) -> Optional[str]:
+        """Web path of the first asset of a kind for a case number, or None"""
+        if not case_number:
+            return None
+        return self.cases.get(case_number.upper(), {}).get(kind)
+
+    def text_file(self, filename: str, ignore_case: bool = False) -> Optional[str]:
+        """Web path of texts/<filename>, or None"""
+        if ignore_case:
+            return self.texts_lower.get(filename.lower())
+        return self.texts.get(filename)
+
+    def pdf_file(self, filename: str) -> Optional[str]:
+        """Web path of pdfs/published/<filename> or pdfs/unpublished/<filename>, or None"""
+        return self.pdfs.get(filename)
+
+    def signature(self) -> str:
+        """Digest of every indexed file name; changes whenever a resolver's answer could"""
+        digest = hashlib.sha256()
+        for web_path in sorted(self.texts.values()) + sorted(set(self.pdfs.values())):
+            digest.update(web_path.encode('utf-8') + b'\n')
+        return digest.hexdigest()
+
+    def summary(self) -> str:
+        counts = {kind: sum(1 for assets in self.cases.values() if kind in assets) for kind in (PDF, OPINION, BRIEF)}
+        return (f"{len(self.texts)} texts, {len(self.pdfs)} PDFs; case numbers with a PDF: {counts[PDF]}, "
+                f"opinion text: {counts[OPINION]}, brief: {counts[BRIEF]}")
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Brief Pipeline Benchmark
+Runs pdfs/brief_engine.py end to end against a generated corpus of
+opinions and a deterministic fake LLM, so chunking, concurrency and
+caching changes can be compared offline and reproducibly
+
+Usage:
+    python benchmarks/bench_brief_pipeline.py --opinions 30 --latency 0.2 --token-rate 400
+    python benchmarks/bench_brief_pipeline.py --context-window 4096 --no-tree-reduce --json
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+import brief_engine
+import chunker
+from brief_progress import read_events
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+CHARS_PER_PAGE = 3000
+
+_SURNAMES = ["Alvarez", "Boyajian", "Chen", "Delgado", "Ellison", "Fujimoto", "Garcia", "Harlan",
+             "Ibarra", "Jensen", "Kaur", "Lopez", "Moreno", "Nakamura", "Okafor", "Patel"]
+_CASE_TYPES = ["Estate of", "Conservatorship of", "Guardianship of", "Trust of"]
+_SECTIONS = ["1800", "1801", "1820", "1828.5", "2351", "4264", "6110", "8800", "15642", "16061.7", "17200", "21310"]
+_CITATIONS = ["(2019) 7 Cal.5th 1", "(2021) 63 Cal.App.5th 312", "(2016) 1 Cal.5th 892",
+              "(2008) 43 Cal.4th 1", "(2017) 14 Cal.App.5th 1127", "(1998) 62 Cal.App.4th 1207"]
+_CLAUSES = [
+    "the trial court found by clear and convincing evidence that",
+    "appellant contends on appeal that",
+    "the probate court appointed the public guardian after",
+    "respondent filed a petition under Probate Code section {section} alleging that",
+    "we review the order for substantial evidence and conclude that",
+    "the trustee failed to account to the beneficiaries, and",
+    "the record does not support the claim that",
+    "as explained in Estate of {surname} {citation},",
+    "the conservatee objected to the appointment, and",
+    "the decedent executed a holographic will in which"
+]
+_ENDINGS = [
+    "the order must be affirmed.",
+    "the petition was properly denied.",
+    "the court did not abuse its discretion.",
+    "the matter is remanded for further proceedings.",
+    "no prejudicial error occurred.",
+    "the beneficiaries were entitled to notice."
+]
+
+
+# === Corpus ===
+def generate_opinion(rng: random.Random, pages: int) -> str:
+    """A synthetic opinion of roughly the given number of pages"""
+    target = pages * CHARS_PER_PAGE
+    paragraphs = []
+    size = 0
+    while size < target:
+        sentences = []
+        for _ in range(rng.randint(3, 9)):
+            clause = rng.choice(_CLAUSES).format(section=rng.choice(_SECTIONS),
+                                                 surname=rng.choice(_SURNAMES),
+                                                 citation=rng.choice(_CITATIONS))
+            # A record citation per sentence keeps separate opinions from sharing most of their shingles
+            sentences.append(f"{clause[0].upper()}{clause[1:]} {rng.choice(_ENDINGS)} "
+                             f"({rng.randint(1, 9)} CT {rng.randint(1, 3000)}.)")
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+def generate_corpus(directory: Path, opinions: int, min_pages: int, max_pages: int, seed: int) -> List[Path]:
+    """Write opinions with realistic names and a long-tailed page distribution"""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(opinions):
+        pages = min(max_pages, max(min_pages, int(rng.lognormvariate(2.7, 0.6))))
+        status = "published" if rng.random() < 0.3 else "unpublished"
+        name = f"{rng.choice(_CASE_TYPES)} {rng.choice(_SURNAMES)}".replace(' ', '_')
+        path = directory / f"B{300000 + i:06d}_{name}_{status}.txt"
+        path.write_text(generate_opinion(rng, pages), encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+# === Fake LLM ===
+class FakeOllama:
+    """Deterministic stand-in for OllamaClient with a simple latency model
+
+    latency = base latency + prompt tokens / prefill rate + response tokens / token rate,
+    stretched by ``contention`` for every other call running at the same time.
+    """
+
+    def __init__(self, latency: float = 0.05, token_rate: float = 2000.0, prefill_rate: float = 20000.0,
+                 response_tokens: int = 300, contention: float = 0.25):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.prefill_rate = prefill_rate
+        self.response_tokens = response_tokens
+        self.contention = contention
+        self.options = {}  # the engine's prefix warm-up copies these, like OllamaClient's
+        self.calls = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _response(self, prompt: str) -> List[str]:
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        rng = random.Random(digest)
+        words = ["court", "probate", "petition", "trustee", "estate", "section", "affirmed", "appeal",
+                 "conservator", "evidence", "finding", "order", "beneficiary", "notice", "will"]
+        count = max(1, int(self.response_tokens * rng.uniform(0.8, 1.2)))
+        return [rng.choice(words) for _ in range(count)]
+
+    def generate(self, prompt: str, on_token: Optional[Callable[[str], None]] = None, **params) -> str:
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            slowdown = 1 + self.contention * (self._active - 1)
+        try:
+            tokens = self._response(prompt)
+            time.sleep((self.latency + chunker.estimate_tokens(prompt) / self.prefill_rate) * slowdown)
+            # Stream in blocks so sleep granularity does not dominate
+            block = 32
+            for start in range(0, len(tokens), block):
+                piece = tokens[start:start + block]
+                time.sleep(len(piece) / self.token_rate * slowdown)
+                if on_token:
+                    for token in piece:
+                        on_token(token + " ")
+            return " ".join(tokens)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def close(self):
+        pass
+
+
+# === Reporting ===
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def stage_timings(events: List[dict]) -> dict:
+    stages = {"chunk": "chunk_finished", "merge": "merge_finished", "brief": "brief_finished"}
+    timings = {}
+    for stage, event_name in stages.items():
+        latencies = [e["latency_s"] for e in events if e["event"] == event_name and "latency_s" in e]
+        timings[stage] = {
+            "calls": len(latencies),
+            "total_s": round(sum(latencies), 3),
+            "mean_s": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_s": round(_percentile(latencies, 0.5), 3),
+            "p95_s": round(_percentile(latencies, 0.95), 3)
+        }
+    files = [e["elapsed_s"] for e in events if e["event"] == "file_finished"]
+    timings["file"] = {
+        "count": len(files),
+        "mean_s": round(sum(files) / len(files), 3) if files else 0.0,
+        "p95_s": round(_percentile(files, 0.95), 3)
+    }
+    # Time from the start of the run until each brief was written
+    started = next((e["mono"] for e in events if e["event"] == "run_started"), None)
+    finished = [e for e in events if e["event"] == "file_finished"]
+    for name, group in (("done", finished), ("done_published", [e for e in finished if "_published" in e["file"]])):
+        done = [e["mono"] - started for e in group] if started is not None else []
+        timings[name] = {
+            "count": len(done),
+            "mean_s": round(sum(done) / len(done), 3) if done else 0.0,
+            "p50_s": round(_percentile(done, 0.5), 3),
+            "max_s": round(max(done), 3) if done else 0.0
+        }
+    return timings
+
+
+def run_once(corpus_dir: Path, work_dir: Path, fake: FakeOllama, label: str, verbose: bool = False) -> dict:
+    progress_file = work_dir / f"progress_{label}.jsonl"
+    engine = brief_engine.BriefEngine(cache_dir=work_dir / "cache", progress_file=progress_file,
+                                      journal_file=work_dir / f"journal_{label}.sqlite3",
+                                      index_file=work_dir / f"index_{label}.sqlite3",
+                                      metrics_file=work_dir / f"metrics_{label}.prom")
+    engine.client = fake
+    calls_before = fake.calls
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+        engine.run({corpus_dir: "journal_article"})
+    wall = time.perf_counter() - started
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    engine.progress.close()
+
+    events, _ = read_events(progress_file)
+    chunks = sum(1 for e in events if e["event"] == "chunk_finished")
+    return {
+        "label": label,
+        "wall_s": round(wall, 3),
+        "files": sum(1 for e in events if e["event"] == "file_finished"),
+        "chunks": chunks,
+        "chunks_per_s": round(chunks / wall, 2) if wall else 0.0,
+        "llm_calls": fake.calls - calls_before,
+        "cache": engine.cache.stats(),
+        "concurrency_final": engine.concurrency.level,
+        "concurrency_best": engine.concurrency.best_level(),
+        "peak_traced_mb": round(peak_traced / (1024 * 1024), 2),
+        "max_rss_mb": max_rss_mb(),
+        "stages": stage_timings(events)
+    }
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process, or None where the resource module is missing (Windows)"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def print_report(result: dict):
+    print(f"\n=== {result['label']} ===")
+    print(f"  Wall time:     {result['wall_s']:.2f}s for {result['files']} opinions")
+    print(f"  Chunks:        {result['chunks']} ({result['chunks_per_s']:.2f}/s)")
+    print(f"  LLM calls:     {result['llm_calls']} (cache {result['cache']['hits']} hits / {result['cache']['misses']} misses)")
+    print(f"  Concurrency:   final {result['concurrency_final']}, best {result['concurrency_best']}")
+    rss = f"{result['max_rss_mb']:.1f} MB" if result['max_rss_mb'] is not None else "unavailable"
+    print(f"  Memory:        {result['peak_traced_mb']:.1f} MB peak traced, max RSS {rss}")
+    print(f"  {'Stage':<8}{'calls':>7}{'total':>10}{'mean':>9}{'p50':>9}{'p95':>9}")
+    for stage in ("chunk", "merge", "brief"):
+        s = result["stages"][stage]
+        print(f"  {stage:<8}{s['calls']:>7}{s['total_s']:>9.2f}s{s['mean_s']:>8.3f}s{s['p50_s']:>8.3f}s{s['p95_s']:>8.3f}s")
+    for name, label in (("done", "all"), ("done_published", "published")):
+        d = result["stages"][name]
+        print(f"  Brief ready ({label}): mean {d['mean_s']:.2f}s, p50 {d['p50_s']:.2f}s, "
+              f"last {d['max_s']:.2f}s after start ({d['count']} briefs)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the brief pipeline with a fake LLM")
+    parser.add_argument("--opinions", type=int, default=12)
+    parser.add_argument("--min-pages", type=int, default=4)
+    parser.add_argument("--max-pages", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fixed seconds per LLM call")
+    parser.add_argument("--token-rate", type=float, default=2000.0, help="Generated tokens per second")
+    parser.add_argument("--prefill-rate", type=float, default=20000.0, help="Prompt tokens per second")
+    parser.add_argument("--response-tokens", type=int, default=300)
+    parser.add_argument("--contention", type=float, default=0.25, help="Slowdown per concurrent call")
+    parser.add_argument("--context-window", type=int, default=brief_engine.CONTEXT_WINDOW)
+    parser.add_argument("--overlap", type=int, default=brief_engine.CHUNK_OVERLAP_TOKENS)
+    parser.add_argument("--workers", type=int, default=brief_engine.INITIAL_WORKERS, help="Initial concurrency")
+    parser.add_argument("--files-in-flight", type=int, default=brief_engine.FILES_IN_FLIGHT)
+    parser.add_argument("--no-tree-reduce", action="store_true")
+    parser.add_argument("--no-priority", action="store_true", help="Admit opinions in filename order")
+    parser.add_argument("--warm", action="store_true", help="Run a second time against the warm cache")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the engine's own output")
+    args = parser.parse_args(argv)
+
+    brief_engine.CONTEXT_WINDOW = args.context_window
+    brief_engine.CHUNK_OVERLAP_TOKENS = args.overlap
+    brief_engine.INITIAL_WORKERS = args.workers
+    brief_engine.FILES_IN_FLIGHT = args.files_in_flight
+    brief_engine.TREE_REDUCE = not args.no_tree_reduce
+    brief_engine.PRIORITIZE = not args.no_priority
+
+    fake = FakeOllama(latency=args.latency, token_rate=args.token_rate, prefill_rate=args.prefill_rate,
+                      response_tokens=args.response_tokens, contention=args.contention)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="brief_bench_") as tmp:
+        work_dir = Path(tmp)
+        corpus_dir = work_dir / "corpus"
+        paths = generate_corpus(corpus_dir, args.opinions, args.min_pages, args.max_pages, args.seed)
+        corpus_bytes = sum(path.stat().st_size for path in paths)
+        results.append(run_once(corpus_dir, work_dir, fake, "cold", args.verbose))
+
+        if args.warm:
+            # Put the originals back and drop the briefs so only the cache can help
+            for output_dir in [d for d in corpus_dir.iterdir() if d.is_dir()]:
+                for path in output_dir.iterdir():
+                    if "_Case_Briefs_" in output_dir.name:
+                        path.unlink()
+                    else:
+                        path.rename(corpus_dir / path.name)
+            results.append(run_once(corpus_dir, work_dir, fake, "warm", args.verbose))
+
+    summary = {
+        "corpus": {"opinions": args.opinions, "bytes": corpus_bytes, "seed": args.seed},
+        "settings": {k: v for k, v in vars(args).items() if k not in ("json", "verbose")},
+        "runs": results
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"\n📚 Corpus: {args.opinions} opinions, {corpus_bytes / 1024:.0f} KB (seed {args.seed})")
+        for result in results:
+            print_report(result)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
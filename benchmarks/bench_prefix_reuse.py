@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Prompt Prefix Reuse Benchmark
+Sends the brief engine's real chunk prompts through OllamaClient to the
+stub server's model of Ollama's prompt cache, and compares prefill and
+model-load time with and without keep_alive plus prefix warm-up
+
+Each opinion's chunks are sent as one parallel batch, followed by an idle
+gap (fingerprinting, a long final brief) that can outlast the server's
+default keep-alive. Times are scaled down; the ratios are what matter.
+
+Usage:
+    python benchmarks/bench_prefix_reuse.py
+    python benchmarks/bench_prefix_reuse.py --opinions 6 --gap 2 --server-keep-alive 1 --json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+import brief_engine
+import chunker
+from bench_brief_pipeline import generate_opinion
+from ollama_client import OllamaClient
+from ollama_stub_server import StubOllamaServer
+
+PREFIX = brief_engine.prompt_prefix(brief_engine.PROFILES["journal_article"].chunk_prompt)
+
+
+def chunk_prompts(opinions: int, pages: int, seed: int) -> List[List[str]]:
+    """The journal_article chunk prompts the engine would send, per opinion"""
+    profile = brief_engine.PROFILES["journal_article"]
+    budget = chunker.chunk_token_budget(brief_engine.CONTEXT_WINDOW, profile.chunk_prompt,
+                                        brief_engine.RESPONSE_RESERVE_TOKENS)
+    rng = random.Random(seed)
+    batches = []
+    for _ in range(opinions):
+        chunks = chunker.chunk_text(generate_opinion(rng, pages), budget)
+        batches.append([profile.chunk_prompt.format(index=i + 1, total=len(chunks), text=chunk)
+                        for i, chunk in enumerate(chunks)])
+    return batches
+
+
+def run_mode(label: str, batches: List[List[str]], args, keep_alive=None, warm: bool = False) -> dict:
+    server = StubOllamaServer(prefill_rate=args.prefill_rate, load_time=args.load_time, slots=args.workers,
+                              default_keep_alive=args.server_keep_alive,
+                              responder=lambda prompt: "summary " * args.response_words)
+    server.start()
+    client = OllamaClient(host=server.url, pool_size=args.workers, options={"num_ctx": brief_engine.CONTEXT_WINDOW},
+                          keep_alive=keep_alive)
+    stats = []
+
+    def call(prompt):
+        message = {}
+        client.generate(prompt, on_done=message.update)
+        stats.append(message)
+
+    busy = 0.0
+    try:
+        if warm:
+            # What WARM_PROMPT_PREFIXES does while the engine fingerprints: off the chunk path
+            client.generate(PREFIX, options=dict(client.options, num_predict=1))
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            for batch in batches:
+                started = time.perf_counter()
+                list(pool.map(call, batch))
+                busy += time.perf_counter() - started
+                time.sleep(args.gap)
+    finally:
+        client.close()
+        server.stop()
+
+    prompt_words = sum(len(prompt.split()) for batch in batches for prompt in batch)
+    evaluated = sum(message.get("prompt_eval_count", 0) for message in stats)
+    return {
+        "label": label,
+        "chunks": len(stats),
+        "busy_s": round(busy, 3),
+        "prefill_s": round(sum(message.get("prompt_eval_duration", 0) for message in stats) / 1e9, 3),
+        "load_s": round(sum(message.get("load_duration", 0) for message in stats) / 1e9, 3),
+        "prompt_tokens": prompt_words,
+        "evaluated_tokens": evaluated,
+        "cached_fraction": round(1 - evaluated / prompt_words, 3) if prompt_words else 0.0
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark prompt prefix reuse against the stub Ollama server")
+    parser.add_argument("--opinions", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=12, help="pages per opinion")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4, help="parallel requests and server slots")
+    parser.add_argument("--prefill-rate", type=float, default=4000.0, help="prompt tokens per second")
+    parser.add_argument("--load-time", type=float, default=1.0, help="seconds to load the model")
+    parser.add_argument("--server-keep-alive", type=float, default=1.0,
+                        help="server default keep_alive, in scaled seconds (Ollama's is 5 minutes)")
+    parser.add_argument("--gap", type=float, default=1.5, help="idle seconds between opinions")
+    parser.add_argument("--response-words", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    batches = chunk_prompts(args.opinions, args.pages, args.seed)
+    results = [
+        run_mode("before", batches, args),
+        run_mode("keep_alive + warm prefix", batches, args, keep_alive=brief_engine.KEEP_ALIVE, warm=True)
+    ]
+    prefix_words = len(PREFIX.split())
+
+    if args.json:
+        print(json.dumps({"settings": vars(args), "prefix_tokens": prefix_words, "runs": results}, indent=2))
+    else:
+        print(f"📚 {args.opinions} opinions, {results[0]['chunks']} chunk prompts, "
+              f"{prefix_words}-token instruction prefix")
+        print(f"  {'mode':<26}{'busy':>9}{'prefill':>10}{'load':>8}{'evaluated':>11}{'cached':>9}")
+        for r in results:
+            print(f"  {r['label']:<26}{r['busy_s']:>8.2f}s{r['prefill_s']:>9.2f}s{r['load_s']:>7.2f}s"
+                  f"{r['evaluated_tokens']:>11}{r['cached_fraction']:>9.0%}")
+        before, after = results
+        if after["prefill_s"] + after["load_s"]:
+            print(f"  ⚡ Prefill + load {before['prefill_s'] + before['load_s']:.2f}s → "
+                  f"{after['prefill_s'] + after['load_s']:.2f}s on the chunk path")
+    return results
+
+
+if __name__ == "__main__":
+    main()
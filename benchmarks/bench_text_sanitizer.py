@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Text Sanitizer Micro-Benchmark
+Times text_sanitizer profiles against the re.sub chains they replaced on
+large generated briefs, and checks that the output is identical (TTS,
+clean_title, and the whitespace profile fix_javascript_syntax_errors.py uses)
+
+Usage:
+    python benchmarks/bench_text_sanitizer.py
+    python benchmarks/bench_text_sanitizer.py --size-kb 2048 --repeat 5 --json
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import text_sanitizer
+
+_WORDS = ["probate", "conservatorship", "trustee", "petition", "section", "court", "appellant",
+          "respondent", "estate", "beneficiary", "affirmed", "the", "of", "and", "to", "under"]
+_MARKDOWN_NOISE = ["**", "*", "[", "]", "{", "}", "#", "###", "\n\n", "\n", "\t", "  "]
+_UNICODE_NOISE = _MARKDOWN_NOISE + ["•", "▪", "◦", "‣", "─", "━", "┈", "▬", "▰"]
+_DESCRIPTIONS = ["  Estate of Garcia\n\nThe court held\tthat the trustee...  ", "Ends with </script> tag",
+                 "Control\x01chars\x7f and\x1c separators\u00a0and\u2028breaks", "", " \n "]
+_TITLES = ["B333052_Estate_of_Garcia_published.pdf", "A160921__Conservatorship_of_Lee_unpublished.txt",
+           "C098765_In_re_Trust_of_Patel.MP3", "G061234 Estate_of   Kaur__published",
+           "D080001_Guardianship_of_Ortiz.pdf", "Untitled", "E_unpublished_Matter_of_Chen.PDF"]
+
+
+def legacy_clean_special_characters(text):
+    """The six-pass chain from the original brief_cases.py scripts"""
+    text = re.sub(r'\*+', '', text)
+    text = re.sub(r'[•▪▫◦‣⁃]', '', text)
+    text = re.sub(r'[─━┄┅┈┉─]', '', text)
+    text = re.sub(r'[▬▭▮▯▰▱]', '', text)
+    text = re.sub(r'[\[\]{}]', '', text)
+    text = re.sub(r'#+', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_clean_title(title):
+    """The chain from ComprehensiveWebsiteUpdaterProBrep._clean_title"""
+    if not title:
+        return "Untitled Case"
+    title = re.sub(r'\.(pdf|txt|mp3)$', '', title, flags=re.IGNORECASE)
+    title = re.sub(r'_published|_unpublished', '', title)
+    title = re.sub(r'_+', ' ', title)
+    title = re.sub(r'\s+', ' ', title)
+    return title.strip().title()
+
+
+def legacy_collapse_whitespace(text):
+    """The description cleanup from fix_javascript_syntax_errors.py"""
+    return re.sub(r'\s+', ' ', text.strip())
+
+
+def generate_brief(size_kb: int, seed: int, noise=_UNICODE_NOISE) -> str:
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size_kb * 1024:
+        token = rng.choice(noise) if rng.random() < 0.12 else rng.choice(_WORDS)
+        parts.append(token)
+        parts.append(" ")
+        length += len(token) + 1
+    return "".join(parts)
+
+
+def time_call(func, text: str, repeat: int) -> float:
+    """Best of ``repeat`` runs, in seconds"""
+    return min(timeit.repeat(lambda: func(text), number=1, repeat=repeat))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the shared text sanitizer against the old regex chains")
+    parser.add_argument("--size-kb", type=int, default=512, help="size of each generated brief")
+    parser.add_argument("--briefs", type=int, default=3, help="number of generated briefs")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    corpora = {
+        "markdown": [generate_brief(args.size_kb, args.seed + i, _MARKDOWN_NOISE) for i in range(args.briefs)],
+        "unicode": [generate_brief(args.size_kb, args.seed + i, _UNICODE_NOISE) for i in range(args.briefs)]
+    }
+    mismatches = sum(legacy_clean_title(t) != text_sanitizer.clean_title(t) for t in _TITLES)
+    mismatches += sum(legacy_collapse_whitespace(d) != text_sanitizer.WHITESPACE(d) for d in _DESCRIPTIONS)
+    results = {"briefs": args.briefs, "size_kb": args.size_kb}
+
+    for name, briefs in corpora.items():
+        mismatches += sum(legacy_clean_special_characters(b) != text_sanitizer.TTS(b) for b in briefs)
+        mismatches += sum(legacy_collapse_whitespace(b) != text_sanitizer.WHITESPACE(b) for b in briefs)
+        legacy = sum(time_call(legacy_clean_special_characters, b, args.repeat) for b in briefs)
+        shared = sum(time_call(text_sanitizer.TTS, b, args.repeat) for b in briefs)
+        results[f"tts_{name}_legacy_ms"] = round(legacy * 1000, 2)
+        results[f"tts_{name}_sanitizer_ms"] = round(shared * 1000, 2)
+        results[f"tts_{name}_speedup"] = round(legacy / shared, 2) if shared else None
+
+    title_legacy = sum(time_call(legacy_clean_title, t, args.repeat * 200) for t in _TITLES)
+    title_shared = sum(time_call(text_sanitizer.clean_title, t, args.repeat * 200) for t in _TITLES)
+    results["title_legacy_us"] = round(title_legacy * 1e6, 1)
+    results["title_sanitizer_us"] = round(title_shared * 1e6, 1)
+    results["title_speedup"] = round(title_legacy / title_shared, 2) if title_shared else None
+    results["mismatches"] = mismatches
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"📊 {args.briefs} briefs × {args.size_kb} KB")
+        for name in corpora:
+            print(f"  TTS chain ({name}):  {results[f'tts_{name}_legacy_ms']:.2f} ms → "
+                  f"{results[f'tts_{name}_sanitizer_ms']:.2f} ms ({results[f'tts_{name}_speedup']}x)")
+        print(f"  Title chain:          {results['title_legacy_us']:.1f} µs → {results['title_sanitizer_us']:.1f} µs "
+              f"({results['title_speedup']}x)")
+        print(f"  {'✅ Outputs identical' if not mismatches else f'❌ {mismatches} outputs differ'}")
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Incremental Catalog Build Cache
+Remembers, per source database, the file's size/mtime/sha256 and what
+the website updater derived from it, so a nightly run only
+re-converts sources that changed and skips rewriting index.html when the
+finished episode list is the same as last time
+
+Delete the cache file (logs/catalog_build_cache.json) to force a full rebuild.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_stamp(*paths) -> str:
+    """Cheap change marker for files that are not worth hashing (e.g. a SQLite database and its WAL)"""
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append("-")
+    return "/".join(parts)
+
+
+def combine(*parts: str) -> str:
+    """One digest over several input signatures"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = str(part).encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class CatalogBuildCache:
+    """JSON file of source digests, what was derived from them and the last HTML output"""
+
+    def __init__(self, path, version: str):
+        self.path = Path(path)
+        self.version = version
+        self.reused = []
+        self.rebuilt = []
+        self._used: Dict[str, str] = {}  # source name -> digest and inputs it was built from this run
+        self._dirty = False
+        data = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if data.get('version') != version:
+            data = {}  # converter changes invalidate every derived episode
+        self.files: Dict[str, dict] = data.get('files', {})
+        self.sources: Dict[str, dict] = data.get('sources', {})
+        self.output: dict = data.get('output', {})
+
+    def digest(self, path) -> str:
+        """sha256 of a file, recomputed only when its size or mtime changed; "missing" if absent"""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return "missing"
+        known = self.files.get(str(path))
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        self.files[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+        self._dirty = True
+        return digest.hexdigest()
+
+    def state(self, path, inputs: str) -> str:
+        """A source file's digest plus the other inputs its episodes were derived from"""
+        return self.digest(path) + inputs
+
+    def get(self, name: str, path, inputs: str) -> Optional[dict]:
+        """What was derived from a source last time, if neither it nor the other inputs changed"""
+        entry = self.sources.get(name)
+        if entry and entry['digest'] == self.digest(path) and entry['inputs'] == inputs:
+            self.reused.append(name)
+            self._used[name] = self.state(path, inputs)
+            return entry['payload']
+        return None
+
+    def put(self, name: str, path, inputs: str, payload: dict):
+        self.sources[name] = {'digest': self.digest(path), 'inputs': inputs, 'payload': payload}
+        self.rebuilt.append(name)
+        self._used[name] = self.state(path, inputs)
+        self._dirty = True
+
+    def build_key(self, *extra: str) -> str:
+        """Identity of this run's output: every source read (and what it was built from) plus extra"""
+        return combine(*(f"{name}={state}" for name, state in sorted(self._used.items())), *extra)
+
+    def output_unchanged(self, build_key: str, html_path) -> bool:
+        """True if html_path still holds what the last run wrote for the same build key"""
+        return self.output.get('key') == build_key and self.output.get('html') == file_stamp(html_path)
+
+    def record_output(self, build_key: str, html_path):
+        self.output = {'key': build_key, 'html': file_stamp(html_path)}
+        self._dirty = True
+
+    def save(self):
+        """Write the cache file if anything in it changed"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # dumps, unlike dump, uses the C encoder
+            f.write(json.dumps({'version': self.version, 'files': self.files, 'sources': self.sources,
+                                'output': self.output}))
+        os.replace(tmp_path, self.path)
@@ -13,6 +13,9 @@ Data Sources:
 - probate_cases/processed_briefs.json (case briefs with Podbean URLs)
 - special_edition/* (special editions and analysis)
 
+Each source is synced into the shared episode store (logs/episode_store.sqlite3)
+and the site's episode list is read back from it, as enhanced_website_updater.py does.
+
 Author: Scholar Podcast System
 Version: 2.2 - COMPLETE WORKING VERSION FOR PHASE 5
 Date: 2025-07-17
@@ -21,10 +24,30 @@ Date: 2025-07-17
 import json
 import os
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "pdfs"))
+from asset_index import BRIEF as BRIEF_TEXT, OPINION as OPINION_TEXT, PDF, TEXT, AssetIndex
+from brief_index import BriefIndex
+from episode import ANALYSIS, BRIEF, CASE_BRIEF, OPINION, PODCAST, PROCESSED_CASE, SPECIAL_EDITION, Episode, episodes_json
+from episode_store import SITE_SOURCES, EpisodeStore
+from json_stream import iter_members
+
+# Fields the converters read; everything else is dropped while streaming
+EPISODE_FIELDS = {'permalink_url': None, 'title': None}
+PODCAST_FIELDS = {
+    'processed_date': None,
+    'enhanced_case_info': {'case_name': None, 'court': None, 'date': None},
+    'file_info': {'podbean_result': {'episode_info': {'episode': EPISODE_FIELDS}},
+                  'audio_result': {'duration_estimate': None}}
+}
+PROCESSED_CASE_FIELDS = {'found_probate_code': None, 'processed_date': None, 'file_paths': {'case_name': None}}
+BRIEF_FIELDS = {'case_number': None, 'case_name': None, 'processed_date': None, 'file_path': None, 'duration': None,
+                'podbean_result': {'episode_info': {'episode': EPISODE_FIELDS}}}
+
 class ComprehensiveWebsiteUpdater:
     def __init__(self):
         # Configuration paths
@@ -55,6 +78,15 @@ class ComprehensiveWebsiteUpdater:
             'pdf_only': 0
         }
         
+        # Brief pipeline index (pdfs/brief_index.sqlite3), for looking briefs up by case number
+        self.brief_index = BriefIndex.open_existing(self.website_pdfs_dir / "brief_index.sqlite3")
+        
+        # One scan of texts/ and pdfs/ per run; the path resolvers below look cases up in it
+        self.assets = AssetIndex(self.website_dir)
+        
+        # Shared with the other updaters; the site's episode list is read back from it
+        self.episode_store = EpisodeStore(self.website_dir / "logs" / "episode_store.sqlite3", SITE_SOURCES)
+        
         print(f"🔧 Comprehensive Website Updater Initialized (FIXED LINKS VERSION)")
         print(f"📁 Base directory: {self.base_dir}")
         print(f"🌐 Website directory: {self.website_dir}")
@@ -82,23 +114,19 @@ class ComprehensiveWebsiteUpdater:
             filename = Path(file_path).name
             
             # First try: exact filename match in website/texts/
-            exact_match_path = self.website_texts_dir / filename
-            if exact_match_path.exists():
-                return f"texts/{filename}"
+            web_path = self.assets.text_file(filename)
+            if web_path:
+                return web_path
             
             # Second try: find by case number in filename
-            if case_number and self.website_texts_dir.exists():
-                for txt_file in self.website_texts_dir.glob("*.txt"):
-                    # Match files that start with the case number and contain "Case_Brief"
-                    if (txt_file.name.upper().startswith(case_number.upper()) and 
-                        'case_brief' in txt_file.name.lower()):
-                        return f"texts/{txt_file.name}"
+            web_path = self.assets.lookup(case_number, BRIEF_TEXT)
+            if web_path:
+                return web_path
             
             # Third try: broader filename matching
-            if self.website_texts_dir.exists():
-                for txt_file in self.website_texts_dir.glob("*.txt"):
-                    if filename.lower() == txt_file.name.lower():
-                        return f"texts/{txt_file.name}"
+            web_path = self.assets.text_file(filename, ignore_case=True)
+            if web_path:
+                return web_path
             
             return '#'
         
@@ -107,11 +135,9 @@ class ComprehensiveWebsiteUpdater:
             filename = Path(file_path).name
             
             # Check both published and unpublished directories
-            pdf_locations = ['pdfs/published/', 'pdfs/unpublished/']
-            for location in pdf_locations:
-                web_file = f"{location}{filename}"
-                if (self.website_dir / web_file).exists():
-                    return web_file
+            web_path = self.assets.pdf_file(filename)
+            if web_path:
+                return web_path
             
             return ''  # Empty string for missing PDFs (don't show button)
         
@@ -119,55 +145,33 @@ class ComprehensiveWebsiteUpdater:
         if 'probate_cases' in file_path_lower and file_path_lower.endswith('.txt'):
             filename = Path(file_path).name
             
-            # Try to find the matching file in website/texts/
-            if self.website_texts_dir.exists():
-                for txt_file in self.website_texts_dir.glob("*.txt"):
-                    # Match by case number or filename
-                    if case_number and case_number.upper() in txt_file.name.upper():
-                        return f"texts/{txt_file.name}"
-                    elif filename.lower() == txt_file.name.lower():
-                        return f"texts/{txt_file.name}"
-            
-            return '#'
+            # Match by case number or filename; the first file by name wins
+            matches = [web_path for web_path in (self.assets.lookup(case_number, TEXT),
+                                                 self.assets.text_file(filename, ignore_case=True)) if web_path]
+            return min(matches) if matches else '#'
         
         # Default fallback
         return '#'
     
+    def find_indexed_brief_url(self, case_number: str) -> str:
+        """Web path of the newest brief the brief pipeline has indexed for a case"""
+        if not self.brief_index or not case_number:
+            return '#'
+        record = self.brief_index.latest(case_number)
+        if not record or not Path(record['brief_path']).exists():
+            return '#'
+        try:
+            return Path(record['brief_path']).relative_to(self.website_dir.resolve()).as_posix()
+        except ValueError:
+            return '#'
+    
     def find_original_text_url(self, case_number: str, case_name: str = "") -> str:
         """Find the original court opinion text file for a case"""
-        if not self.website_texts_dir.exists():
-            return ''
-            
-        # Look for original court opinion text files (not briefs)
-        for txt_file in self.website_texts_dir.glob("*.txt"):
-            filename = txt_file.name
-            
-            # Skip case brief files
-            if 'case_brief' in filename.lower() or '_brief' in filename.lower():
-                continue
-                
-            # Match by case number
-            if case_number and case_number.upper() in filename.upper():
-                # Further filter for original court texts
-                if any(keyword in filename.lower() for keyword in ['published', 'unpublished', 'estate', 'conservatorship']):
-                    return f"texts/{filename}"
-        
-        return ''
+        return self.assets.lookup(case_number, OPINION_TEXT) or ''
     
     def find_pdf_url(self, case_number: str, case_name: str = "") -> str:
         """Find the PDF file for a case"""
-        if not self.website_pdfs_dir.exists():
-            return ''
-            
-        # Search in both published and unpublished directories
-        for subdir in ['published', 'unpublished']:
-            pdf_dir = self.website_pdfs_dir / subdir
-            if pdf_dir.exists():
-                for pdf_file in pdf_dir.glob("*.pdf"):
-                    if case_number and case_number.upper() in pdf_file.name.upper():
-                        return f"pdfs/{subdir}/{pdf_file.name}"
-        
-        return ''
+        return self.assets.lookup(case_number, PDF) or ''
     
     def load_all_content(self):
         """Load content from all available sources"""
@@ -195,92 +199,96 @@ class ComprehensiveWebsiteUpdater:
         """Load episodes from logs/processed_cases.json"""
         if not self.logs_cases_file.exists():
             print(f"⚠️  Logs cases file not found: {self.logs_cases_file}")
+            self.episode_store.sync(PODCAST, [], None)
             return
             
         try:
-            with open(self.logs_cases_file, 'r', encoding='utf-8') as f:
-                logs_data = json.load(f)
-                
-            print(f"📊 Found {len(logs_data)} podcast episodes in logs")
-            
-            for case_key, case_info in logs_data.items():
+            found = 0
+            episodes = []
+            for case_key, case_info in iter_members(self.logs_cases_file, fields=PODCAST_FIELDS):
+                found += 1
                 episode = self.convert_podcast_episode(case_key, case_info)
                 if episode:
-                    self.all_episodes.append(episode)
+                    episodes.append((case_key, episode))
+            print(f"📊 Found {found} podcast episodes in logs")
+            self.episode_store.sync(PODCAST, episodes, None)
                     
         except Exception as e:
-            print(f"❌ Error loading podcast episodes: {e}")
+            print(f"❌ Error loading podcast episodes: {e} (keeping the {self.episode_store.count(PODCAST)} stored)")
     
     def load_processed_cases(self):
         """Load cases from probate_cases/processed_cases.json"""
         if not self.probate_cases_file.exists():
             print(f"⚠️  Probate cases file not found: {self.probate_cases_file}")
+            self.episode_store.sync(PROCESSED_CASE, [], None)
             return
             
         try:
-            with open(self.probate_cases_file, 'r', encoding='utf-8') as f:
-                probate_data = json.load(f)
-                
-            # The file has a nested structure
-            processed_cases = probate_data.get('processed_cases', {})
-            print(f"📊 Found {len(processed_cases)} processed cases")
-            
-            # Only include cases with probate content that aren't already in podcast episodes
-            existing_case_numbers = {ep['caseNumber'] for ep in self.all_episodes}
-            
-            for case_key, case_info in processed_cases.items():
-                if case_info.get('found_probate_code', False) and case_key not in existing_case_numbers:
+            # Only cases with probate content; those already in podcast episodes or briefs are
+            # left out by the episode store's query
+            found = 0
+            episodes = []
+            for case_key, case_info in iter_members(self.probate_cases_file, ('processed_cases',),
+                                                    PROCESSED_CASE_FIELDS):
+                found += 1
+                if case_info.get('found_probate_code', False):
                     episode = self.convert_processed_case(case_key, case_info)
                     if episode:
-                        self.all_episodes.append(episode)
+                        episodes.append((case_key, episode))
+            print(f"📊 Found {found} processed cases")
+            self.episode_store.sync(PROCESSED_CASE, episodes, None)
                         
         except Exception as e:
-            print(f"❌ Error loading processed cases: {e}")
+            print(f"❌ Error loading processed cases: {e} "
+                  f"(keeping the {self.episode_store.count(PROCESSED_CASE)} stored)")
     
     def load_case_briefs(self):
         """Load case briefs from probate_cases/processed_briefs.json"""
         if not self.briefs_file.exists():
             print(f"⚠️  Briefs file not found: {self.briefs_file}")
+            self.episode_store.sync(CASE_BRIEF, [], None)
             return
             
         try:
-            with open(self.briefs_file, 'r', encoding='utf-8') as f:
-                briefs_data = json.load(f)
-                
-            print(f"📊 Found {len(briefs_data)} case briefs")
-            
-            for brief_key, brief_info in briefs_data.items():
+            found = 0
+            episodes = []
+            for brief_key, brief_info in iter_members(self.briefs_file, fields=BRIEF_FIELDS):
+                found += 1
                 episode = self.convert_case_brief(brief_key, brief_info)
                 if episode:
-                    self.all_episodes.append(episode)
+                    episodes.append((brief_key, episode))
+            print(f"📊 Found {found} case briefs")
+            self.episode_store.sync(CASE_BRIEF, episodes, None)
                     
         except Exception as e:
-            print(f"❌ Error loading case briefs: {e}")
+            print(f"❌ Error loading case briefs: {e} (keeping the {self.episode_store.count(CASE_BRIEF)} stored)")
     
     def load_special_editions(self):
         """Load special editions from special_edition directory"""
         # Look for the California's Heritage file in website/texts
         heritage_file = self.website_texts_dir / "2025-07-13_Californias_Heritage_of_Estates_analysis.txt"
+        episodes = []
         if heritage_file.exists():
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'analysis',
-                'title': "Analysis: California's Heritage Of Estates",
-                'court': 'Legal Analysis Special Edition',
-                'date': '2025-07-13',
-                'caseNumber': 'Analysis-14',
-                'description': 'Special legal analysis and commentary on California probate law matters. In-depth examination with practical implications for legal practitioners.',
-                'audioUrl': 'https://www.podbean.com/ew/pb-thdza-1904721',
-                'textUrl': 'texts/2025-07-13_Californias_Heritage_of_Estates_analysis.txt',
-                'pdfUrl': '',
-                'duration': 'Audio',
-                'keywords': ['legal analysis', 'commentary', 'special edition', 'probate law'],
-                'source': 'special_edition'
-            }
-            self.all_episodes.append(episode)
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=ANALYSIS,
+                title="Analysis: California's Heritage Of Estates",
+                court='Legal Analysis Special Edition',
+                date='2025-07-13',
+                case_number='Analysis-14',
+                description='Special legal analysis and commentary on California probate law matters. In-depth examination with practical implications for legal practitioners.',
+                audio_url='https://www.podbean.com/ew/pb-thdza-1904721',
+                text_url='texts/2025-07-13_Californias_Heritage_of_Estates_analysis.txt',
+                pdf_url='',
+                duration='Audio',
+                keywords=['legal analysis', 'commentary', 'special edition', 'probate law'],
+                source=SPECIAL_EDITION
+            )
+            episodes.append((episode.case_number, episode))
             print(f"📊 Found 1 special edition analysis with audio")
+        self.episode_store.sync(SPECIAL_EDITION, episodes, None)
     
-    def convert_podcast_episode(self, case_key: str, case_info: Dict) -> Optional[Dict]:
+    def convert_podcast_episode(self, case_key: str, case_info: Dict) -> Optional[Episode]:
         """Convert podcast episode from logs to website format"""
         try:
             file_info = case_info.get('file_info', {})
@@ -303,30 +311,30 @@ class ComprehensiveWebsiteUpdater:
                     case_name = 'Unknown'
             
             # Basic episode info
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'opinion',
-                'title': f"Case {case_key} - {case_name}" if case_name != 'Unknown' else f"Case {case_key}",
-                'court': enhanced_info.get('court', 'California Appellate Court'),
-                'date': enhanced_info.get('date', case_info.get('processed_date', '2025-07-13')[:10]),
-                'caseNumber': case_key,
-                'description': f"Appellate court decision in case {case_key}, addressing significant issues in California probate law. Generated using Enhanced StyleTTS2 neural voice synthesis with complete legal opinion content.",
-                'audioUrl': '#',
-                'textUrl': '#',
-                'pdfUrl': '',
-                'duration': 'N/A',
-                'keywords': ['probate', 'California', 'appellate', case_key.lower()],
-                'source': 'podcast'
-            }
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=OPINION,
+                title=f"Case {case_key} - {case_name}" if case_name != 'Unknown' else f"Case {case_key}",
+                court=enhanced_info.get('court', 'California Appellate Court'),
+                date=enhanced_info.get('date', case_info.get('processed_date', '2025-07-13')[:10]),
+                case_number=case_key,
+                description=f"Appellate court decision in case {case_key}, addressing significant issues in California probate law. Generated using Enhanced StyleTTS2 neural voice synthesis with complete legal opinion content.",
+                audio_url='#',
+                text_url='#',
+                pdf_url='',
+                duration='N/A',
+                keywords=['probate', 'California', 'appellate', case_key.lower()],
+                source=PODCAST
+            )
             
             # Get Podbean URL if available
             podbean_result = file_info.get('podbean_result', {})
             if podbean_result and podbean_result.get('episode_info', {}).get('episode'):
                 episode_info = podbean_result['episode_info']['episode']
-                episode['audioUrl'] = episode_info.get('permalink_url', '#')
+                episode.audio_url = episode_info.get('permalink_url', '#')
                 # Don't override title from enhanced info if we have it
                 if not enhanced_info.get('case_name'):
-                    episode['title'] = episode_info.get('title', episode['title'])
+                    episode.title = episode_info.get('title', episode.title)
             
             # Get duration if available
             audio_result = file_info.get('audio_result', {})
@@ -337,12 +345,12 @@ class ComprehensiveWebsiteUpdater:
                 seconds = int(duration_seconds % 60)
                 
                 if hours > 0:
-                    episode['duration'] = f"{hours}:{minutes:02d}:{seconds:02d}"
+                    episode.duration = f"{hours}:{minutes:02d}:{seconds:02d}"
                 else:
-                    episode['duration'] = f"{minutes}:{seconds:02d}"
+                    episode.duration = f"{minutes}:{seconds:02d}"
             
             # Find PDF URL for this case
-            episode['pdfUrl'] = self.find_pdf_url(case_key, case_name)
+            episode.pdf_url = self.find_pdf_url(case_key, case_name)
                     
             return episode
             
@@ -350,27 +358,27 @@ class ComprehensiveWebsiteUpdater:
             print(f"⚠️  Error converting podcast episode {case_key}: {e}")
             return None
     
-    def convert_processed_case(self, case_key: str, case_info: Dict) -> Optional[Dict]:
+    def convert_processed_case(self, case_key: str, case_info: Dict) -> Optional[Episode]:
         """Convert processed case to website format"""
         try:
             file_paths = case_info.get('file_paths', {})
             case_name = file_paths.get('case_name', case_key)
             
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'opinion',
-                'title': case_name.replace('_', ' ').title() if case_name != case_key else f"Case {case_key}",
-                'court': 'California Appellate Court',
-                'date': case_info.get('processed_date', '2025-07-13')[:10],
-                'caseNumber': case_key,
-                'description': f"California appellate court case {case_key} addressing probate law matters. PDF document processed and available for review.",
-                'audioUrl': '#',  # No audio for these cases yet
-                'textUrl': '#',
-                'pdfUrl': self.find_pdf_url(case_key, case_name),
-                'duration': 'PDF',
-                'keywords': ['probate', 'California', 'appellate', case_key.lower(), 'pdf'],
-                'source': 'processed_case'
-            }
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=OPINION,
+                title=case_name.replace('_', ' ').title() if case_name != case_key else f"Case {case_key}",
+                court='California Appellate Court',
+                date=case_info.get('processed_date', '2025-07-13')[:10],
+                case_number=case_key,
+                description=f"California appellate court case {case_key} addressing probate law matters. PDF document processed and available for review.",
+                audio_url='#',  # No audio for these cases yet
+                text_url='#',
+                pdf_url=self.find_pdf_url(case_key, case_name),
+                duration='PDF',
+                keywords=['probate', 'California', 'appellate', case_key.lower(), 'pdf'],
+                source=PROCESSED_CASE
+            )
             
             return episode
             
@@ -378,7 +386,7 @@ class ComprehensiveWebsiteUpdater:
             print(f"⚠️  Error converting processed case {case_key}: {e}")
             return None
     
-    def convert_case_brief(self, brief_key: str, brief_info: Dict) -> Optional[Dict]:
+    def convert_case_brief(self, brief_key: str, brief_info: Dict) -> Optional[Episode]:
         """Convert case brief to website format - WITH FIXED PATHS"""
         try:
             case_number = brief_info.get('case_number', 'Unknown')
@@ -392,41 +400,43 @@ class ComprehensiveWebsiteUpdater:
                 print(f"⚠️  Skipping excluded brief: {case_name} ({case_number})")
                 return None
             
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'brief',
-                'title': f"Brief: {case_name}",
-                'court': 'California Appellate Court',
-                'date': brief_info.get('processed_date', '2025-07-13')[:10],
-                'caseNumber': case_number,
-                'description': f"AI-generated case brief for {case_name} ({case_number}). Professional analysis covering key legal principles, procedural requirements, and practical guidance for practitioners.",
-                'audioUrl': '#',
-                'textUrl': '#',  # Will be set below
-                'pdfUrl': '',
-                'duration': 'N/A',
-                'keywords': ['case brief', 'probate', 'California', 'analysis', case_number.lower()],
-                'source': 'case_brief'
-            }
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=BRIEF,
+                title=f"Brief: {case_name}",
+                court='California Appellate Court',
+                date=brief_info.get('processed_date', '2025-07-13')[:10],
+                case_number=case_number,
+                description=f"AI-generated case brief for {case_name} ({case_number}). Professional analysis covering key legal principles, procedural requirements, and practical guidance for practitioners.",
+                audio_url='#',
+                text_url='#',  # Will be set below
+                pdf_url='',
+                duration='N/A',
+                keywords=['case brief', 'probate', 'California', 'analysis', case_number.lower()],
+                source=CASE_BRIEF
+            )
             
             # FIXED: Convert file path to proper web path
             original_file_path = brief_info.get('file_path', '')
-            episode['textUrl'] = self.convert_to_web_path(original_file_path, case_number)
+            episode.text_url = self.convert_to_web_path(original_file_path, case_number)
+            if episode.text_url == '#':
+                episode.text_url = self.find_indexed_brief_url(case_number)
             
             # Find related PDF and original text files
-            episode['pdfUrl'] = self.find_pdf_url(case_number, case_name)
-            episode['originalTextUrl'] = self.find_original_text_url(case_number, case_name)
+            episode.pdf_url = self.find_pdf_url(case_number, case_name)
+            episode.original_text_url = self.find_original_text_url(case_number, case_name)
             
             # Get Podbean URL and duration
             podbean_result = brief_info.get('podbean_result', {})
             if podbean_result and podbean_result.get('episode_info', {}).get('episode'):
                 episode_info = podbean_result['episode_info']['episode']
-                episode['audioUrl'] = episode_info.get('permalink_url', '#')
+                episode.audio_url = episode_info.get('permalink_url', '#')
                 
             if brief_info.get('duration'):
                 duration_seconds = brief_info['duration']
                 minutes = int(duration_seconds // 60)
                 seconds = int(duration_seconds % 60)
-                episode['duration'] = f"{minutes}:{seconds:02d}"
+                episode.duration = f"{minutes}:{seconds:02d}"
                 
             return episode
             
@@ -435,35 +445,18 @@ class ComprehensiveWebsiteUpdater:
             return None
     
     def deduplicate_and_sort(self):
-        """Remove duplicates and sort episodes"""
-        # Remove duplicates based on case number and type
-        seen = set()
-        unique_episodes = []
-        
-        for episode in self.all_episodes:
-            key = (episode['caseNumber'], episode['type'])
-            if key not in seen:
-                seen.add(key)
-                unique_episodes.append(episode)
-        
-        # Sort by date (newest first) and then by case number
-        unique_episodes.sort(key=lambda x: (x['date'], x['caseNumber']), reverse=True)
-        
-        # Reassign IDs
-        for i, episode in enumerate(unique_episodes, 1):
-            episode['id'] = i
-        
-        self.all_episodes = unique_episodes
+        """Read the site's episodes from the store: one per (caseNumber, type), newest first"""
+        self.all_episodes = self.episode_store.episodes()
         print(f"📊 After deduplication: {len(self.all_episodes)} unique episodes")
     
     def calculate_statistics(self):
         """Calculate episode statistics"""
         self.stats['total'] = len(self.all_episodes)
-        self.stats['opinions'] = len([ep for ep in self.all_episodes if ep['type'] == 'opinion'])
-        self.stats['briefs'] = len([ep for ep in self.all_episodes if ep['type'] == 'brief'])
-        self.stats['analysis'] = len([ep for ep in self.all_episodes if ep['type'] == 'analysis'])
-        self.stats['with_audio'] = len([ep for ep in self.all_episodes if ep['audioUrl'] != '#'])
-        self.stats['pdf_only'] = len([ep for ep in self.all_episodes if ep['audioUrl'] == '#' and ep['pdfUrl'] != ''])
+        self.stats['opinions'] = len([ep for ep in self.all_episodes if ep.type == OPINION])
+        self.stats['briefs'] = len([ep for ep in self.all_episodes if ep.type == BRIEF])
+        self.stats['analysis'] = len([ep for ep in self.all_episodes if ep.type == ANALYSIS])
+        self.stats['with_audio'] = len([ep for ep in self.all_episodes if ep.audio_url != '#'])
+        self.stats['pdf_only'] = len([ep for ep in self.all_episodes if ep.audio_url == '#' and ep.pdf_url != ''])
         
         print(f"📊 Final Statistics:")
         print(f"    Total Episodes: {self.stats['total']}")
@@ -486,7 +479,7 @@ class ComprehensiveWebsiteUpdater:
                 html_content = f.read()
             
             # Convert episodes to JavaScript format
-            episodes_js = json.dumps(self.all_episodes, indent=8)
+            episodes_js = episodes_json(self.all_episodes)
             
             # Update episodes array in HTML
             pattern = r'const episodes = \[.*?\];'
@@ -15,12 +15,19 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+from text_sanitizer import clean_title
+from episode import ANALYSIS, BRIEF, CASE_BRIEF, OPINION, PODCAST, PROCESSED_CASE, Episode, episodes_json
+from episode_store import SITE_SOURCES, EpisodeStore
+
+
 class ComprehensiveWebsiteUpdaterProBrep:
     def __init__(self, no_deploy=False):
         self.base_dir = Path(__file__).parent
         self.podcast_dir = self.base_dir.parent
         self.no_deploy = no_deploy
         self.setup_logging()
+        # Shared with the other index.html updaters, so they all show the same episodes
+        self.episode_store = EpisodeStore(self.base_dir / "logs" / "episode_store.sqlite3", SITE_SOURCES)
         
     def setup_logging(self):
         """Configure comprehensive logging"""
@@ -51,48 +58,51 @@ class ComprehensiveWebsiteUpdaterProBrep:
             return None
 
     def load_all_episodes(self):
-        """Load episodes from all JSON databases"""
-        all_episodes = []
-        
+        """Sync every JSON database into the episode store and read the site's episodes back"""
         # Database sources with their processing methods
         databases = [
             {
                 'path': self.podcast_dir / "logs" / "processed_cases.json",
                 'type': 'podcast_episodes',
+                'source': PODCAST,
                 'priority': 1
             },
             {
                 'path': self.podcast_dir / "probate_cases" / "processed_cases.json", 
                 'type': 'all_cases',
+                'source': PROCESSED_CASE,
                 'priority': 2
             },
             {
                 'path': self.podcast_dir / "probate_cases" / "processed_briefs.json",
                 'type': 'case_briefs',
+                'source': CASE_BRIEF,
                 'priority': 3
             }
         ]
         
         for db_info in databases:
-            if db_info['path'].exists():
-                try:
-                    with open(db_info['path'], 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        episodes = self._process_database(data, db_info)
-                        all_episodes.extend(episodes)
-                        self.logger.info(f"Loaded {len(episodes)} episodes from {db_info['path'].name}")
-                except Exception as e:
-                    self.logger.error(f"Failed to load {db_info['path']}: {e}")
-        
-        # Deduplicate and sort episodes
-        unique_episodes = self._deduplicate_episodes(all_episodes)
-        sorted_episodes = sorted(unique_episodes, key=lambda x: x.get('date', ''), reverse=True)
-        
-        self.logger.info(f"Total unique episodes processed: {len(sorted_episodes)}")
-        return sorted_episodes
+            if not db_info['path'].exists():
+                self.episode_store.sync(db_info['source'], [], None)
+                continue
+            try:
+                with open(db_info['path'], 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    episodes = self._process_database(data, db_info)
+                    self.episode_store.sync(db_info['source'], episodes, None)
+                    self.logger.info(f"Loaded {len(episodes)} episodes from {db_info['path'].name}")
+            except Exception as e:
+                self.logger.error(f"Failed to load {db_info['path']}: {e} "
+                                  f"(keeping the {self.episode_store.count(db_info['source'])} stored)")
+        
+        # One per (caseNumber, type), newest first, by the store's precedence rules
+        episodes = self.episode_store.episodes()
+        
+        self.logger.info(f"Total unique episodes processed: {len(episodes)}")
+        return episodes
         
     def _process_database(self, data, db_info):
-        """Process database into episode format"""
+        """Process database into (key, episode) pairs"""
         episodes = []
         
         if db_info['type'] == 'podcast_episodes':
@@ -101,7 +111,7 @@ class ComprehensiveWebsiteUpdaterProBrep:
                 if isinstance(case_data, dict) and 'podbean_url' in case_data:
                     episode = self._create_episode_from_podcast(case_id, case_data)
                     if episode:
-                        episodes.append(episode)
+                        episodes.append((case_id, episode))
                         
         elif db_info['type'] == 'all_cases':
             # Process all cases from probate_cases/processed_cases.json
@@ -109,7 +119,7 @@ class ComprehensiveWebsiteUpdaterProBrep:
                 if isinstance(case_data, dict):
                     episode = self._create_episode_from_case(case_id, case_data)
                     if episode:
-                        episodes.append(episode)
+                        episodes.append((case_id, episode))
                         
         elif db_info['type'] == 'case_briefs':
             # Process case briefs from processed_briefs.json
@@ -117,7 +127,7 @@ class ComprehensiveWebsiteUpdaterProBrep:
                 if isinstance(brief_data, dict):
                     episode = self._create_episode_from_brief(case_id, brief_data)
                     if episode:
-                        episodes.append(episode)
+                        episodes.append((case_id, episode))
         
         return episodes
         
@@ -129,21 +139,21 @@ class ComprehensiveWebsiteUpdaterProBrep:
             # Generate AI description
             description = self._generate_ai_description(case_data, 'podcast')
             
-            episode = {
-                'id': len(self.episodes) + 1 if hasattr(self, 'episodes') else 1,
-                'type': 'opinion',
-                'title': self._clean_title(title),
-                'court': case_data.get('court', 'California Appellate Court'),
-                'date': case_data.get('date', datetime.now().strftime('%Y-%m-%d')),
-                'caseNumber': case_id,
-                'description': description,
-                'audioUrl': case_data.get('podbean_url', ''),
-                'textUrl': f'texts/{case_id}.txt',
-                'pdfUrl': f'pdfs/published/{case_id}.pdf',
-                'duration': case_data.get('duration', 'Unknown'),
-                'keywords': self._extract_keywords(title, description),
-                'source': 'podcast'
-            }
+            episode = Episode(
+                id=len(self.episodes) + 1 if hasattr(self, 'episodes') else 1,
+                type=OPINION,
+                title=self._clean_title(title),
+                court=case_data.get('court', 'California Appellate Court'),
+                date=case_data.get('date', datetime.now().strftime('%Y-%m-%d')),
+                case_number=case_id,
+                description=description,
+                audio_url=case_data.get('podbean_url', ''),
+                text_url=f'texts/{case_id}.txt',
+                pdf_url=f'pdfs/published/{case_id}.pdf',
+                duration=case_data.get('duration', 'Unknown'),
+                keywords=self._extract_keywords(title, description),
+                source=PODCAST
+            )
             
             return episode
             
@@ -159,21 +169,21 @@ class ComprehensiveWebsiteUpdaterProBrep:
             # Generate AI description
             description = self._generate_ai_description(case_data, 'case')
             
-            episode = {
-                'id': len(self.episodes) + 1 if hasattr(self, 'episodes') else 1,
-                'type': 'opinion',
-                'title': self._clean_title(title),
-                'court': 'California Appellate Court',
-                'date': case_data.get('processed_date', datetime.now().strftime('%Y-%m-%d')),
-                'caseNumber': case_id,
-                'description': description,
-                'audioUrl': '',  # No audio for case-only entries
-                'textUrl': f'texts/{case_id}.txt',
-                'pdfUrl': f'pdfs/published/{case_id}.pdf',
-                'duration': 'Document Only',
-                'keywords': self._extract_keywords(title, description),
-                'source': 'case'
-            }
+            episode = Episode(
+                id=len(self.episodes) + 1 if hasattr(self, 'episodes') else 1,
+                type=OPINION,
+                title=self._clean_title(title),
+                court='California Appellate Court',
+                date=case_data.get('processed_date', datetime.now().strftime('%Y-%m-%d')),
+                case_number=case_id,
+                description=description,
+                audio_url='',  # No audio for case-only entries
+                text_url=f'texts/{case_id}.txt',
+                pdf_url=f'pdfs/published/{case_id}.pdf',
+                duration='Document Only',
+                keywords=self._extract_keywords(title, description),
+                source=PROCESSED_CASE
+            )
             
             return episode
             
@@ -189,21 +199,21 @@ class ComprehensiveWebsiteUpdaterProBrep:
             # Generate AI description
             description = self._generate_ai_description(brief_data, 'brief')
             
-            episode = {
-                'id': len(self.episodes) + 1 if hasattr(self, 'episodes') else 1,
-                'type': 'brief',
-                'title': self._clean_title(title),
-                'court': 'California Appellate Court',
-                'date': brief_data.get('created_date', datetime.now().strftime('%Y-%m-%d')),
-                'caseNumber': case_id,
-                'description': description,
-                'audioUrl': brief_data.get('audio_url', ''),
-                'textUrl': f'texts/brief_{case_id}.txt',
-                'pdfUrl': f'pdfs/published/{case_id}.pdf',
-                'duration': brief_data.get('duration', 'Unknown'),
-                'keywords': self._extract_keywords(title, description),
-                'source': 'brief'
-            }
+            episode = Episode(
+                id=len(self.episodes) + 1 if hasattr(self, 'episodes') else 1,
+                type=BRIEF,
+                title=self._clean_title(title),
+                court='California Appellate Court',
+                date=brief_data.get('created_date', datetime.now().strftime('%Y-%m-%d')),
+                case_number=case_id,
+                description=description,
+                audio_url=brief_data.get('audio_url', ''),
+                text_url=f'texts/brief_{case_id}.txt',
+                pdf_url=f'pdfs/published/{case_id}.pdf',
+                duration=brief_data.get('duration', 'Unknown'),
+                keywords=self._extract_keywords(title, description),
+                source=CASE_BRIEF
+            )
             
             return episode
             
@@ -235,21 +245,7 @@ class ComprehensiveWebsiteUpdaterProBrep:
         
     def _clean_title(self, title):
         """Clean and standardize episode titles"""
-        if not title:
-            return "Untitled Case"
-            
-        # Remove common file extensions and artifacts
-        title = re.sub(r'\.(pdf|txt|mp3)$', '', title, flags=re.IGNORECASE)
-        
-        # Clean up common patterns
-        title = re.sub(r'_published|_unpublished', '', title)
-        title = re.sub(r'_+', ' ', title)  # Replace underscores with spaces
-        title = re.sub(r'\s+', ' ', title)  # Normalize whitespace
-        
-        # Capitalize properly
-        title = title.strip().title()
-        
-        return title
+        return clean_title(title)
         
     def _extract_keywords(self, title, description):
         """Extract relevant keywords from title and description"""
@@ -270,19 +266,6 @@ class ComprehensiveWebsiteUpdaterProBrep:
                 
         return keywords[:10]  # Limit to 10 keywords
         
-    def _deduplicate_episodes(self, episodes):
-        """Remove duplicate episodes based on case number"""
-        seen_cases = set()
-        unique_episodes = []
-        
-        for episode in episodes:
-            case_number = episode.get('caseNumber', '')
-            if case_number and case_number not in seen_cases:
-                seen_cases.add(case_number)
-                unique_episodes.append(episode)
-                
-        return unique_episodes
-        
     def update_website_content(self):
         """Update website HTML with processed episodes"""
         try:
@@ -307,9 +290,9 @@ class ComprehensiveWebsiteUpdaterProBrep:
         """Calculate website statistics"""
         stats = {
             'total_episodes': len(episodes),
-            'opinions': len([e for e in episodes if e.get('type') == 'opinion']),
-            'briefs': len([e for e in episodes if e.get('type') == 'brief']),
-            'analysis': len([e for e in episodes if e.get('type') == 'analysis']),
+            'opinions': len([e for e in episodes if e.type == OPINION]),
+            'briefs': len([e for e in episodes if e.type == BRIEF]),
+            'analysis': len([e for e in episodes if e.type == ANALYSIS]),
             'total_resources': len(episodes) * 3,  # PDF + Text + Audio
             'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
@@ -353,27 +336,7 @@ class ComprehensiveWebsiteUpdaterProBrep:
         
     def _generate_javascript_episodes(self, episodes):
         """Generate JavaScript episodes array"""
-        js_episodes = []
-        
-        for episode in episodes:
-            js_episode = {
-                'id': episode.get('id', 0),
-                'type': episode.get('type', 'opinion'),
-                'title': episode.get('title', ''),
-                'court': episode.get('court', ''),
-                'date': episode.get('date', ''),
-                'caseNumber': episode.get('caseNumber', ''),
-                'description': episode.get('description', ''),
-                'audioUrl': episode.get('audioUrl', ''),
-                'textUrl': episode.get('textUrl', ''),
-                'pdfUrl': episode.get('pdfUrl', ''),
-                'duration': episode.get('duration', ''),
-                'keywords': episode.get('keywords', []),
-                'source': episode.get('source', '')
-            }
-            js_episodes.append(js_episode)
-            
-        return json.dumps(js_episodes, indent=2, ensure_ascii=False)
+        return episodes_json(episodes, indent=2, ensure_ascii=False)
         
     def _fix_javascript_syntax(self, js_content):
         """Fix common JavaScript syntax issues"""
@@ -13,9 +13,13 @@ import json
 import os
 import re
 import subprocess
+import sys
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from episode import ANALYSIS, BRIEF, OPINION, Episode, episodes_json
+
 class WebsiteAutomation:
     def __init__(self):
         # Configuration - adjust paths as needed
@@ -61,21 +65,21 @@ class WebsiteAutomation:
         
         for case_file, case_info in cases_data.items():
             # Determine episode type based on file naming or content
-            episode_type = 'brief' if 'brief' in case_file.lower() else 'opinion'
+            episode_type = BRIEF if 'brief' in case_file.lower() else OPINION
             
-            episode = {
-                'id': episode_id,
-                'type': episode_type,
-                'title': self.extract_case_title(case_file),
-                'court': self.extract_court_info(case_info),
-                'date': case_info.get('date_processed', datetime.now().strftime('%Y-%m-%d')),
-                'caseNumber': self.extract_case_number(case_file),
-                'description': self.generate_description(case_info, episode_type),
-                'audioUrl': case_info.get('podcast_url', '#'),
-                'textUrl': '#',
-                'duration': case_info.get('duration', 'N/A'),
-                'keywords': self.extract_keywords(case_file, case_info)
-            }
+            episode = Episode(
+                id=episode_id,
+                type=episode_type,
+                title=self.extract_case_title(case_file),
+                court=self.extract_court_info(case_info),
+                date=case_info.get('date_processed', datetime.now().strftime('%Y-%m-%d')),
+                case_number=self.extract_case_number(case_file),
+                description=self.generate_description(case_info, episode_type),
+                audio_url=case_info.get('podcast_url', '#'),
+                text_url='#',
+                duration=case_info.get('duration', 'N/A'),
+                keywords=self.extract_keywords(case_file, case_info)
+            )
             episodes.append(episode)
             episode_id += 1
         
@@ -87,19 +91,19 @@ class WebsiteAutomation:
         episode_id = 1000  # Start at 1000 to avoid conflicts
         
         for special_file, special_info in special_data.items():
-            episode = {
-                'id': episode_id,
-                'type': 'analysis',
-                'title': self.extract_special_title(special_file),
-                'court': 'Legal Analysis Special Edition',
-                'date': special_info.get('date_processed', datetime.now().strftime('%Y-%m-%d')),
-                'caseNumber': f"Analysis #{episode_id - 999}",
-                'description': special_info.get('description', 'Legal analysis and commentary.'),
-                'audioUrl': special_info.get('podcast_url', '#'),
-                'textUrl': '#',
-                'duration': special_info.get('duration', 'N/A'),
-                'keywords': self.extract_special_keywords(special_file, special_info)
-            }
+            episode = Episode(
+                id=episode_id,
+                type=ANALYSIS,
+                title=self.extract_special_title(special_file),
+                court='Legal Analysis Special Edition',
+                date=special_info.get('date_processed', datetime.now().strftime('%Y-%m-%d')),
+                case_number=f"Analysis #{episode_id - 999}",
+                description=special_info.get('description', 'Legal analysis and commentary.'),
+                audio_url=special_info.get('podcast_url', '#'),
+                text_url='#',
+                duration=special_info.get('duration', 'N/A'),
+                keywords=self.extract_special_keywords(special_file, special_info)
+            )
             episodes.append(episode)
             episode_id += 1
         
@@ -135,7 +139,7 @@ class WebsiteAutomation:
     
     def generate_description(self, case_info, episode_type):
         """Generate a professional description"""
-        if episode_type == 'brief':
+        if episode_type == BRIEF:
             return "Professional case brief analysis covering key legal principles, procedural requirements, and practical guidance for practitioners."
         else:
             return "Appellate court decision addressing significant issues in California probate law with implications for legal practitioners and estate planning professionals."
@@ -177,7 +181,7 @@ class WebsiteAutomation:
                 html_content = f.read()
             
             # Convert episodes to JavaScript array
-            episodes_js = json.dumps(episodes, indent=8)
+            episodes_js = episodes_json(episodes)
             
             # Replace the episodes array in the JavaScript
             pattern = r'const episodes = \[.*?\];'
@@ -187,9 +191,9 @@ class WebsiteAutomation:
             
             # Update statistics
             total_episodes = len(episodes)
-            opinions = len([e for e in episodes if e['type'] == 'opinion'])
-            briefs = len([e for e in episodes if e['type'] == 'brief'])
-            analysis = len([e for e in episodes if e['type'] == 'analysis'])
+            opinions = len([e for e in episodes if e.type == OPINION])
+            briefs = len([e for e in episodes if e.type == BRIEF])
+            analysis = len([e for e in episodes if e.type == ANALYSIS])
             
             # Update stats in HTML
             updated_html = re.sub(r'<div class="stat-number" id="totalEpisodes">\d+\+</div>',
@@ -4,13 +4,41 @@ Enhanced Website Updater with AI-Generated Descriptions
 Prioritizes AI-generated descriptions from case brief pipeline
 """
 
+import argparse
 import json
 import os
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "pdfs"))
+from asset_index import BRIEF as BRIEF_TEXT, OPINION as OPINION_TEXT, PDF, TEXT, AssetIndex
+from brief_index import BriefIndex
+import catalog_cache
+from catalog_cache import CatalogBuildCache
+from episode import ANALYSIS, BRIEF, CASE_BRIEF, OPINION, PODCAST, PROCESSED_CASE, SPECIAL_EDITION, Episode, episodes_json
+from episode_store import SITE_SOURCES, EpisodeStore
+from json_stream import iter_members
+
+# Bump when a convert_* method changes, so stored episodes are rebuilt
+CATALOG_BUILD_VERSION = "2"
+
+# Fields the converters and get_enhanced_description read; everything else is dropped while streaming
+EPISODE_FIELDS = {'permalink_url': None}
+PODCAST_FIELDS = {
+    'processed_date': None,
+    'enhanced_case_info': {'case_name': None, 'court': None, 'date': None, 'description': None, 'title': None},
+    'file_info': {'podbean_result': {'episode_info': {'episode': EPISODE_FIELDS}},
+                  'audio_result': {'duration_estimate': None}}
+}
+PROCESSED_CASE_FIELDS = {'found_probate_code': None, 'processed_date': None, 'file_paths': {'case_name': None},
+                         'case_name': None, 'title': None, 'description': None}
+BRIEF_FIELDS = {'case_number': None, 'case_name': None, 'title': None, 'processed_date': None, 'file_path': None,
+                'duration': None, 'description': None, 'description_generated': None,
+                'podbean_result': {'episode_info': {'episode': EPISODE_FIELDS}}}
+
 class EnhancedWebsiteUpdater:
     def __init__(self):
         # Configuration paths
@@ -42,6 +70,23 @@ class EnhancedWebsiteUpdater:
             'with_ai_descriptions': 0
         }
         
+        # Brief pipeline index (pdfs/brief_index.sqlite3), for looking briefs up by case number
+        self.brief_index = BriefIndex.open_existing(self.website_pdfs_dir / "brief_index.sqlite3")
+        
+        # One scan of texts/ and pdfs/ per run; the path resolvers below look cases up in it
+        self.assets = AssetIndex(self.website_dir)
+        
+        # Source digests from earlier runs; only changed sources are re-converted into the episode store
+        self.build_cache = CatalogBuildCache(self.website_dir / "logs" / "catalog_build_cache.json",
+                                             CATALOG_BUILD_VERSION)
+        self.episode_store = EpisodeStore(self.website_dir / "logs" / "episode_store.sqlite3", SITE_SOURCES)
+        brief_index_file = self.website_pdfs_dir / "brief_index.sqlite3"
+        # Every converted episode depends on the files on disk and the brief index
+        self.build_inputs = catalog_cache.combine(
+            self.assets.signature(),
+            catalog_cache.file_stamp(brief_index_file, brief_index_file.with_name(brief_index_file.name + "-wal")))
+        self.ai_described_cases = set()
+        
         # Setup logging
         self.setup_logging()
         
@@ -87,16 +132,14 @@ class EnhancedWebsiteUpdater:
             filename = Path(file_path).name
             
             # First try: exact filename match
-            exact_match_path = self.website_texts_dir / filename
-            if exact_match_path.exists():
-                return f"texts/{filename}"
+            web_path = self.assets.text_file(filename)
+            if web_path:
+                return web_path
             
             # Second try: find by case number
-            if case_number and self.website_texts_dir.exists():
-                for txt_file in self.website_texts_dir.glob("*.txt"):
-                    if (txt_file.name.upper().startswith(case_number.upper()) and 
-                        'case_brief' in txt_file.name.lower()):
-                        return f"texts/{txt_file.name}"
+            web_path = self.assets.lookup(case_number, BRIEF_TEXT)
+            if web_path:
+                return web_path
             
             return '#'
         
@@ -105,11 +148,9 @@ class EnhancedWebsiteUpdater:
             filename = Path(file_path).name
             
             # Check both published and unpublished directories
-            pdf_locations = ['pdfs/published/', 'pdfs/unpublished/']
-            for location in pdf_locations:
-                web_file = f"{location}{filename}"
-                if (self.website_dir / web_file).exists():
-                    return web_file
+            web_path = self.assets.pdf_file(filename)
+            if web_path:
+                return web_path
             
             return ''
         
@@ -117,55 +158,38 @@ class EnhancedWebsiteUpdater:
         if 'probate_cases' in file_path_lower and file_path_lower.endswith('.txt'):
             filename = Path(file_path).name
             
-            if self.website_texts_dir.exists():
-                for txt_file in self.website_texts_dir.glob("*.txt"):
-                    if case_number and case_number.upper() in txt_file.name.upper():
-                        return f"texts/{txt_file.name}"
-                    elif filename.lower() == txt_file.name.lower():
-                        return f"texts/{txt_file.name}"
-            
-            return '#'
+            # Match by case number or filename; the first file by name wins
+            matches = [web_path for web_path in (self.assets.lookup(case_number, TEXT),
+                                                 self.assets.text_file(filename, ignore_case=True)) if web_path]
+            return min(matches) if matches else '#'
         
         return '#'
     
+    def find_indexed_brief_url(self, case_number: str) -> str:
+        """Web path of the newest brief the brief pipeline has indexed for a case"""
+        if not self.brief_index or not case_number:
+            return '#'
+        record = self.brief_index.latest(case_number)
+        if not record or not Path(record['brief_path']).exists():
+            return '#'
+        try:
+            return Path(record['brief_path']).relative_to(self.website_dir.resolve()).as_posix()
+        except ValueError:
+            return '#'
+    
     def find_original_text_url(self, case_number: str, case_name: str = "") -> str:
         """Find the original court opinion text file for a case"""
-        if not self.website_texts_dir.exists():
-            return ''
-            
-        for txt_file in self.website_texts_dir.glob("*.txt"):
-            filename = txt_file.name
-            
-            # Skip case brief files
-            if 'case_brief' in filename.lower() or '_brief' in filename.lower():
-                continue
-                
-            # Match by case number
-            if case_number and case_number.upper() in filename.upper():
-                if any(keyword in filename.lower() for keyword in ['published', 'unpublished', 'estate', 'conservatorship']):
-                    return f"texts/{filename}"
-        
-        return ''
+        return self.assets.lookup(case_number, OPINION_TEXT) or ''
     
     def find_pdf_url(self, case_number: str, case_name: str = "") -> str:
         """Find the PDF file for a case"""
-        if not self.website_pdfs_dir.exists():
-            return ''
-            
-        for subdir in ['published', 'unpublished']:
-            pdf_dir = self.website_pdfs_dir / subdir
-            if pdf_dir.exists():
-                for pdf_file in pdf_dir.glob("*.pdf"):
-                    if case_number and case_number.upper() in pdf_file.name.upper():
-                        return f"pdfs/{subdir}/{pdf_file.name}"
-        
-        return ''
+        return self.assets.lookup(case_number, PDF) or ''
     
     def get_enhanced_description(self, case_id: str, case_data: Dict, source_type: str) -> str:
         """Get enhanced description with AI-generated content prioritized"""
         
         # Priority 1: Check for AI-generated description from briefs
-        if hasattr(self, 'briefs_data') and case_id in self.briefs_data:
+        if getattr(self, 'briefs_data', None) and case_id in self.briefs_data:
             brief_data = self.briefs_data[case_id]
             ai_description = brief_data.get('description')
             if ai_description and len(ai_description.strip()) > 50:
@@ -218,103 +242,191 @@ class EnhancedWebsiteUpdater:
         # Load special editions
         self.load_special_editions()
         
+        if self.build_cache.reused:
+            print(f"♻️  Unchanged since the last build: {', '.join(self.build_cache.reused)}")
+        self.build_cache.save()
+        
         # Remove duplicates and sort
         self.deduplicate_and_sort()
         
         # Calculate enhanced statistics
         self.calculate_enhanced_statistics()
+    
+    def update_briefs(self, brief_keys: List[str]):
+        """Point update: re-convert only the given briefs into the episode store, then read the site's episodes
+
+        Podcast and processed-case descriptions drawn from these briefs catch up on the next full run.
+        """
+        print(f"\n📖 Updating {len(brief_keys)} case brief(s) in the episode store...")
+        self.load_briefs_data()
+        for brief_key in brief_keys:
+            brief_info = self.briefs_data.get(brief_key)
+            episode = self.convert_case_brief(brief_key, brief_info) if brief_info is not None else None
+            if episode:
+                self.episode_store.upsert(CASE_BRIEF, brief_key, episode)
+                print(f"📄 Stored {episode.title} ({episode.case_number})")
+            elif self.episode_store.remove(CASE_BRIEF, brief_key):
+                print(f"🗑️  Removed brief {brief_key} from the episode store")
+            elif brief_info is None:
+                print(f"⚠️  Brief {brief_key} not found in {self.briefs_file}")
+        
+        self.deduplicate_and_sort()
+        self.calculate_enhanced_statistics()
         
     def load_case_briefs(self):
         """Load case briefs from processed_briefs.json"""
         if not self.briefs_file.exists():
             print(f"⚠️  Briefs file not found: {self.briefs_file}")
             self.briefs_data = {}
+            self.clear_source(CASE_BRIEF)
+            return
+        
+        cached = self.stored_source('case_briefs', CASE_BRIEF, self.briefs_file, self.build_inputs)
+        if cached is not None:
+            # briefs_data is only parsed if another source has to be re-converted
+            self.briefs_data = None
+            self.ai_described_cases = set(cached['ai_described'])
+            print(f"📊 Reusing {self.episode_store.count(CASE_BRIEF)} case brief episodes")
             return
             
         try:
-            with open(self.briefs_file, 'r', encoding='utf-8') as f:
-                self.briefs_data = json.load(f)
+            self.load_briefs_data()
                 
             print(f"📊 Found {len(self.briefs_data)} case briefs")
-            print(f"🤖 AI descriptions available: {len([b for b in self.briefs_data.values() if b.get('description_generated')])}")
+            print(f"🤖 AI descriptions available: {len(self.ai_described_cases)}")
             
+            episodes = []
             for brief_key, brief_info in self.briefs_data.items():
                 episode = self.convert_case_brief(brief_key, brief_info)
                 if episode:
-                    self.all_episodes.append(episode)
+                    episodes.append((brief_key, episode))
+            self.episode_store.sync(CASE_BRIEF, episodes, self.build_cache.state(self.briefs_file, self.build_inputs))
+            self.build_cache.put('case_briefs', self.briefs_file, self.build_inputs,
+                                 {'ai_described': sorted(self.ai_described_cases)})
                     
         except Exception as e:
-            print(f"❌ Error loading case briefs: {e}")
+            print(f"❌ Error loading case briefs: {e} (keeping the {self.episode_store.count(CASE_BRIEF)} stored)")
             self.briefs_data = {}
     
+    def load_briefs_data(self):
+        """Parse processed_briefs.json, whose AI descriptions every converter prefers"""
+        self.briefs_data = dict(iter_members(self.briefs_file, fields=BRIEF_FIELDS))
+        self.ai_described_cases = {key for key, brief in self.briefs_data.items() if brief.get('description_generated')}
+    
+    def stored_source(self, name: str, source: str, path, inputs: str) -> Optional[dict]:
+        """Cache payload of a source whose episodes in the store were converted from this file and inputs"""
+        if not self.episode_store.is_current(source, self.build_cache.state(path, inputs)):
+            return None
+        return self.build_cache.get(name, path, inputs)
+    
+    def clear_source(self, source: str):
+        """Drop a source whose file is gone from the store (once, so the episode list stays unchanged after)"""
+        if not self.episode_store.is_current(source, "missing"):
+            self.episode_store.sync(source, [], "missing")
+    
+    def source_inputs(self) -> str:
+        """Cache inputs of the podcast and processed-case sources, whose descriptions come from the briefs"""
+        return catalog_cache.combine(self.build_inputs, self.build_cache.digest(self.briefs_file))
+    
+    def ensure_briefs_data(self):
+        if getattr(self, 'briefs_data', None) is None:
+            try:
+                self.load_briefs_data()
+            except Exception as e:
+                print(f"❌ Error loading case briefs: {e}")
+                self.briefs_data = {}
+    
     def load_podcast_episodes(self):
         """Load episodes from logs/processed_cases.json"""
         if not self.logs_cases_file.exists():
             print(f"⚠️  Logs cases file not found: {self.logs_cases_file}")
+            self.clear_source(PODCAST)
+            return
+        
+        inputs = self.source_inputs()
+        if self.stored_source('podcast_episodes', PODCAST, self.logs_cases_file, inputs) is not None:
+            print(f"📊 Reusing {self.episode_store.count(PODCAST)} podcast episodes")
             return
             
         try:
-            with open(self.logs_cases_file, 'r', encoding='utf-8') as f:
-                logs_data = json.load(f)
-                
-            print(f"📊 Found {len(logs_data)} podcast episodes in logs")
+            self.ensure_briefs_data()
             
-            for case_key, case_info in logs_data.items():
+            found = 0
+            episodes = []
+            for case_key, case_info in iter_members(self.logs_cases_file, fields=PODCAST_FIELDS):
+                found += 1
                 episode = self.convert_podcast_episode(case_key, case_info)
                 if episode:
-                    self.all_episodes.append(episode)
+                    episodes.append((case_key, episode))
+            print(f"📊 Found {found} podcast episodes in logs")
+            self.episode_store.sync(PODCAST, episodes, self.build_cache.state(self.logs_cases_file, inputs))
+            self.build_cache.put('podcast_episodes', self.logs_cases_file, inputs, {})
                     
         except Exception as e:
-            print(f"❌ Error loading podcast episodes: {e}")
+            print(f"❌ Error loading podcast episodes: {e} (keeping the {self.episode_store.count(PODCAST)} stored)")
     
     def load_processed_cases(self):
         """Load cases from probate_cases/processed_cases.json"""
         if not self.probate_cases_file.exists():
             print(f"⚠️  Probate cases file not found: {self.probate_cases_file}")
+            self.clear_source(PROCESSED_CASE)
+            return
+        
+        # Cases already in podcast episodes or briefs are left out by the episode store's query
+        inputs = self.source_inputs()
+        if self.stored_source('processed_cases', PROCESSED_CASE, self.probate_cases_file, inputs) is not None:
+            print(f"📊 Reusing {self.episode_store.count(PROCESSED_CASE)} processed case episodes")
             return
             
         try:
-            with open(self.probate_cases_file, 'r', encoding='utf-8') as f:
-                probate_data = json.load(f)
-                
-            processed_cases = probate_data.get('processed_cases', {})
-            print(f"📊 Found {len(processed_cases)} processed cases")
-            
-            # Only include cases with probate content that aren't already in podcast episodes
-            existing_case_numbers = {ep['caseNumber'] for ep in self.all_episodes}
-            
-            for case_key, case_info in processed_cases.items():
-                if case_info.get('found_probate_code', False) and case_key not in existing_case_numbers:
+            self.ensure_briefs_data()
+            
+            # The file has a nested structure
+            found = 0
+            episodes = []
+            for case_key, case_info in iter_members(self.probate_cases_file, ('processed_cases',),
+                                                    PROCESSED_CASE_FIELDS):
+                found += 1
+                if case_info.get('found_probate_code', False):
                     episode = self.convert_processed_case(case_key, case_info)
                     if episode:
-                        self.all_episodes.append(episode)
+                        episodes.append((case_key, episode))
+            print(f"📊 Found {found} processed cases")
+            self.episode_store.sync(PROCESSED_CASE, episodes,
+                                    self.build_cache.state(self.probate_cases_file, inputs))
+            self.build_cache.put('processed_cases', self.probate_cases_file, inputs, {})
                         
         except Exception as e:
-            print(f"❌ Error loading processed cases: {e}")
+            print(f"❌ Error loading processed cases: {e} "
+                  f"(keeping the {self.episode_store.count(PROCESSED_CASE)} stored)")
     
     def load_special_editions(self):
         """Load special editions from special_edition directory"""
         heritage_file = self.website_texts_dir / "2025-07-13_Californias_Heritage_of_Estates_analysis.txt"
+        episodes = []
         if heritage_file.exists():
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'analysis',
-                'title': "Analysis: California's Heritage Of Estates",
-                'court': 'Legal Analysis Special Edition',
-                'date': '2025-07-13',
-                'caseNumber': 'Analysis-14',
-                'description': 'Special legal analysis and commentary on California probate law matters. In-depth examination with practical implications for legal practitioners.',
-                'audioUrl': 'https://www.podbean.com/ew/pb-thdza-1904721',
-                'textUrl': 'texts/2025-07-13_Californias_Heritage_of_Estates_analysis.txt',
-                'pdfUrl': '',
-                'duration': 'Audio',
-                'keywords': ['legal analysis', 'commentary', 'special edition', 'probate law'],
-                'source': 'special_edition'
-            }
-            self.all_episodes.append(episode)
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=ANALYSIS,
+                title="Analysis: California's Heritage Of Estates",
+                court='Legal Analysis Special Edition',
+                date='2025-07-13',
+                case_number='Analysis-14',
+                description='Special legal analysis and commentary on California probate law matters. In-depth examination with practical implications for legal practitioners.',
+                audio_url='https://www.podbean.com/ew/pb-thdza-1904721',
+                text_url='texts/2025-07-13_Californias_Heritage_of_Estates_analysis.txt',
+                pdf_url='',
+                duration='Audio',
+                keywords=['legal analysis', 'commentary', 'special edition', 'probate law'],
+                source=SPECIAL_EDITION
+            )
+            episodes.append((episode.case_number, episode))
             print(f"📊 Found 1 special edition analysis with audio")
+        state = catalog_cache.combine(CATALOG_BUILD_VERSION, *(key for key, _ in episodes))
+        if not self.episode_store.is_current(SPECIAL_EDITION, state):
+            self.episode_store.sync(SPECIAL_EDITION, episodes, state)
     
-    def convert_podcast_episode(self, case_key: str, case_info: Dict) -> Optional[Dict]:
+    def convert_podcast_episode(self, case_key: str, case_info: Dict) -> Optional[Episode]:
         """Convert podcast episode from logs to website format with AI descriptions"""
         try:
             file_info = case_info.get('file_info', {})
@@ -340,27 +452,27 @@ class EnhancedWebsiteUpdater:
                     case_name = 'Unknown'
             
             # Basic episode info
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'opinion',
-                'title': f"Case {case_key} - {case_name}" if case_name != 'Unknown' else f"Case {case_key}",
-                'court': enhanced_info.get('court', 'California Appellate Court'),
-                'date': enhanced_info.get('date', case_info.get('processed_date', '2025-07-13')[:10]),
-                'caseNumber': case_key,
-                'description': self.get_enhanced_description(case_key, {'case_name': case_name, **enhanced_info}, 'podcast'),
-                'audioUrl': '#',
-                'textUrl': '#',
-                'pdfUrl': '',
-                'duration': 'N/A',
-                'keywords': ['probate', 'California', 'appellate', case_key.lower()],
-                'source': 'podcast'
-            }
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=OPINION,
+                title=f"Case {case_key} - {case_name}" if case_name != 'Unknown' else f"Case {case_key}",
+                court=enhanced_info.get('court', 'California Appellate Court'),
+                date=enhanced_info.get('date', case_info.get('processed_date', '2025-07-13')[:10]),
+                case_number=case_key,
+                description=self.get_enhanced_description(case_key, {'case_name': case_name, **enhanced_info}, 'podcast'),
+                audio_url='#',
+                text_url='#',
+                pdf_url='',
+                duration='N/A',
+                keywords=['probate', 'California', 'appellate', case_key.lower()],
+                source=PODCAST
+            )
             
             # Get Podbean URL if available
             podbean_result = file_info.get('podbean_result', {})
             if podbean_result and podbean_result.get('episode_info', {}).get('episode'):
                 episode_info = podbean_result['episode_info']['episode']
-                episode['audioUrl'] = episode_info.get('permalink_url', '#')
+                episode.audio_url = episode_info.get('permalink_url', '#')
             
             # Get duration if available
             audio_result = file_info.get('audio_result', {})
@@ -371,12 +483,12 @@ class EnhancedWebsiteUpdater:
                 seconds = int(duration_seconds % 60)
                 
                 if hours > 0:
-                    episode['duration'] = f"{hours}:{minutes:02d}:{seconds:02d}"
+                    episode.duration = f"{hours}:{minutes:02d}:{seconds:02d}"
                 else:
-                    episode['duration'] = f"{minutes}:{seconds:02d}"
+                    episode.duration = f"{minutes}:{seconds:02d}"
             
             # Find PDF URL for this case
-            episode['pdfUrl'] = self.find_pdf_url(case_key, case_name)
+            episode.pdf_url = self.find_pdf_url(case_key, case_name)
                     
             return episode
             
@@ -384,27 +496,27 @@ class EnhancedWebsiteUpdater:
             print(f"⚠️  Error converting podcast episode {case_key}: {e}")
             return None
     
-    def convert_processed_case(self, case_key: str, case_info: Dict) -> Optional[Dict]:
+    def convert_processed_case(self, case_key: str, case_info: Dict) -> Optional[Episode]:
         """Convert processed case to website format with AI descriptions"""
         try:
             file_paths = case_info.get('file_paths', {})
             case_name = file_paths.get('case_name', case_key)
             
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'opinion',
-                'title': case_name.replace('_', ' ').title() if case_name != case_key else f"Case {case_key}",
-                'court': 'California Appellate Court',
-                'date': case_info.get('processed_date', '2025-07-13')[:10],
-                'caseNumber': case_key,
-                'description': self.get_enhanced_description(case_key, {'case_name': case_name, **case_info}, 'processed_case'),
-                'audioUrl': '#',
-                'textUrl': '#',
-                'pdfUrl': self.find_pdf_url(case_key, case_name),
-                'duration': 'PDF',
-                'keywords': ['probate', 'California', 'appellate', case_key.lower(), 'pdf'],
-                'source': 'processed_case'
-            }
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=OPINION,
+                title=case_name.replace('_', ' ').title() if case_name != case_key else f"Case {case_key}",
+                court='California Appellate Court',
+                date=case_info.get('processed_date', '2025-07-13')[:10],
+                case_number=case_key,
+                description=self.get_enhanced_description(case_key, {'case_name': case_name, **case_info}, 'processed_case'),
+                audio_url='#',
+                text_url='#',
+                pdf_url=self.find_pdf_url(case_key, case_name),
+                duration='PDF',
+                keywords=['probate', 'California', 'appellate', case_key.lower(), 'pdf'],
+                source=PROCESSED_CASE
+            )
             
             return episode
             
@@ -412,7 +524,7 @@ class EnhancedWebsiteUpdater:
             print(f"⚠️  Error converting processed case {case_key}: {e}")
             return None
     
-    def convert_case_brief(self, brief_key: str, brief_info: Dict) -> Optional[Dict]:
+    def convert_case_brief(self, brief_key: str, brief_info: Dict) -> Optional[Episode]:
         """Convert case brief to website format with AI descriptions"""
         try:
             case_number = brief_info.get('case_number', 'Unknown')
@@ -426,41 +538,43 @@ class EnhancedWebsiteUpdater:
                 print(f"⚠️  Skipping excluded brief: {case_name} ({case_number})")
                 return None
             
-            episode = {
-                'id': len(self.all_episodes) + 1,
-                'type': 'brief',
-                'title': f"Brief: {case_name}",
-                'court': 'California Appellate Court',
-                'date': brief_info.get('processed_date', '2025-07-13')[:10],
-                'caseNumber': case_number,
-                'description': self.get_enhanced_description(case_number, brief_info, 'brief'),
-                'audioUrl': '#',
-                'textUrl': '#',
-                'pdfUrl': '',
-                'duration': 'N/A',
-                'keywords': ['case brief', 'probate', 'California', 'analysis', case_number.lower()],
-                'source': 'case_brief'
-            }
+            episode = Episode(
+                id=len(self.all_episodes) + 1,
+                type=BRIEF,
+                title=f"Brief: {case_name}",
+                court='California Appellate Court',
+                date=brief_info.get('processed_date', '2025-07-13')[:10],
+                case_number=case_number,
+                description=self.get_enhanced_description(case_number, brief_info, 'brief'),
+                audio_url='#',
+                text_url='#',
+                pdf_url='',
+                duration='N/A',
+                keywords=['case brief', 'probate', 'California', 'analysis', case_number.lower()],
+                source=CASE_BRIEF
+            )
             
             # Convert file path to web path
             original_file_path = brief_info.get('file_path', '')
-            episode['textUrl'] = self.convert_to_web_path(original_file_path, case_number)
+            episode.text_url = self.convert_to_web_path(original_file_path, case_number)
+            if episode.text_url == '#':
+                episode.text_url = self.find_indexed_brief_url(case_number)
             
             # Find related PDF and original text files
-            episode['pdfUrl'] = self.find_pdf_url(case_number, case_name)
-            episode['originalTextUrl'] = self.find_original_text_url(case_number, case_name)
+            episode.pdf_url = self.find_pdf_url(case_number, case_name)
+            episode.original_text_url = self.find_original_text_url(case_number, case_name)
             
             # Get Podbean URL and duration
             podbean_result = brief_info.get('podbean_result', {})
             if podbean_result and podbean_result.get('episode_info', {}).get('episode'):
                 episode_info = podbean_result['episode_info']['episode']
-                episode['audioUrl'] = episode_info.get('permalink_url', '#')
+                episode.audio_url = episode_info.get('permalink_url', '#')
                 
             if brief_info.get('duration'):
                 duration_seconds = brief_info['duration']
                 minutes = int(duration_seconds // 60)
                 seconds = int(duration_seconds % 60)
-                episode['duration'] = f"{minutes}:{seconds:02d}"
+                episode.duration = f"{minutes}:{seconds:02d}"
                 
             return episode
             
@@ -469,42 +583,24 @@ class EnhancedWebsiteUpdater:
             return None
     
     def deduplicate_and_sort(self):
-        """Remove duplicates and sort episodes"""
-        seen = set()
-        unique_episodes = []
-        
-        for episode in self.all_episodes:
-            key = (episode['caseNumber'], episode['type'])
-            if key not in seen:
-                seen.add(key)
-                unique_episodes.append(episode)
-        
-        # Sort by date (newest first) and then by case number
-        unique_episodes.sort(key=lambda x: (x['date'], x['caseNumber']), reverse=True)
-        
-        # Reassign IDs
-        for i, episode in enumerate(unique_episodes, 1):
-            episode['id'] = i
-        
-        self.all_episodes = unique_episodes
+        """Read the site's episodes from the store: one per (caseNumber, type), newest first"""
+        self.all_episodes = self.episode_store.episodes()
         print(f"📊 After deduplication: {len(self.all_episodes)} unique episodes")
     
     def calculate_enhanced_statistics(self):
         """Calculate enhanced episode statistics including AI descriptions"""
         self.stats['total'] = len(self.all_episodes)
-        self.stats['opinions'] = len([ep for ep in self.all_episodes if ep['type'] == 'opinion'])
-        self.stats['briefs'] = len([ep for ep in self.all_episodes if ep['type'] == 'brief'])
-        self.stats['analysis'] = len([ep for ep in self.all_episodes if ep['type'] == 'analysis'])
-        self.stats['with_audio'] = len([ep for ep in self.all_episodes if ep['audioUrl'] != '#'])
-        self.stats['with_descriptions'] = len([ep for ep in self.all_episodes if ep.get('description') and len(ep['description']) > 50])
+        self.stats['opinions'] = len([ep for ep in self.all_episodes if ep.type == OPINION])
+        self.stats['briefs'] = len([ep for ep in self.all_episodes if ep.type == BRIEF])
+        self.stats['analysis'] = len([ep for ep in self.all_episodes if ep.type == ANALYSIS])
+        self.stats['with_audio'] = len([ep for ep in self.all_episodes if ep.audio_url != '#'])
+        self.stats['with_descriptions'] = len([ep for ep in self.all_episodes if ep.description and len(ep.description) > 50])
         
         # Count AI-generated descriptions
         ai_description_count = 0
         for episode in self.all_episodes:
-            case_id = episode.get('caseNumber', '')
-            if case_id in getattr(self, 'briefs_data', {}):
-                if self.briefs_data[case_id].get('description_generated'):
-                    ai_description_count += 1
+            if episode.case_number in self.ai_described_cases:
+                ai_description_count += 1
         
         self.stats['with_ai_descriptions'] = ai_description_count
         
@@ -526,6 +622,13 @@ class EnhancedWebsiteUpdater:
                 print(f"❌ HTML file not found: {self.index_html_file}")
                 return False
                 
+            # Nothing to do if index.html still holds what the last run wrote from the same sources
+            build_key = self.build_cache.build_key(json.dumps(self.stats, sort_keys=True),
+                                                   str(self.episode_store.revision()))
+            if self.build_cache.output_unchanged(build_key, self.index_html_file):
+                print(f"✅ Website HTML already up to date ({self.stats['total']} episodes); no backup or rewrite needed")
+                return True
+                
             with open(self.index_html_file, 'r', encoding='utf-8') as f:
                 html_content = f.read()
             
@@ -535,7 +638,7 @@ class EnhancedWebsiteUpdater:
             shutil.copy2(self.index_html_file, backup_file)
             
             # Convert episodes to JavaScript format
-            episodes_js = json.dumps(self.all_episodes, indent=8)
+            episodes_js = episodes_json(self.all_episodes)
             
             # Replace episodes array in HTML
             pattern = r'const episodes = \[.*?\];'
@@ -571,6 +674,8 @@ class EnhancedWebsiteUpdater:
             # Write updated HTML
             with open(self.index_html_file, 'w', encoding='utf-8') as f:
                 f.write(updated_html)
+            self.build_cache.record_output(build_key, self.index_html_file)
+            self.build_cache.save()
             
             print(f"✅ Website HTML updated successfully with AI descriptions!")
             print(f"    Episodes: {self.stats['total']}")
@@ -584,6 +689,11 @@ class EnhancedWebsiteUpdater:
 
 def main():
     """Main function to run the enhanced website updater"""
+    parser = argparse.ArgumentParser(description="Update index.html from the episode store")
+    parser.add_argument("--brief", action="append", default=[], metavar="KEY",
+                        help="only re-convert this processed_briefs.json entry (a brief that just landed); may be repeated")
+    args = parser.parse_args()
+    
     print("🚀 ENHANCED WEBSITE UPDATER WITH AI DESCRIPTIONS")
     print("   AI-generated descriptions prioritized for professional content")
     print("="*60)
@@ -592,8 +702,11 @@ def main():
         # Create updater instance
         updater = EnhancedWebsiteUpdater()
         
-        # Load all content with AI description priority
-        updater.load_all_content()
+        # Load all content with AI description priority, or just the briefs that landed
+        if args.brief:
+            updater.update_briefs(args.brief)
+        else:
+            updater.load_all_content()
         
         # Check if we have episodes to update
         if not updater.all_episodes:
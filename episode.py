@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Website Episode Record
+The one episode type every website updater builds: fixed slots instead of a
+dict per episode, type and source limited to known (interned) values, and
+an encoder for the site's `const episodes = [...]` array that writes the
+fixed fields directly instead of going through json.dumps' pure-Python
+indent path
+
+episodes_json(episodes, indent=8) is the same text as
+json.dumps([e.to_dict() for e in episodes], indent=8).
+"""
+
+import math
+from json.encoder import encode_basestring, encode_basestring_ascii
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional
+
+# Episode types, as the site filters them
+OPINION = 'opinion'
+BRIEF = 'brief'
+ANALYSIS = 'analysis'
+
+# Sources an episode is converted from
+PODCAST = 'podcast'                    # logs/processed_cases.json
+PROCESSED_CASE = 'processed_case'      # probate_cases/processed_cases.json
+CASE_BRIEF = 'case_brief'              # probate_cases/processed_briefs.json
+SPECIAL_EDITION = 'special_edition'
+
+# Lookups return the constants above, so episodes read back from JSON share one string per value
+_TYPES: Dict[str, str] = {value: value for value in (OPINION, BRIEF, ANALYSIS)}
+_SOURCES: Dict[str, str] = {value: value for value in (PODCAST, PROCESSED_CASE, CASE_BRIEF, SPECIAL_EDITION)}
+
+# (slot, key in the site's JavaScript), in the order the site has always had them
+FIELDS = (
+    ('id', 'id'), ('type', 'type'), ('title', 'title'), ('court', 'court'), ('date', 'date'),
+    ('case_number', 'caseNumber'), ('description', 'description'), ('audio_url', 'audioUrl'),
+    ('text_url', 'textUrl'), ('pdf_url', 'pdfUrl'), ('duration', 'duration'), ('keywords', 'keywords'),
+    ('source', 'source'), ('original_text_url', 'originalTextUrl')
+)
+# Left out of the JSON when None, for pages whose episodes never had them
+OPTIONAL_FIELDS = frozenset(('pdf_url', 'source', 'original_text_url'))
+
+
+class Episode:
+    """One entry of the site's episode list"""
+
+    __slots__ = tuple(slot for slot, _ in FIELDS)
+
+    def __init__(self, id: int, type: str, title: str, court: str, date: str, case_number: str,
+                 description: str, audio_url: str, text_url: str, pdf_url: Optional[str] = None,
+                 duration='N/A', keywords: Optional[List[str]] = None, source: Optional[str] = None,
+                 original_text_url: Optional[str] = None):
+        if type not in _TYPES:
+            raise ValueError(f"Unknown episode type {type!r}")
+        if source is not None and source not in _SOURCES:
+            raise ValueError(f"Unknown episode source {source!r}")
+        self.id = id
+        self.type = _TYPES[type]
+        self.title = title
+        self.court = court
+        self.date = date
+        self.case_number = case_number
+        self.description = description
+        self.audio_url = audio_url
+        self.text_url = text_url
+        self.pdf_url = pdf_url
+        self.duration = duration
+        self.keywords = keywords if keywords is not None else []
+        self.source = None if source is None else _SOURCES[source]
+        self.original_text_url = original_text_url
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Episode":
+        """Episode from its site JSON object"""
+        return cls(**{slot: data[key] for slot, key in FIELDS if key in data})
+
+    def to_dict(self) -> dict:
+        """The site's JSON object for this episode"""
+        data = {}
+        for slot, key in FIELDS:
+            value = getattr(self, slot)
+            if value is not None or slot not in OPTIONAL_FIELDS:
+                data[key] = value
+        return data
+
+    def __repr__(self) -> str:
+        return f"Episode({self.type} {self.case_number!r} from {self.source}: {self.title!r})"
+
+
+def _encode(value, encode, indent: int, level: int) -> str:
+    """json.dumps(value, indent=indent) as it appears nested level deep"""
+    if isinstance(value, str):
+        return encode(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        if math.isfinite(value):
+            return float.__repr__(value)
+        return 'NaN' if value != value else ('Infinity' if value > 0 else '-Infinity')
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return '[]'
+        inner = '\n' + ' ' * (indent * (level + 1))
+        return ('[' + inner + (',' + inner).join(_encode(item, encode, indent, level + 1) for item in value)
+                + '\n' + ' ' * (indent * level) + ']')
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        if not value:
+            return '{}'
+        inner = '\n' + ' ' * (indent * (level + 1))
+        return ('{' + inner + (',' + inner).join(encode(key) + ': ' + _encode(item, encode, indent, level + 1)
+                                                 for key, item in value.items())
+                + '\n' + ' ' * (indent * level) + '}')
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def episodes_json(episodes: Iterable[Episode], indent: int = 8, ensure_ascii: bool = True) -> str:
+    """The site's episode array, as json.dumps of the episodes' dicts with this indent would write it"""
+    encode = encode_basestring_ascii if ensure_ascii else encode_basestring
+    item = '\n' + ' ' * indent
+    prefixes = [('\n' + ' ' * (2 * indent) + encode(key) + ': ', slot in OPTIONAL_FIELDS) for slot, key in FIELDS]
+    values_of = attrgetter(*(slot for slot, _ in FIELDS))
+    objects = []
+    for episode in episodes:
+        members = []
+        for (prefix, optional), value in zip(prefixes, values_of(episode)):
+            if value.__class__ is str:
+                members.append(prefix + encode(value))
+            elif value is not None or not optional:
+                members.append(prefix + _encode(value, encode, indent, 2))
+        objects.append('{' + ','.join(members) + item + '}')
+    if not objects:
+        return '[]'
+    return '[' + item + (',' + item).join(objects) + '\n]'
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Episode Store
+SQLite store of every website episode, fed source by source from the JSON
+databases (processed_briefs.json, logs/processed_cases.json,
+probate_cases/processed_cases.json), so the site's episode list is one
+indexed query instead of a rebuild of every source, and one brief that
+lands can be upserted on its own
+
+Every updater that writes index.html (enhanced, comprehensive and the
+ProBrep edition) syncs its sources here and reads the site's list back, so
+which one ran last changes episode wording, not which episodes are shown.
+
+Rows are kept per source entry. The site shows one episode per
+(caseNumber, type): the one from the earliest source, then the earliest
+entry in that source. A fallback source's episodes are only shown for case
+numbers no earlier source has. Re-syncing or removing an entry therefore
+brings back whatever it was hiding.
+
+Usage:
+    python episode_store.py                      # summary of logs/episode_store.sqlite3
+    python episode_store.py --case B333052
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from episode import CASE_BRIEF, PODCAST, PROCESSED_CASE, SPECIAL_EDITION, Episode
+
+DEFAULT_STORE_FILE = Path(__file__).resolve().parent / "logs" / "episode_store.sqlite3"
+
+# Sources in precedence order, shared by every updater that writes index.html: the site shows one
+# episode per (caseNumber, type), from the earliest source; processed cases only fill in case
+# numbers no brief or podcast episode has
+SITE_SOURCES = ((CASE_BRIEF, False), (PODCAST, False), (PROCESSED_CASE, True), (SPECIAL_EDITION, False))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    rank INTEGER NOT NULL,
+    fallback INTEGER NOT NULL DEFAULT 0,
+    state TEXT,
+    synced_at TEXT
+);
+CREATE TABLE IF NOT EXISTS episodes (
+    source TEXT NOT NULL,
+    source_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    case_number TEXT NOT NULL,
+    type TEXT NOT NULL,
+    date TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (source, source_key)
+);
+CREATE INDEX IF NOT EXISTS episodes_case_type ON episodes (case_number, type);
+"""
+
+# One row per (caseNumber, type), newest first; ties keep source order like the old in-memory sort
+_SITE_EPISODES = """
+SELECT data FROM (
+    SELECT e.data, e.date, e.case_number, s.rank, e.seq,
+           ROW_NUMBER() OVER (PARTITION BY e.case_number, e.type ORDER BY s.rank, e.seq) AS n
+    FROM episodes e JOIN sources s ON s.source = e.source
+    WHERE NOT (s.fallback AND EXISTS (
+        SELECT 1 FROM episodes o JOIN sources os ON os.source = o.source
+        WHERE o.case_number = e.case_number AND os.rank < s.rank))
+)
+WHERE n = 1
+ORDER BY date DESC, case_number DESC, rank, seq
+"""
+
+_INSERT = ("INSERT INTO episodes (source, source_key, seq, case_number, type, date, data) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+_UPSERT = (_INSERT + " ON CONFLICT(source, source_key) DO UPDATE SET "
+           "case_number = excluded.case_number, type = excluded.type, date = excluded.date, data = excluded.data")
+
+
+def _row(source: str, key: str, seq: int, episode: Episode) -> tuple:
+    return (source, key, seq, episode.case_number, episode.type, episode.date,
+            json.dumps(episode.to_dict(), ensure_ascii=False))
+
+
+class EpisodeStore:
+    """Episodes by source entry, resolved to the site's episode list on query"""
+
+    def __init__(self, path=DEFAULT_STORE_FILE, sources: Sequence[Tuple[str, bool]] = ()):
+        """sources: (name, fallback) in precedence order"""
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        with self._transaction():
+            for rank, (source, fallback) in enumerate(sources):
+                self._conn.execute(
+                    "INSERT INTO sources (source, rank, fallback) VALUES (?, ?, ?) "
+                    "ON CONFLICT(source) DO UPDATE SET rank = excluded.rank, fallback = excluded.fallback",
+                    (source, rank, int(fallback)))
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _bump_revision(self):
+        revision = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        self._conn.execute(f"PRAGMA user_version = {revision + 1}")
+
+    def revision(self) -> int:
+        """Incremented by every write, so the site can tell whether the episode list may have changed"""
+        with self._lock:
+            return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def is_current(self, source: str, state: str) -> bool:
+        """True if the source was last synced from the given state (e.g. file digest plus converter inputs)"""
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM sources WHERE source = ?", (source,)).fetchone()
+        return row is not None and row[0] is not None and row[0] == state
+
+    def count(self, source: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM episodes WHERE source = ?", (source,)).fetchone()[0]
+
+    def sync(self, source: str, episodes: Iterable[Tuple[str, Episode]], state: Optional[str]) -> int:
+        """Replace every episode of a source with (key, episode) pairs in source order, in one transaction
+
+        Within a source the first entry for a key wins.
+        """
+        rows, seen = [], set()
+        for key, episode in episodes:
+            if key not in seen:
+                seen.add(key)
+                rows.append(_row(source, key, len(rows), episode))
+        with self._transaction():
+            self._conn.execute("DELETE FROM episodes WHERE source = ?", (source,))
+            self._conn.executemany(_INSERT, rows)
+            self._conn.execute("UPDATE sources SET state = ?, synced_at = ? WHERE source = ?",
+                               (state, datetime.now().isoformat(timespec='seconds'), source))
+            self._bump_revision()
+        return len(rows)
+
+    def upsert(self, source: str, key: str, episode: Episode):
+        """Point update of one entry; a new entry goes after the source's existing ones
+
+        The source's state is cleared, so the next full run re-syncs it from its file.
+        """
+        with self._transaction():
+            seq = self._conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM episodes WHERE source = ?",
+                                     (source,)).fetchone()[0]
+            self._conn.execute(_UPSERT, _row(source, key, seq, episode))
+            self._conn.execute("UPDATE sources SET state = NULL WHERE source = ?", (source,))
+            self._bump_revision()
+
+    def remove(self, source: str, key: str) -> bool:
+        with self._transaction():
+            removed = self._conn.execute("DELETE FROM episodes WHERE source = ? AND source_key = ?",
+                                         (source, key)).rowcount
+            if removed:
+                self._conn.execute("UPDATE sources SET state = NULL WHERE source = ?", (source,))
+                self._bump_revision()
+        return bool(removed)
+
+    def episodes(self) -> List[Episode]:
+        """The site's episode list: one per (caseNumber, type), newest first, ids numbered from 1"""
+        with self._lock:
+            rows = self._conn.execute(_SITE_EPISODES).fetchall()
+        episodes = []
+        for number, (data,) in enumerate(rows, 1):
+            episode = Episode.from_dict(json.loads(data))
+            episode.id = number
+            episodes.append(episode)
+        return episodes
+
+    def lookup(self, case_number: str) -> List[dict]:
+        """Every stored episode for a case number, shown on the site or not, in source order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT e.source, e.source_key, e.data FROM episodes e JOIN sources s ON s.source = e.source "
+                "WHERE e.case_number = ? ORDER BY s.rank, e.seq", (case_number,)).fetchall()
+        return [{'source': source, 'key': key, 'episode': Episode.from_dict(json.loads(data))}
+                for source, key, data in rows]
+
+    def summary(self) -> List[tuple]:
+        """(source, episodes, synced_at) in precedence order"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT s.source, COUNT(e.source_key), s.synced_at FROM sources s "
+                "LEFT JOIN episodes e ON e.source = s.source GROUP BY s.source ORDER BY s.rank").fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Inspect the website episode store")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE_FILE)
+    parser.add_argument("--case", action="append", default=[], help="case number to look up; may be repeated")
+    args = parser.parse_args(argv)
+
+    if not args.store.exists():
+        print(f"❌ No episode store at {args.store}; run enhanced_website_updater.py first")
+        return 1
+    store = EpisodeStore(args.store)
+    for source, count, synced_at in store.summary():
+        print(f"📊 {source}: {count} episodes (synced {synced_at or 'by point update'})")
+    print(f"🌐 Site episodes: {len(store.episodes())}")
+    for case_number in args.case:
+        rows = store.lookup(case_number)
+        if not rows:
+            print(f"❌ {case_number}: not in the episode store")
+        for row in rows:
+            episode = row['episode']
+            print(f"📄 {case_number} {episode.type} from {row['source']} [{row['key']}]: {episode.title}")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,8 @@ Fix JavaScript syntax errors in index.html - Remove problematic line breaks from
 import re
 import os
 
+from text_sanitizer import sanitize
+
 def fix_javascript_syntax():
     """Fix JavaScript syntax errors caused by unescaped line breaks in descriptions"""
     
@@ -26,7 +28,7 @@ def fix_javascript_syntax():
     def fix_description(match):
         description_content = match.group(1)
         # Clean up the description - remove extra whitespace and newlines
-        cleaned_desc = re.sub(r'\s+', ' ', description_content.strip())
+        cleaned_desc = sanitize(description_content, 'whitespace')
         # Return the fixed description without the "Here is a professional..." prefix
         return f'"description": "{cleaned_desc}"'
     
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Ingestion
+Reads a large JSON object (processed_cases.json, processed_briefs.json) one
+member at a time instead of json.load-ing the whole file, and keeps only the
+fields a converter uses, so memory is bounded by the largest single case
+rather than by the file
+
+Each member value is decoded with the stdlib's C decoder (raw_decode) from a
+sliding buffer that grows only while a value is incomplete.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+BLOCK_SIZE = 256 * 1024  # characters read at a time
+WHITESPACE = ' \t\n\r'
+_NUMBER_TAIL = re.compile(r'[0-9+\-.eE]*\Z')  # the buffer may end inside a number
+
+# A field spec maps each key to keep to None (keep the whole value) or to the
+# spec of the fields to keep inside it, e.g. {'file_info': {'audio_result': None}}
+FieldSpec = Dict[str, Optional['FieldSpec']]
+
+
+def project(value: Any, fields: Optional[FieldSpec]) -> Any:
+    """The parts of value named by fields; missing keys stay missing and non-objects are kept as-is"""
+    if fields is None or not isinstance(value, dict):
+        return value
+    return {key: project(value[key], inner) for key, inner in fields.items() if key in value}
+
+
+class _Reader:
+    """Buffered cursor over a text file that decodes one JSON value at a time"""
+
+    def __init__(self, f, block_size: int):
+        self.f = f
+        self.block_size = block_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        """Drop consumed text and append up to size more characters; False at end of file"""
+        if self.eof:
+            return False
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer += data
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, '' at end of file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.block_size):
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}, found {found or 'end of file'!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next value, reading more of the file while it is cut off by the buffer's end"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Double what is buffered so a large value is re-parsed only O(log n) times
+                if self._fill(max(self.block_size, len(self.buffer))):
+                    continue
+                raise
+            if _NUMBER_TAIL.match(self.buffer, end) and self._fill(self.block_size):
+                continue  # a number cut at "12." or "1e" decodes as 12 or 1; re-read with the rest
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Walk an object's members, yielding each key with the cursor at its value
+
+        The caller must consume the value (value() or members()) before resuming.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.pos)
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+
+def iter_members(path, prefix: Tuple[str, ...] = (), fields: Optional[FieldSpec] = None,
+                 block_size: int = BLOCK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) for each member of the object at prefix in a JSON file, projected to fields
+
+    prefix names nested objects to descend into, e.g. ('processed_cases',);
+    nothing is yielded if it is absent or not an object. Members are yielded
+    in file order, so a duplicated key is yielded twice. Raises ValueError on
+    malformed JSON, possibly after some members have been yielded.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, block_size)
+        yield from _walk(reader, prefix, fields)
+        if reader.peek():
+            raise json.JSONDecodeError("Extra data", reader.buffer, reader.pos)
+
+
+def _walk(reader: _Reader, prefix: Tuple[str, ...], fields: Optional[FieldSpec]) -> Iterator[Tuple[str, Any]]:
+    if reader.peek() != '{':
+        reader.value()  # not an object: nothing to yield
+        return
+    for key in reader.members():
+        if not prefix:
+            yield key, project(reader.value(), fields)
+        elif key == prefix[0]:
+            yield from _walk(reader, prefix[1:], fields)
+        else:
+            reader.value()  # decoded and dropped
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency Control for LLM Calls
+Measures token throughput and latency per call and hill-climbs the number
+of concurrent Ollama requests between a lower and an upper bound
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+class _Call:
+    __slots__ = ('queue_wait', 'started', 'tokens')
+
+    def __init__(self, queue_wait: float, started: float):
+        self.queue_wait = queue_wait
+        self.started = started
+        self.tokens = 0
+
+
+class AdaptiveConcurrency:
+    """Gate that limits concurrent LLM calls to a level it tunes itself
+
+    Each ``slot()`` blocks until fewer than ``level`` calls are running.
+    After every window of completed calls the controller compares token
+    throughput with the previous window: while throughput keeps improving
+    it keeps moving the level in the same direction, and when throughput
+    drops it reverses. Changes within ``tolerance`` leave the level alone.
+    """
+
+    def __init__(self, min_level: int = 1, max_level: int = 8, initial: Optional[int] = None,
+                 tolerance: float = 0.05, log: Optional[Callable[[str], None]] = print):
+        self.min_level = max(1, min_level)
+        self.max_level = max(self.min_level, max_level)
+        self.level = min(max(initial or self.min_level, self.min_level), self.max_level)
+        self.tolerance = tolerance
+        self.log = log
+        self.history = []
+
+        self._cond = threading.Condition()
+        self._active = 0
+        self._direction = 1
+        self._previous = None
+        self._reset_window(None)
+
+    def _reset_window(self, now: Optional[float]):
+        self._window_start = now
+        self._window_calls = 0
+        self._window_tokens = 0
+        self._window_latency = 0.0
+        self._window_queue = 0.0
+
+    @contextmanager
+    def slot(self):
+        """Hold one concurrency slot for the duration of an LLM call
+
+        The yielded object has a ``tokens`` attribute the caller should set
+        to the number of tokens the call processed.
+        """
+        requested = time.monotonic()
+        with self._cond:
+            while self._active >= self.level:
+                self._cond.wait()
+            self._active += 1
+            started = time.monotonic()
+            if self._window_start is None:
+                self._window_start = started
+        call = _Call(started - requested, started)
+        try:
+            yield call
+        finally:
+            finished = time.monotonic()
+            with self._cond:
+                self._active -= 1
+                self._record(call, finished)
+                self._cond.notify_all()
+
+    def _record(self, call: _Call, finished: float):
+        self._window_calls += 1
+        self._window_tokens += call.tokens
+        self._window_latency += finished - call.started
+        self._window_queue += call.queue_wait
+        if self._window_calls < max(4, 2 * self.level):
+            return
+
+        elapsed = max(finished - self._window_start, 1e-6)
+        throughput = self._window_tokens / elapsed
+        mean_latency = self._window_latency / self._window_calls
+        mean_queue = self._window_queue / self._window_calls
+        self.history.append((self.level, throughput, mean_latency, mean_queue))
+
+        previous = self._previous
+        if previous is None:
+            step = self._direction
+        elif throughput < previous * (1 - self.tolerance):
+            self._direction = -self._direction
+            step = self._direction
+        elif throughput <= previous * (1 + self.tolerance):
+            step = 0
+        else:
+            step = self._direction
+
+        new_level = self.level + step
+        if new_level > self.max_level or new_level < self.min_level:
+            self._direction = -self._direction
+            new_level = self.level
+
+        if self.log:
+            change = f"{self.level} → {new_level}" if new_level != self.level else f"{self.level} (holding)"
+            self.log(f"  ⚙️ Concurrency {change}: {throughput:.1f} tok/s, "
+                     f"mean latency {mean_latency:.1f}s, mean queue wait {mean_queue:.1f}s")
+
+        self._previous = throughput
+        self.level = new_level
+        self._reset_window(finished)
+
+    def best_level(self) -> Optional[int]:
+        """Level with the highest throughput observed so far"""
+        if not self.history:
+            return None
+        return max(self.history, key=lambda entry: entry[1])[0]
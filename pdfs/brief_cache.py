@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Cache for Ollama Responses
+Shared by the brief_cases.py scripts so chunk summaries and final briefs
+survive crashes and prompt tweaks instead of being regenerated from scratch
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".brief_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class ChunkCache:
+    """On-disk cache keyed by hash(model, prompt template, input text)
+
+    Entries are plain UTF-8 files sharded by the first two hex digits of the
+    key. Every hit refreshes the entry's mtime, so eviction drops the least
+    recently used entries first once the cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(path.stat().st_size for path in self._entries())
+
+    @staticmethod
+    def make_key(model: str, template: str, *parts: str) -> str:
+        """Build a cache key from the model, the unformatted template and its inputs"""
+        digest = hashlib.sha256()
+        for part in (model, template) + parts:
+            data = str(part).encode('utf-8')
+            # Length-prefix each field so ("ab", "c") and ("a", "bc") differ
+            digest.update(len(data).to_bytes(8, 'big'))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def _entries(self):
+        return self.cache_dir.glob("*/*.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            value = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: str):
+        """Store a response atomically and evict old entries if over budget"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = value.encode('utf-8')
+
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+
+        with self._lock:
+            try:
+                self._total_bytes -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current cache size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,1007 @@
+#!/usr/bin/env python3
+"""
+Brief Engine
+Shared case brief pipeline behind the brief_cases.py scripts: PDF
+extraction, chunking, Ollama access, caching, scheduling and the prompt/post-processing profiles
+that used to live in three forked copies of the same script
+
+Usage:
+    python brief_engine.py                                   # published_text + unpublished_text, PDFs included
+    python brief_engine.py --dir published_text=journal_article --dir unpublished=classic_brief
+    python brief_engine.py --dir published_text --pdf-dir published=published_text
+"""
+
+import argparse
+import http.client
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import chunker
+import opinion_reader
+import tree_reduce
+from adaptive_concurrency import AdaptiveConcurrency
+import brief_journal
+import brief_metrics
+from brief_cache import ChunkCache
+from brief_index import DEFAULT_INDEX_FILE, BriefIndex, export_csv
+from brief_journal import DEFAULT_JOURNAL_FILE, BriefJournal
+from brief_manifest import BriefManifest
+from brief_metrics import DEFAULT_METRICS_FILE, CallMetrics, CallRecord
+from brief_progress import DEFAULT_PROGRESS_FILE, ProgressLog
+from brief_scheduler import BriefScheduler
+from chunker import ChunkRef
+from llm_retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from opinion_fingerprint import DuplicateIndex, Fingerprint
+from ollama_client import OllamaClient, OllamaError
+from pdf_extract import DEFAULT_PAGE_CACHE_DIR, PdfExtractError, PdfExtractor, extraction_jobs
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import text_sanitizer
+
+# === Settings ===
+CONTEXT_WINDOW = 8192  # tokens; sent to Ollama as num_ctx
+RESPONSE_RESERVE_TOKENS = 1024
+FINAL_RESPONSE_RESERVE_TOKENS = 2048
+TREE_REDUCE = True  # merge chunk summaries in groups until they fit the final prompt
+CHUNK_OVERLAP_TOKENS = 0
+MIN_WORKERS = 1
+MAX_WORKERS = 8  # upper bound; AdaptiveConcurrency picks the working level
+INITIAL_WORKERS = 4
+FILES_IN_FLIGHT = 2  # opinions admitted to the shared worker pool at once
+CHUNKS_IN_FLIGHT = 16  # chunk tasks per opinion queued at once; bounds memory on long records
+PRIORITIZE = True  # published opinions first, then shortest first, instead of filename order
+STATUS_PRIORITY_TOKENS = {"Published": 0, "Unpublished": 250000}  # head start, in opinion tokens
+AGING_TOKENS_PER_SECOND = 200  # a waiting opinion's priority improves by this much per second
+MODEL = "llama3"
+CACHE_DIR = Path(__file__).resolve().parent / ".brief_cache"
+CACHE_MAX_MB = 512
+OLLAMA_BACKEND = os.environ.get("BRIEF_OLLAMA_BACKEND", "http")  # "http" or "cli"
+KEEP_ALIVE = "30m"  # keep the model, and the instruction prefix in its prompt cache, loaded between calls
+WARM_PROMPT_PREFIXES = True  # prefill each profile's chunk instructions while opinions are fingerprinted
+PROGRESS_FILE = DEFAULT_PROGRESS_FILE  # JSON-lines progress events; None to disable
+JOURNAL_FILE = DEFAULT_JOURNAL_FILE  # SQLite write-ahead journal for resuming batches
+INDEX_FILE = DEFAULT_INDEX_FILE  # SQLite index of every brief written, for lookups by case number
+METRICS_FILE = DEFAULT_METRICS_FILE  # per-call LLM metrics in Prometheus text format; None to disable
+LLM_RETRIES = 3  # extra attempts for a failed or empty LLM call, with jittered exponential backoff
+RETRY_BASE_DELAY_S = 2.0
+RETRY_MAX_DELAY_S = 60.0
+BREAKER_FAILURES = 3  # consecutive failures that pause every LLM call
+BREAKER_COOLDOWN_S = 15.0  # first pause; doubles while the server stays down
+BREAKER_MAX_WAIT_S = 900.0  # stop the run once calls have been paused this long
+PROGRESS_TOKEN_INTERVAL = 256  # emit a brief_tokens event every N streamed tokens
+DEDUPLICATE = True  # fingerprint opinions first and reuse briefs/summaries for duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.8  # estimated Jaccard similarity of 5-word shingles
+EXPORT_SUMMARY_CSV = True  # rewrite each Case_Briefs folder's summary CSV from the index after a run
+
+PDFS_DIR = Path(__file__).resolve().parent
+DEFAULT_DIRECTORIES = {
+    "published_text": "journal_article",
+    "unpublished_text": "journal_article"
+}
+PDF_DIRECTORIES = {  # opinion PDFs extracted into a text directory at the start of a default run
+    "published": "published_text",
+    "unpublished": "unpublished_text"
+}
+EXTRACT_WORKERS = None  # PDF extraction processes; None = one per CPU
+PAGE_CACHE_DIR = DEFAULT_PAGE_CACHE_DIR  # extracted page text, keyed by the PDF's hash
+PAGE_CACHE_MAX_MB = 256
+
+# === Prompt Profiles ===
+JOURNAL_CHUNK_PROMPT = """You are a legal journalist analyzing a California court opinion for a probate law journal article. Focus on identifying and extracting information relevant to a comprehensive legal journal article for California probate practitioners.
+
+IMPORTANT: Use only plain text with no special characters. Do not use asterisks, bullets, dashes, or any formatting symbols. Write in complete sentences and well-structured paragraphs. Use double line breaks between paragraphs for clear separation and readability.
+
+From this portion of the court opinion, identify:
+- Factual background and story elements about the parties and disputes
+- Procedural history and legal proceedings
+- California Probate Code sections mentioned or applied
+- Legal issues and disputes presented
+- Court's reasoning, analysis, and rulings
+- How the court applied or interpreted probate code provisions
+- Practical implications for probate practice
+
+[Chunk {index}/{total}]
+
+{text}
+"""
+
+JOURNAL_MERGE_PROMPT = """You are a legal journalist preparing notes for a probate law journal article about a California court opinion. Below are summaries of consecutive portions of the same opinion. Combine them into one summary that keeps every fact, party, date, procedural step, California Probate Code section, legal issue, and piece of the court's reasoning they contain, in the order they appear.
+
+IMPORTANT: Use only plain text with no special characters. Do not use asterisks, bullets, dashes, or any formatting symbols. Do not mention summaries or portions.
+
+Summaries:
+{summaries}
+"""
+
+JOURNAL_FINAL_PROMPT = """You are a legal journalist writing an article for a probate legal journal about a California court opinion. Your article should be written for experienced California probate practitioners and should tell the complete story of this case in an engaging, narrative style.
+
+IMPORTANT: You are provided with multiple chunk summaries below that collectively contain the complete court opinion. You MUST analyze and synthesize information from ALL the chunk summaries provided to create one comprehensive journal article. Use your discretion to include all information necessary to tell the complete story. Do NOT mention chunks, ask for additional information, or limit your analysis to only some of the summaries.
+
+Structure your journal article as follows:
+
+Begin with the story of the facts of the case. Tell the human story behind the legal dispute - who were the parties, what happened, what led to this litigation. Make this engaging and narrative, like the opening of a legal journal article that draws readers in.
+
+Then explain the procedural posture of the case. Describe how this case made its way through the court system, what motions were filed, what the trial court ruled, and how it came before this appellate court.
+
+Next, explain the legal issues in dispute in the case. What were the key legal questions the parties disagreed about? What interpretations of law were at stake?
+
+Finally, explain how the Court ruled and the court's basis for the ruling. What did the court decide and why? What was the court's reasoning and legal analysis?
+
+Throughout your article, focus on the application of the probate code to this case. Describe what probate code sections were involved, how they applied to the facts, and how the court interpreted them. This should be woven throughout your narrative, not treated as a separate section.
+
+CRITICAL FORMATTING INSTRUCTIONS:
+- Use NO special characters, asterisks, bullets, dashes, or formatting symbols
+- Write in well-structured paragraphs with clear narrative flow
+- Use double line breaks between paragraphs for proper separation and readability
+- Write in an engaging, journalistic style appropriate for a legal publication
+- Use professional legal terminology but maintain readability
+- Tell a complete story that flows from facts through procedure to legal analysis to resolution
+- Analyze ALL chunk summaries provided below and synthesize them into one complete article
+- Do NOT mention chunks or ask for additional information
+- Focus heavily on probate code application and interpretation throughout
+
+Summaries:
+{summaries}
+"""
+
+CLASSIC_CHUNK_PROMPT = """You are a legal assistant. Please summarize the following part of a court opinion. Focus on any facts, procedural history, legal issues, and reasoning presented in this segment.
+
+[Chunk {index}/{total}]
+
+{text}
+"""
+
+CLASSIC_MERGE_PROMPT = """You are a legal assistant. Below are summaries of consecutive parts of the same court opinion. Combine them into one summary that keeps all facts, procedural history, legal issues, holdings, and reasoning they contain, in order.
+
+Summaries:
+{summaries}
+"""
+
+CLASSIC_FINAL_PROMPT = """Using the following chunk summaries of a court opinion, generate a legal case brief. Include:
+1. Case name
+2. Court and date
+3. Procedural posture
+4. Facts
+5. Legal issue(s)
+6. Holding
+7. Reasoning
+
+Summaries:
+{summaries}
+"""
+
+def clean_special_characters(text):
+    """Remove asterisks and other problematic special characters for TTS"""
+    return text_sanitizer.TTS(text)
+
+
+def add_header_footer(brief_text):
+    # Try to extract case name and court from the brief text
+    lines = brief_text.strip().splitlines()
+    case = "Unknown Case"
+    court = "Unknown Court"
+    issued_by = "Unknown Judge(s)"
+
+    for line in lines[:10]:  # search top 10 lines
+        if "case name" in line.lower():
+            case = line.split(":", 1)[-1].strip()
+        elif "court" in line.lower():
+            court = line.split(":", 1)[-1].strip()
+        elif "issued by" in line.lower():
+            issued_by = line.split(":", 1)[-1].strip()
+
+    header = f"This case brief is an automatically generated brief of the Court's opinion in the case of {case}, issued by {issued_by} of the {court}.\n"
+    footer = "\nEnd of Brief"
+    return f"{header}\n{brief_text.strip()}{footer}"
+
+
+class BriefProfile:
+    """Prompts and post-processing that define one style of brief"""
+
+    def __init__(self, name: str, chunk_prompt: str, merge_prompt: str, final_prompt: str,
+                 summary_label: str, postprocess: Callable[[str], str], csv_name: str):
+        self.name = name
+        self.chunk_prompt = chunk_prompt
+        self.merge_prompt = merge_prompt
+        self.final_prompt = final_prompt
+        self.summary_label = summary_label
+        self.postprocess = postprocess
+        self.csv_name = csv_name
+
+
+PROFILES = {
+    "journal_article": BriefProfile(
+        name="journal_article",
+        chunk_prompt=JOURNAL_CHUNK_PROMPT,
+        merge_prompt=JOURNAL_MERGE_PROMPT,
+        final_prompt=JOURNAL_FINAL_PROMPT,
+        summary_label="Summary of Chunk {index}: ",
+        postprocess=clean_special_characters,
+        csv_name="0000-Brief_Summaries.csv"
+    ),
+    "classic_brief": BriefProfile(
+        name="classic_brief",
+        chunk_prompt=CLASSIC_CHUNK_PROMPT,
+        merge_prompt=CLASSIC_MERGE_PROMPT,
+        final_prompt=CLASSIC_FINAL_PROMPT,
+        summary_label="[Summary of Chunk {index}]\n",
+        postprocess=add_header_footer,
+        csv_name="brief_summaries.csv"
+    )
+}
+
+# === Helpers ===
+def prompt_prefix(template: str) -> str:
+    """The fixed instructions a prompt template starts with, up to its first placeholder"""
+    return template.split("{", 1)[0] if "{" in template else ""
+
+
+def server_stats(message: dict) -> dict:
+    """CallRecord fields from the statistics (durations in nanoseconds) in Ollama's final message"""
+    def seconds(key):
+        return round(message[key] / 1e9, 3) if key in message else None
+
+    return {
+        "prompt_eval_tokens": message.get("prompt_eval_count"),
+        "prefill_s": seconds("prompt_eval_duration"),
+        "load_s": seconds("load_duration")
+    }
+
+
+def parse_case_filename(filename):
+    stem = Path(filename).stem
+    case_number = stem.split('_')[0]
+    status = "Published" if "_published" in stem.lower() else "Unpublished"
+    name_parts = stem.split('_')[1:]
+    name_parts = [part for part in name_parts if part.lower() not in ("published", "unpublished")]
+    case_name = " ".join(name_parts).strip()
+    return case_number, case_name, status
+
+
+def get_output_brief_filename(case_number, case_name, status):
+    safe_name = re.sub(r'[^\w\s-]', '', case_name).strip().replace(' ', '_')
+    return f"{case_number}_(Case_Brief)_{safe_name}_({status.lower()}).txt"
+
+
+def get_output_folder(base_dir, status, include_case_briefs=True):
+    now = datetime.now()
+    base = f"{now.year}-{now.month:02d}"
+    suffix = f"_Case_Briefs_({status})" if include_case_briefs else f"_({status})"
+    folder_path = Path(base_dir) / (base + suffix)
+    folder_path.mkdir(parents=True, exist_ok=True)
+    return folder_path
+
+
+def get_output_paths(filepath: Path):
+    """(case_number, case_name, status, brief_path, archive_path) for an opinion"""
+    case_number, case_name, status = parse_case_filename(filepath.name)
+    brief_filename = get_output_brief_filename(case_number, case_name, status)
+    brief_path = get_output_folder(filepath.parent, status, include_case_briefs=True) / brief_filename
+    archive_path = get_output_folder(filepath.parent, status, include_case_briefs=False) / filepath.name
+    return case_number, case_name, status, brief_path, archive_path
+
+
+def discard_partial(partial_path: Path):
+    try:
+        partial_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def publish_brief(partial_path: Path, brief_path: Path, brief: str):
+    """Write the finished brief to partial_path, then move it over brief_path atomically"""
+    try:
+        partial_path.write_text(brief, encoding='utf-8')
+        os.replace(partial_path, brief_path)
+    except Exception:
+        discard_partial(partial_path)
+        raise
+
+
+class DuplicateOf:
+    """An earlier opinion whose brief or chunk summaries a duplicate can reuse"""
+
+    def __init__(self, case_number: str, brief_path, similarity: float = 1.0, exact: bool = False):
+        self.case_number = case_number
+        self.brief_path = Path(brief_path)
+        self.similarity = similarity
+        self.exact = exact
+
+    def matched(self, similarity: float, exact: bool) -> "DuplicateOf":
+        return DuplicateOf(self.case_number, self.brief_path, similarity, exact)
+
+
+# === Engine ===
+class BriefEngine:
+    """One model connection, cache, concurrency controller and worker pool for a whole batch"""
+
+    def __init__(self, model: str = MODEL, backend: str = OLLAMA_BACKEND,
+                 cache_dir=CACHE_DIR, cache_max_mb: int = CACHE_MAX_MB, progress_file=PROGRESS_FILE,
+                 journal_file=JOURNAL_FILE, index_file=INDEX_FILE, metrics_file=METRICS_FILE,
+                 page_cache_dir=PAGE_CACHE_DIR):
+        self.model = model
+        self.backend = backend
+        self.cache = ChunkCache(cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        self.client = OllamaClient(model=model, pool_size=MAX_WORKERS, options={"num_ctx": CONTEXT_WINDOW},
+                                   keep_alive=KEEP_ALIVE)
+        self.concurrency = AdaptiveConcurrency(MIN_WORKERS, MAX_WORKERS, initial=INITIAL_WORKERS)
+        self.retry_policy = RetryPolicy(LLM_RETRIES, RETRY_BASE_DELAY_S, RETRY_MAX_DELAY_S)
+        self.breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_COOLDOWN_S, max_wait=BREAKER_MAX_WAIT_S)
+        self.progress = ProgressLog(progress_file)
+        self.journal = BriefJournal(journal_file)
+        self.index = BriefIndex(index_file)
+        self.metrics = CallMetrics()
+        self.metrics_file = metrics_file
+        self.page_cache_dir = page_cache_dir
+        self._budgets = {}
+
+    def budgets(self, profile: BriefProfile):
+        """(chunk, merge group, final summaries) token budgets for a profile"""
+        if profile.name not in self._budgets:
+            self._budgets[profile.name] = (
+                chunker.chunk_token_budget(CONTEXT_WINDOW, profile.chunk_prompt, RESPONSE_RESERVE_TOKENS),
+                chunker.chunk_token_budget(CONTEXT_WINDOW, profile.merge_prompt, RESPONSE_RESERVE_TOKENS),
+                chunker.chunk_token_budget(CONTEXT_WINDOW, profile.final_prompt, FINAL_RESPONSE_RESERVE_TOKENS)
+            )
+        return self._budgets[profile.name]
+
+    def chunking_key(self, profile: BriefProfile) -> str:
+        """Hash of everything that decides a profile's chunks and their summaries besides the text and model
+
+        A manifest's summaries are only reused under the same key, so editing
+        a chunk prompt or the chunk budget re-summarizes amended opinions.
+        """
+        chunk_tokens = self.budgets(profile)[0]
+        return brief_journal.text_hash(repr((profile.chunk_prompt, profile.summary_label, chunk_tokens,
+                                             CHUNK_OVERLAP_TOKENS, chunker.CHARS_PER_TOKEN)))
+
+    def run_ollama(self, prompt, on_token=None, kind="llm", file=None, on_restart=None):
+        """One LLM call, retried with backoff while it fails or comes back empty
+
+        Raises OllamaError once the retries are used up, and CircuitOpenError if
+        the server stays down past BREAKER_MAX_WAIT_S. on_restart is called
+        before a retry so streamed output from the failed attempt can be dropped.
+        """
+        label = f"{kind}{f' for {file}' if file else ''}"
+        delays = self.retry_policy.delays()
+        attempt = 0
+        while True:
+            self.breaker.wait()
+            if attempt and on_restart:
+                on_restart()
+            response, error = self._call_ollama(prompt, on_token, kind, file, retried=attempt > 0)
+            if error is None:
+                self.breaker.record_success()  # an empty answer still means the server is up
+                if response.strip():
+                    return response
+            else:
+                self.breaker.record_failure()
+            delay = next(delays, None)
+            if delay is None:
+                if error is not None:
+                    raise OllamaError(f"{label} failed after {attempt + 1} attempts: {error}") from error
+                raise OllamaError(f"{label} came back empty after {attempt + 1} attempts")
+            print(f"  🔁 Retrying {label} in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def _call_ollama(self, prompt, on_token, kind, file, retried=False, **params):
+        """(response, exception or None) of a single attempt, recorded in self.metrics
+
+        params (e.g. options) are passed on to the HTTP client.
+        """
+        error = None
+        retries = [1 if retried else 0]
+        stats = {}
+        with self.concurrency.slot() as call:
+            started = time.monotonic()
+            try:
+                if self.backend == "cli":
+                    response = self.run_ollama_cli(prompt)
+                    if on_token and response:
+                        on_token(response)
+                else:
+                    response = self.client.generate(
+                        prompt, on_token=on_token, on_retry=lambda: retries.__setitem__(0, retries[0] + 1),
+                        on_done=stats.update, **params)
+            except (OllamaError, OSError, ValueError, http.client.HTTPException) as e:
+                print(f"  ⚠️ Ollama request failed ({kind}{f' for {file}' if file else ''}): {e}")
+                error = e
+                response = ""
+            wall_s = time.monotonic() - started
+            call.tokens = chunker.estimate_tokens(prompt) + chunker.estimate_tokens(response)
+
+        if error is not None:
+            outcome = brief_metrics.ERROR
+        elif response.strip():
+            outcome = brief_metrics.OK
+        else:
+            outcome = brief_metrics.EMPTY
+            print(f"  ⚠️ Ollama returned an empty response ({kind}{f' for {file}' if file else ''})")
+        self.metrics.record(CallRecord(
+            kind, file, self.backend, round(wall_s, 3), round(call.queue_wait, 3), len(prompt), len(response),
+            chunker.estimate_tokens(prompt), chunker.estimate_tokens(response), outcome,
+            type(error).__name__ if error is not None else None, retries[0], **server_stats(stats)))
+        return response, error
+
+    def warm_prompt_prefixes(self, profiles) -> Optional[threading.Thread]:
+        """Prefill each profile's fixed chunk instructions in the background
+
+        Ollama reuses the cached prompt prefix of a slot, so once the model is
+        loaded with the instructions every chunk prompt only pays prefill for
+        its own text. Doing it now overlaps model load and prefill with
+        fingerprinting instead of the first chunk call. Each prefill takes a
+        concurrency slot and goes through the circuit breaker like any other
+        call, but is tried only once.
+        """
+        if self.backend != "http" or not WARM_PROMPT_PREFIXES:
+            return None
+        prefixes = sorted({prompt_prefix(profile.chunk_prompt) for profile in profiles} - {""})
+
+        def warm():
+            for prefix in prefixes:
+                try:
+                    self.breaker.wait()
+                except CircuitOpenError:
+                    return  # the batch's own calls report the outage
+                _, error = self._call_ollama(prefix, None, "prefill", None,
+                                             options=dict(self.client.options, num_predict=1))
+                if error is not None:
+                    self.breaker.record_failure()
+                    return
+                self.breaker.record_success()
+
+        thread = threading.Thread(target=warm, name="prefix-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def run_ollama_cli(self, prompt):
+        result = subprocess.run(
+            ['ollama', 'run', self.model, '--', prompt],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        if result.returncode != 0:
+            detail = result.stderr.strip().splitlines()
+            raise OllamaError(f"ollama run exited with {result.returncode}: {detail[-1] if detail else 'no output'}")
+        return result.stdout.strip()
+
+    def cached_ollama(self, template, prompt, *key_parts, on_token=None, call_info=None, kind="llm", file=None,
+                      on_restart=None):
+        """Run a prompt through Ollama unless the same template and inputs are already cached
+
+        If call_info is a dict it is filled in with cache/latency/token details.
+        kind and file label the call in self.metrics.
+        """
+        started = time.monotonic()
+        key = self.cache.make_key(self.model, template, *key_parts)
+        response = self.cache.get(key)
+        cached = response is not None
+        if cached:
+            self.metrics.cache_hit(kind)
+        else:
+            response = self.run_ollama(prompt, on_token=on_token, kind=kind, file=file, on_restart=on_restart)
+            if response:
+                self.cache.put(key, response)
+        if call_info is not None:
+            call_info.update({
+                "cached": cached,
+                "latency_s": round(time.monotonic() - started, 3),
+                "prompt_tokens": chunker.estimate_tokens(prompt),
+                "response_tokens": chunker.estimate_tokens(response)
+            })
+        return response
+
+    def summarize_chunk(self, profile, index, total, chunk, call_info=None, file=None):
+        prompt = profile.chunk_prompt.format(index=index+1, total=total, text=chunk)
+        summary = self.cached_ollama(profile.chunk_prompt, prompt, f"{index+1}/{total}", chunk,
+                                     call_info=call_info, kind="chunk", file=file)
+        return profile.summary_label.format(index=index+1) + summary
+
+    def merge_summaries(self, profile, level, group, call_info=None, file=None):
+        joined = "\n\n".join(group)
+        prompt = profile.merge_prompt.format(summaries=joined)
+        return self.cached_ollama(profile.merge_prompt, prompt, joined, call_info=call_info, kind="merge", file=file)
+
+    def generate_brief(self, profile, joined_summaries, partial_path: Path, on_progress=None, file=None):
+        """Run the final prompt, streaming raw tokens into partial_path as they arrive"""
+        final_prompt = profile.final_prompt.format(summaries=joined_summaries)
+        streamed = [0]
+
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as partial_file:
+                def on_token(token):
+                    partial_file.write(token)
+                    partial_file.flush()
+                    streamed[0] += 1
+                    if on_progress and streamed[0] % PROGRESS_TOKEN_INTERVAL == 0:
+                        on_progress(streamed[0])
+
+                def on_restart():
+                    partial_file.seek(0)
+                    partial_file.truncate()
+                    streamed[0] = 0
+
+                call_info = {}
+                raw_brief = self.cached_ollama(profile.final_prompt, final_prompt, joined_summaries,
+                                               on_token=on_token, call_info=call_info, kind="brief", file=file,
+                                               on_restart=on_restart)
+        except Exception:
+            # A failed brief leaves no stray .partial next to the finished ones
+            discard_partial(partial_path)
+            raise
+        call_info["streamed_tokens"] = streamed[0]
+        return raw_brief, call_info
+
+    def process_file(self, filepath: Path, profile: BriefProfile, fingerprint: Optional[Fingerprint] = None,
+                     duplicate_of: Optional[DuplicateOf] = None):
+        """Staged plan for one opinion; yields batches of LLM calls for BriefScheduler to run
+
+        An LLM failure that outlasts the retries fails only this opinion: its
+        finished chunk summaries stay in the journal for the next run.
+        """
+        try:
+            return (yield from self.brief_file(filepath, profile, fingerprint, duplicate_of))
+        except CircuitOpenError:
+            raise
+        except OllamaError as e:
+            saved = self.journal.chunk_count(filepath)
+            print(f"  ❌ Gave up on {filepath.name}: {e}")
+            if saved:
+                print(f"  💾 Kept {saved} finished chunk summaries for the next run")
+            self.progress.emit("file_failed", file=filepath.name, error=str(e), chunks_saved=saved)
+            return None
+
+    def brief_file(self, filepath: Path, profile: BriefProfile, fingerprint: Optional[Fingerprint] = None,
+                   duplicate_of: Optional[DuplicateOf] = None):
+        """process_file without the failure handling"""
+        case_number, case_name, status, brief_path, archive_path = get_output_paths(filepath)
+        source_hash = None
+        reference = None
+        amended = False
+
+        if brief_path.exists():
+            manifest = BriefManifest.load(brief_path)
+            if manifest is not None:
+                source_hash = opinion_reader.file_hash(filepath)
+                amended = manifest.source_hash != source_hash
+            if amended:
+                print(f"\n📝 {filepath.name} has changed since its brief was written; re-briefing changed chunks")
+                self.progress.emit("file_amended", file=filepath.name, brief=str(brief_path))
+                reference = manifest
+
+        if brief_path.exists() and not amended:
+            print(f"✅ Skipping {filepath.name} (brief already exists)")
+            self.progress.emit("file_skipped", file=filepath.name, brief=str(brief_path))
+            record = self.journal.get_file(filepath)
+            if record and record['state'] in (brief_journal.BRIEFED, brief_journal.ARCHIVING):
+                # The last run wrote the brief but died before archiving the original
+                self.archive_original(filepath, archive_path)
+            return BriefIndex.record(brief_path, case_number, case_name, status, profile.name, filepath.name)
+
+        print(f"\n📄 Processing {filepath.name} ({profile.name})...")
+
+        chunk_tokens, merge_tokens, final_tokens = self.budgets(profile)
+
+        if duplicate_of and reference is None:
+            if duplicate_of.exact and duplicate_of.brief_path.exists():
+                return self.reuse_brief(filepath, profile, source_hash or opinion_reader.file_hash(filepath),
+                                        fingerprint, duplicate_of)
+            reference = BriefManifest.load(duplicate_of.brief_path)
+
+        # Keep the chunks an earlier brief already summarized and only re-chunk what changed
+        reuse = {}
+        if (reference is not None and not CHUNK_OVERLAP_TOKENS and reference.profile == profile.name
+                and reference.model == self.model and reference.chunking == self.chunking_key(profile)):
+            text = filepath.read_text(encoding='utf-8', errors='ignore')
+            source_hash = brief_journal.text_hash(text)
+            aligned = chunker.align_chunks(text, reference.references(), chunk_tokens)
+            del text
+            chunks = [chunk for chunk, _ in aligned]
+            reuse = {idx: ref_index for idx, (_, ref_index) in enumerate(aligned) if ref_index is not None}
+            sizes = [chunker.estimate_tokens(chunk) for chunk in chunks]
+            source = f"near-duplicate {duplicate_of.case_number}" if duplicate_of else "previous brief"
+            print(f"  ♻️ {len(reuse)}/{len(chunks)} chunks unchanged from {source}")
+        else:
+            # First pass: size the chunks and hash the text without holding either in memory
+            chunks = None
+            hash_block, hexdigest = opinion_reader.text_hasher()
+            sizes = [chunker.estimate_tokens(chunk) for chunk in chunker.iter_chunks(
+                opinion_reader.read_paragraphs(filepath, on_text=hash_block), chunk_tokens, CHUNK_OVERLAP_TOKENS)]
+            source_hash = hexdigest()
+        total_chunks = len(sizes)
+        stats = chunker.size_stats(sizes, chunk_tokens)
+        print(f"  ✂️ {stats['chunks']} chunks, {stats['min_tokens']}-{stats['max_tokens']} tokens "
+              f"(mean {stats['mean_tokens']}, {stats['fill_ratio']:.0%} of {chunk_tokens}-token budget)")
+        file_started = time.monotonic()
+        calls = []  # call_info of every chunk, merge and final call, for the brief index
+        self.progress.emit("file_started", file=filepath.name, case_number=case_number,
+                           profile=profile.name, **stats)
+        self.journal.start_file(filepath, case_number, profile.name, source_hash,
+                                total_chunks, brief_path, archive_path)
+
+        def summarize(idx, chunk, chunk_hash):
+            self.progress.emit("chunk_started", file=filepath.name, chunk=idx+1, total=total_chunks)
+            summary = self.journal.chunk_summary(filepath, idx, chunk_hash)
+            if idx in reuse and reference.summary(reuse[idx]):
+                summary = profile.summary_label.format(index=idx+1) + reference.summary(reuse[idx])
+                call_info = {"cached": True, "reused": True}
+            elif summary is not None:
+                call_info = {"cached": True, "journal": True}
+            else:
+                call_info = {}
+                summary = self.summarize_chunk(profile, idx, total_chunks, chunk, call_info=call_info,
+                                               file=filepath.name)
+                if call_info.get("response_tokens"):
+                    self.journal.record_chunk(filepath, idx, chunk_hash, summary)
+            calls.append(call_info)
+            self.progress.emit("chunk_finished", file=filepath.name, chunk=idx+1, total=total_chunks, **call_info)
+            print(f"  → {filepath.name}: completed chunk {idx+1}/{total_chunks}")
+            return summary
+
+        # Second pass: the scheduler pulls chunk tasks lazily, so at most
+        # CHUNKS_IN_FLIGHT chunk texts per file are in memory
+        if chunks is None:
+            chunks = chunker.iter_chunks(opinion_reader.read_paragraphs(filepath), chunk_tokens,
+                                         CHUNK_OVERLAP_TOKENS)
+        chunk_refs = []
+
+        def chunk_tasks():
+            for idx, chunk in enumerate(chunks):
+                ref = ChunkRef.of(chunk)
+                chunk_refs.append(ref)
+                yield partial(summarize, idx, chunk, ref.hash)
+
+        chunk_summaries = yield chunk_tasks()
+        del chunks
+        self.journal.set_state(filepath, brief_journal.SUMMARIZED)
+        labels = [profile.summary_label.format(index=idx+1) for idx in range(len(chunk_summaries))]
+        manifest = BriefManifest.build(source_hash, profile.name, self.model, self.chunking_key(profile),
+                                       chunk_refs,
+                                       [summary[len(label):] if summary.startswith(label) else summary
+                                        for label, summary in zip(labels, chunk_summaries)])
+
+        summary_path = filepath.with_name(f"{filepath.stem}_chunksummary.txt")
+        summary_path.write_text("\n\n".join(chunk_summaries), encoding='utf-8')
+        print(f"  💾 Wrote chunk summaries to {summary_path.name}")
+
+        if TREE_REDUCE and len(chunk_summaries) > 1:
+            def merge(level, group):
+                self.progress.emit("merge_started", file=filepath.name, level=level, inputs=len(group))
+                call_info = {}
+                merged = self.merge_summaries(profile, level, group, call_info=call_info, file=filepath.name)
+                calls.append(call_info)
+                self.progress.emit("merge_finished", file=filepath.name, level=level, inputs=len(group), **call_info)
+                print(f"  → {filepath.name}: merged {len(group)} summaries at level {level}")
+                return merged
+
+            chunk_summaries = yield from tree_reduce.reduce_summaries(
+                chunk_summaries, final_tokens, merge_tokens, merge)
+
+        print(f"  → Generating final brief for {filepath.name}...")
+        joined_summaries = "\n\n".join(chunk_summaries)
+        partial_path = brief_path.with_name(brief_path.name + ".partial")
+
+        def final_brief():
+            self.progress.emit("brief_started", file=filepath.name, partial=str(partial_path),
+                               summaries=len(chunk_summaries))
+            return self.generate_brief(
+                profile, joined_summaries, partial_path,
+                on_progress=lambda tokens: self.progress.emit("brief_tokens", file=filepath.name, tokens=tokens),
+                file=filepath.name)
+
+        raw_brief, call_info = (yield [final_brief])[0]
+        calls.append(call_info)
+        brief = profile.postprocess(raw_brief)
+
+        # Replace the raw streamed text with the finished brief, then publish it atomically
+        publish_brief(partial_path, brief_path, brief)
+        # Written after the brief: a crash in between only costs a cheap incremental re-run
+        manifest.save(brief_path)
+        self.journal.set_state(filepath, brief_journal.BRIEFED)
+        self.record_fingerprint(filepath, case_number, profile, fingerprint, brief_path, archive_path)
+        self.progress.emit("brief_finished", file=filepath.name, brief=str(brief_path), **call_info)
+        print(f"  ✅ Wrote final brief to {brief_path}")
+
+        try:
+            summary_path.unlink()
+            print(f"  🧹 Deleted {summary_path.name}")
+        except Exception as e:
+            print(f"  ⚠️ Could not delete {summary_path.name}: {e}")
+
+        self.archive_original(filepath, archive_path, replace=amended)
+
+        elapsed_s = round(time.monotonic() - file_started, 3)
+        self.progress.emit("file_finished", file=filepath.name, case_number=case_number, elapsed_s=elapsed_s)
+        metrics = {
+            "chunks": total_chunks,
+            "reused_chunks": len(reuse),
+            "llm_calls": sum(1 for info in calls if not info.get("cached")),
+            "prompt_tokens": sum(info.get("prompt_tokens", 0) for info in calls if not info.get("cached")),
+            "response_tokens": sum(info.get("response_tokens", 0) for info in calls if not info.get("cached")),
+            "elapsed_s": elapsed_s
+        }
+        return BriefIndex.record(brief_path, case_number, case_name, status, profile.name, filepath.name, metrics)
+
+    def reuse_brief(self, filepath: Path, profile: BriefProfile, source_hash: str,
+                    fingerprint: Optional[Fingerprint], duplicate_of: DuplicateOf) -> dict:
+        """Publish an exact duplicate's brief under this opinion's name without calling the model"""
+        case_number, case_name, status, brief_path, archive_path = get_output_paths(filepath)
+        started = time.monotonic()
+        brief = duplicate_of.brief_path.read_text(encoding='utf-8')
+        self.journal.start_file(filepath, case_number, profile.name, source_hash,
+                                0, brief_path, archive_path)
+
+        publish_brief(brief_path.with_name(brief_path.name + ".partial"), brief_path, brief)
+        manifest = BriefManifest.load(duplicate_of.brief_path)
+        if manifest is not None:
+            manifest.source_hash = source_hash
+            manifest.save(brief_path)
+        self.journal.set_state(filepath, brief_journal.BRIEFED)
+        self.record_fingerprint(filepath, case_number, profile, fingerprint, brief_path, archive_path)
+        self.progress.emit("file_deduplicated", file=filepath.name, duplicate_of=duplicate_of.case_number,
+                           source_brief=str(duplicate_of.brief_path), brief=str(brief_path))
+        print(f"  ♻️ Same opinion as {duplicate_of.case_number}; reused {duplicate_of.brief_path.name}")
+
+        self.archive_original(filepath, archive_path)
+        return BriefIndex.record(brief_path, case_number, case_name, status, profile.name, filepath.name,
+                                 {"chunks": 0, "reused_chunks": 0, "llm_calls": 0,
+                                  "elapsed_s": round(time.monotonic() - started, 3)})
+
+    def record_fingerprint(self, filepath: Path, case_number: str, profile: BriefProfile,
+                           fingerprint: Optional[Fingerprint], brief_path: Path, archive_path: Path):
+        if fingerprint is not None:
+            self.journal.record_fingerprint(filepath, case_number, profile.name, fingerprint.exact_hash,
+                                            fingerprint.signature_bytes(), brief_path, archive_path)
+
+    @staticmethod
+    def job_priority(filepath: Path) -> float:
+        """Scheduling cost of an opinion: its status penalty plus its size in estimated tokens"""
+        _, _, status = parse_case_filename(filepath.name)
+        return STATUS_PRIORITY_TOKENS.get(status, 0) + filepath.stat().st_size / chunker.CHARS_PER_TOKEN
+
+    def export_summaries(self, records: List[dict]):
+        """Rewrite the summary CSV of every Case_Briefs folder this run wrote to
+
+        Each CSV lists every indexed brief in its folder, earlier runs' included.
+        """
+        outputs = {(Path(record['brief_path']).parent, record['profile']) for record in records}
+        for folder, profile in sorted(outputs, key=str):
+            csv_path = folder / PROFILES[profile].csv_name
+            count = export_csv(self.index, csv_path, folder=folder)
+            print(f"📊 Saved {count} briefs to {csv_path}")
+
+    def deduplicate(self, jobs):
+        """Fingerprint each opinion as it arrives and match it against earlier briefs and earlier files in the batch
+
+        Returns two phases of (file, profile, fingerprint, duplicate_of) jobs: a
+        generator that yields each file once it is fingerprinted, so extracted
+        PDFs reach the scheduler while later ones are still being extracted,
+        and a list of duplicates of files in the first phase, which must finish
+        first. The list is complete once the generator is exhausted.
+        """
+        second = []
+        return self._fingerprint_jobs(jobs, second), second
+
+    def _fingerprint_jobs(self, jobs, second: list):
+        indexes = {}
+        originals = {}
+        count = 0
+        duplicates = 0
+        started = time.monotonic()
+
+        for file, profile in jobs:
+            count += 1
+            case_number, _, _, brief_path, archive_path = get_output_paths(file)
+            if brief_path.exists():
+                yield file, profile, None, None
+                continue
+
+            index = indexes.get(profile.name)
+            if index is None:
+                index = indexes[profile.name] = DuplicateIndex(NEAR_DUPLICATE_THRESHOLD)
+                for row in self.journal.fingerprints(profile.name):
+                    if Path(row['brief_path']).exists():
+                        key = (row['path'], False)
+                        index.add(key, Fingerprint.from_stored(row['exact_hash'], row['signature']))
+                        originals[key] = DuplicateOf(row['case_number'], row['brief_path'])
+
+            fingerprint = Fingerprint.from_paragraphs(opinion_reader.read_paragraphs(file))
+            match = index.match(fingerprint)
+            if match is None:
+                key = (str(file.resolve()), True)
+                index.add(key, fingerprint)
+                originals[key] = DuplicateOf(case_number, brief_path)
+                yield file, profile, fingerprint, None
+                continue
+
+            key, similarity, exact = match
+            duplicate_of = originals[key].matched(similarity, exact)
+            duplicates += 1
+            print(f"🔁 {file.name} matches {duplicate_of.case_number} (similarity {similarity:.2f})")
+            self.progress.emit("duplicate_found", file=file.name, duplicate_of=duplicate_of.case_number,
+                               similarity=round(similarity, 3))
+            in_batch = key[1]
+            if in_batch:
+                second.append((file, profile, fingerprint, duplicate_of))
+            else:
+                yield file, profile, fingerprint, duplicate_of
+
+        print(f"🔎 Fingerprinted {count} opinions in {time.monotonic() - started:.1f}s; {duplicates} duplicates")
+
+    def archive_original(self, filepath: Path, archive_path: Path, replace: bool = False):
+        """Move the original opinion into the archive folder exactly once
+
+        With replace, an amended opinion supersedes the archived earlier version.
+        """
+        self.journal.set_state(filepath, brief_journal.ARCHIVING)
+        try:
+            if archive_path.exists():
+                if filepath.exists() and filepath.read_bytes() == archive_path.read_bytes():
+                    # A copy-then-delete move was interrupted after the copy
+                    filepath.unlink()
+                    print(f"  📦 Finished moving original file to {archive_path}")
+                elif filepath.exists() and replace:
+                    os.replace(filepath, archive_path)
+                    print(f"  📦 Replaced archived original {archive_path} with the amended opinion")
+                elif filepath.exists():
+                    print(f"  ⚠️ Not archiving {filepath.name}: a different {archive_path} already exists")
+                    return
+            else:
+                shutil.move(str(filepath), str(archive_path))
+                print(f"  📦 Moved original file to {archive_path}")
+        except Exception as e:
+            print(f"  ⚠️ Could not move original file: {e}")
+            return
+        self.journal.finish_file(filepath)
+
+    def extract_pdfs(self, extraction):
+        """(text file, profile) jobs for (pdf, txt, profile) entries, each yielded once its text is written
+
+        The process pool keeps extracting later PDFs while the caller
+        fingerprints the opinions already finished.
+        """
+        profiles = {txt_path: profile for _, txt_path, profile in extraction}
+        extractor = PdfExtractor(self.page_cache_dir, PAGE_CACHE_MAX_MB, workers=EXTRACT_WORKERS)
+        try:
+            for pdf_path, txt_path in extractor.extract((pdf_path, txt_path) for pdf_path, txt_path, _ in extraction):
+                self.progress.emit("pdf_extracted", file=txt_path.name, pdf=str(pdf_path))
+                yield txt_path, profiles[txt_path]
+        except PdfExtractError as e:
+            print(f"⚠️ Skipping PDF extraction: {e}")
+
+    def run(self, directories: Dict[Path, str], pdf_directories: Optional[Dict[Path, Path]] = None) -> List[dict]:
+        """Brief every .txt opinion in each directory with that directory's profile
+
+        pdf_directories maps PDF directories to the text directory their
+        opinions are extracted into first; the text directory's profile in
+        directories applies, journal_article if it has none.
+        """
+        jobs = []
+        for directory, profile_name in directories.items():
+            profile = PROFILES[profile_name]
+            for file in sorted(Path(directory).glob('*.txt')):
+                if file.stem.endswith('_chunksummary'):
+                    continue  # left behind by an interrupted run
+                jobs.append((file, profile))
+
+        text_profiles = {Path(directory).resolve(): PROFILES[profile_name]
+                         for directory, profile_name in directories.items()}
+        extraction = []
+        for pdf_dir, text_dir in (pdf_directories or {}).items():
+            profile = text_profiles.get(Path(text_dir).resolve(), PROFILES["journal_article"])
+            extraction.extend((pdf_path, txt_path, profile) for pdf_path, txt_path in extraction_jobs(pdf_dir, text_dir))
+
+        if not jobs and not extraction:
+            print("❌ No .txt or .pdf files found.")
+            return []
+
+        total_files = len(jobs) + len(extraction)
+        self.progress.emit("run_started", files=total_files, model=self.model)
+        self.warm_prompt_prefixes({profile for _, profile in jobs} | {profile for _, _, profile in extraction})
+        if extraction:
+            jobs = itertools.chain(jobs, self.extract_pdfs(extraction))
+
+        if DEDUPLICATE:
+            first, second = self.deduplicate(jobs)
+        else:
+            first, second = ((file, profile, None, None) for file, profile in jobs), []
+        # Streamed while PDFs are extracted, so briefing overlaps extraction; otherwise
+        # every file is known up front and the first phase is handed over whole
+        phases = [first if extraction else list(first), second]
+
+        records = []
+        scheduler = BriefScheduler(max_workers=MAX_WORKERS, max_files_in_flight=FILES_IN_FLIGHT,
+                                   max_tasks_per_file=CHUNKS_IN_FLIGHT)
+        try:
+            for phase in phases:
+                if isinstance(phase, list) and not phase:
+                    continue
+                plans = (((file, profile), self.process_file(file, profile, fingerprint, duplicate_of))
+                         for file, profile, fingerprint, duplicate_of in phase)
+                if PRIORITIZE:
+                    if isinstance(phase, list):
+                        plans = list(plans)  # the whole phase is known, so every file arrives at once
+                    results = scheduler.run(plans, priority=lambda key: self.job_priority(key[0]),
+                                            aging=AGING_TOKENS_PER_SECOND)
+                else:
+                    results = scheduler.run(plans)
+                for _, result in results:
+                    if result:
+                        records.append(result)
+        except CircuitOpenError as e:
+            # Everything finished so far is on disk or in the journal; a rerun resumes from there
+            print(f"\n⛔ Stopping the run: {e}")
+            self.progress.emit("run_aborted", error=str(e))
+
+        # One transaction per run; earlier runs' rows stay in the index
+        self.index.append(records)
+        print(f"\n📇 Indexed {len(records)} briefs in {self.index.path}")
+        if EXPORT_SUMMARY_CSV:
+            self.export_summaries(records)
+
+        if self.concurrency.history:
+            print(f"⚙️ Concurrency ended at {self.concurrency.level}; best throughput at {self.concurrency.best_level()}")
+
+        if self.metrics.records or self.metrics.cache_hits:
+            print(f"\n⏱️ LLM calls:\n{self.metrics.summary()}")
+            if self.metrics_file:
+                self.metrics.write_prometheus(self.metrics_file)
+                print(f"  📈 Wrote metrics to {self.metrics_file}")
+
+        cache_stats = self.cache.stats()
+        print(f"\n🗄️ Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['bytes'] / (1024 * 1024):.1f} MB")
+        self.progress.emit("run_finished", files=total_files, cache=cache_stats,
+                           concurrency=self.concurrency.level)
+
+        return records
+
+
+def run_directory(directory, profile_name: str):
+    """Entry point for the per-directory brief_cases.py wrappers"""
+    return BriefEngine().run({Path(directory): profile_name})
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate case briefs for every opinion in one or more directories")
+    parser.add_argument("--dir", action="append", metavar="PATH=PROFILE",
+                        help=f"Directory and profile ({', '.join(PROFILES)}); may be repeated")
+    parser.add_argument("--pdf-dir", action="append", metavar="PDFDIR=TEXTDIR",
+                        help="Extract the PDFs in PDFDIR into TEXTDIR before briefing; may be repeated")
+    args = parser.parse_args(argv)
+
+    pdf_directories = {}
+    for entry in args.pdf_dir or []:
+        pdf_dir, _, text_dir = entry.partition("=")
+        if not text_dir:
+            parser.error(f"expected PDFDIR=TEXTDIR, got {entry!r}")
+        pdf_directories[Path(pdf_dir)] = Path(text_dir)
+
+    directories = {}
+    for entry in args.dir or []:
+        path, _, profile_name = entry.partition("=")
+        profile_name = profile_name or "journal_article"
+        if profile_name not in PROFILES:
+            parser.error(f"unknown profile {profile_name!r}")
+        directories[Path(path)] = profile_name
+    if not directories and not pdf_directories:
+        directories = {PDFS_DIR / path: profile_name for path, profile_name in DEFAULT_DIRECTORIES.items()}
+        pdf_directories = {PDFS_DIR / pdf_dir: PDFS_DIR / text_dir for pdf_dir, text_dir in PDF_DIRECTORIES.items()}
+
+    BriefEngine().run(directories, pdf_directories)
+
+
+if __name__ == "__main__":
+    main()
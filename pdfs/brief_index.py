@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Brief Index
+Append-only SQLite index of every brief ever written, with case number,
+status, month, the brief's file and size and per-file timing, so the
+website updaters can look a case up without scanning folders and no run
+overwrites the history of earlier ones
+
+Usage:
+    python brief_index.py --case B333052
+    python brief_index.py --scan published_text unpublished_text
+    python brief_index.py --export-csv briefs.csv --status Published
+"""
+
+import argparse
+import csv
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+DEFAULT_INDEX_FILE = Path(__file__).resolve().parent / "brief_index.sqlite3"
+
+# Columns in table order; brief text stays in the brief files, one brief per file
+COLUMNS = ('brief_path', 'case_number', 'case_name', 'status', 'month', 'profile', 'filename',
+           'brief_bytes', 'chunks', 'reused_chunks', 'llm_calls',
+           'prompt_tokens', 'response_tokens', 'elapsed_s', 'indexed_at')
+# Only known after a run actually briefed the file; a skipped file keeps what it had
+_METRIC_COLUMNS = ('chunks', 'reused_chunks', 'llm_calls', 'prompt_tokens', 'response_tokens', 'elapsed_s')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS briefs (
+    brief_path TEXT PRIMARY KEY,
+    case_number TEXT NOT NULL,
+    case_name TEXT,
+    status TEXT,
+    month TEXT,
+    profile TEXT,
+    filename TEXT,
+    brief_bytes INTEGER,
+    chunks INTEGER,
+    reused_chunks INTEGER,
+    llm_calls INTEGER,
+    prompt_tokens INTEGER,
+    response_tokens INTEGER,
+    elapsed_s REAL,
+    indexed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS briefs_case_number ON briefs (case_number COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS briefs_status_month ON briefs (status, month);
+"""
+
+_UPSERT = (
+    f"INSERT INTO briefs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)}) "
+    "ON CONFLICT(brief_path) DO UPDATE SET "
+    + ", ".join(f"{c} = COALESCE(excluded.{c}, briefs.{c})" if c in _METRIC_COLUMNS else f"{c} = excluded.{c}"
+                for c in COLUMNS[1:]))
+
+_INSERT_NEW = f"INSERT OR IGNORE INTO briefs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+
+_BRIEF_FOLDER = re.compile(r'^(\d{4}-\d{2})_Case_Briefs_\((\w+)\)$')
+_BRIEF_FILE = re.compile(r'^(?P<case>[^_]+)_\(Case_Brief\)_(?P<name>.*)_\((?P<status>\w+)\)\.txt$')
+
+
+def brief_month(brief_path) -> Optional[str]:
+    """YYYY-MM of the Case_Briefs folder a brief was written to"""
+    match = _BRIEF_FOLDER.match(Path(brief_path).parent.name)
+    return match.group(1) if match else None
+
+
+class BriefIndex:
+    """SQLite-backed lookup of briefs by case number, status and month"""
+
+    def __init__(self, path=DEFAULT_INDEX_FILE, readonly: bool = False):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        if readonly:
+            self._conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True,
+                                         check_same_thread=False)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def open_existing(cls, path=DEFAULT_INDEX_FILE) -> Optional["BriefIndex"]:
+        """Read-only index for the website updaters, or None if no brief run has created one"""
+        if not Path(path).exists():
+            return None
+        try:
+            return cls(path, readonly=True)
+        except sqlite3.Error:
+            return None
+
+    @staticmethod
+    def record(brief_path, case_number: str, case_name: str, status: str, profile: str,
+               filename: str, metrics: Optional[dict] = None) -> dict:
+        """Index row for a brief file as it is on disk now"""
+        brief_path = Path(brief_path).resolve()
+        metrics = metrics or {}
+        row = {
+            'brief_path': str(brief_path),
+            'case_number': case_number,
+            'case_name': case_name,
+            'status': status,
+            'month': brief_month(brief_path),
+            'profile': profile,
+            'filename': filename,
+            'brief_bytes': brief_path.stat().st_size if brief_path.exists() else None,
+            'indexed_at': datetime.now().isoformat(timespec='seconds')
+        }
+        row.update({column: metrics.get(column) for column in _METRIC_COLUMNS})
+        return row
+
+    def append(self, records: Iterable[dict], replace: bool = True) -> int:
+        """Insert or refresh many rows in one transaction
+
+        With replace=False, rows for briefs already indexed are left alone.
+        """
+        rows = [tuple(record.get(column) for column in COLUMNS) for record in records]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_UPSERT if replace else _INSERT_NEW, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _select(self, where: str = "", params=()) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM briefs {where}", params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def lookup(self, case_number: str) -> List[dict]:
+        """Every brief for a case number, newest first"""
+        return self._select("WHERE case_number = ? COLLATE NOCASE ORDER BY month DESC, indexed_at DESC",
+                            (case_number,))
+
+    def latest(self, case_number: str) -> Optional[dict]:
+        rows = self.lookup(case_number)
+        return rows[0] if rows else None
+
+    def records(self, status: Optional[str] = None, month: Optional[str] = None,
+                folder=None) -> List[dict]:
+        """Rows by status, month and/or the Case_Briefs folder the briefs are in"""
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if month:
+            clauses.append("month = ?")
+            params.append(month)
+        if folder is not None:
+            prefix = str(Path(folder).resolve() / "_")[:-1]  # the folder plus a path separator
+            clauses.append("substr(brief_path, 1, ?) = ?")
+            params.extend((len(prefix), prefix))
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        return self._select(where + " ORDER BY month, case_number", params)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def read_brief(record: dict) -> Optional[str]:
+    """Brief text for an index row, read from its file; None if the file is gone"""
+    try:
+        with open(record['brief_path'], 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return data.decode('utf-8', errors='ignore')
+
+
+def scan_briefs(directory) -> List[dict]:
+    """Index rows for briefs already on disk under directory (for briefs written before the index)"""
+    records = []
+    for brief_path in sorted(Path(directory).glob('*_Case_Briefs_*/*_(Case_Brief)_*.txt')):
+        match = _BRIEF_FILE.match(brief_path.name)
+        if not match or not _BRIEF_FOLDER.match(brief_path.parent.name):
+            continue
+        case_name = match.group('name').replace('_', ' ').strip()
+        records.append(BriefIndex.record(brief_path, match.group('case'), case_name,
+                                         match.group('status').capitalize(), None, None))
+    return records
+
+
+def export_csv(index: BriefIndex, csv_path, status: Optional[str] = None, month: Optional[str] = None,
+               folder=None) -> int:
+    """Write the old 0000-Brief_Summaries.csv layout (filename, case_name, brief) from the index"""
+    records = index.records(status, month, folder)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['filename', 'case_name', 'brief'])
+        writer.writeheader()
+        for record in records:
+            writer.writerow({
+                'filename': record['filename'] or Path(record['brief_path']).name,
+                'case_name': record['case_name'],
+                'brief': read_brief(record) or ''
+            })
+    return len(records)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Query or backfill the brief index")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_FILE)
+    parser.add_argument("--case", action="append", default=[], help="case number to look up; may be repeated")
+    parser.add_argument("--scan", nargs="+", type=Path, metavar="DIR", help="index briefs already under DIR")
+    parser.add_argument("--export-csv", type=Path, metavar="PATH", help="write filename/case_name/brief rows")
+    parser.add_argument("--status", choices=["Published", "Unpublished"])
+    parser.add_argument("--month", metavar="YYYY-MM")
+    args = parser.parse_args(argv)
+
+    index = BriefIndex(args.index)
+    for directory in args.scan or []:
+        count = index.append(scan_briefs(directory), replace=False)
+        print(f"📇 Found {count} existing briefs under {directory}")
+    for case_number in args.case:
+        rows = index.lookup(case_number)
+        if not rows:
+            print(f"❌ {case_number}: not in the brief index")
+        for row in rows:
+            print(f"📄 {row['case_number']} {row['status']} {row['month']}: {row['brief_path']} "
+                  f"({row['brief_bytes']} bytes, {row['elapsed_s'] or '-'} s)")
+    if args.export_csv:
+        count = export_csv(index, args.export_csv, args.status, args.month)
+        print(f"📊 Saved {count} briefs to {args.export_csv}")
+    index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
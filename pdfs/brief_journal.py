@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Write-Ahead Job Journal for Brief Batches
+Records per-file and per-chunk state in SQLite so a batch that dies part
+way through resumes where it stopped: finished chunk summaries are reused
+and an interrupted archive move is completed exactly once
+"""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_JOURNAL_FILE = Path(__file__).resolve().parent / "brief_journal.sqlite3"
+
+# File states, in order
+PENDING = "pending"
+SUMMARIZED = "summarized"
+BRIEFED = "briefed"
+ARCHIVING = "archiving"
+DONE = "done"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    case_number TEXT,
+    profile TEXT,
+    source_hash TEXT,
+    state TEXT NOT NULL,
+    total_chunks INTEGER,
+    brief_path TEXT,
+    archive_path TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    path TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    chunk_hash TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (path, idx)
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    path TEXT PRIMARY KEY,
+    case_number TEXT,
+    profile TEXT NOT NULL,
+    exact_hash TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    brief_path TEXT,
+    archive_path TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS fingerprints_exact ON fingerprints (exact_hash);
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class BriefJournal:
+    """SQLite-backed record of what each opinion in a batch has completed"""
+
+    def __init__(self, path=DEFAULT_JOURNAL_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _key(filepath) -> str:
+        return str(Path(filepath).resolve())
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat(timespec='seconds')
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def get_file(self, filepath) -> Optional[dict]:
+        rows = self._execute(
+            "SELECT case_number, profile, source_hash, state, total_chunks, brief_path, archive_path "
+            "FROM files WHERE path = ?", (self._key(filepath),))
+        if not rows:
+            return None
+        keys = ('case_number', 'profile', 'source_hash', 'state', 'total_chunks', 'brief_path', 'archive_path')
+        return dict(zip(keys, rows[0]))
+
+    def start_file(self, filepath, case_number: str, profile: str, source_hash: str,
+                   total_chunks: int, brief_path, archive_path):
+        """Register a file; chunk records survive only if the source text is unchanged"""
+        key = self._key(filepath)
+        existing = self.get_file(filepath)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if existing and existing['source_hash'] != source_hash:
+                    self._conn.execute("DELETE FROM chunks WHERE path = ?", (key,))
+                self._conn.execute(
+                    "INSERT INTO files (path, case_number, profile, source_hash, state, total_chunks, "
+                    "brief_path, archive_path, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET case_number = excluded.case_number, "
+                    "profile = excluded.profile, source_hash = excluded.source_hash, "
+                    "state = excluded.state, total_chunks = excluded.total_chunks, "
+                    "brief_path = excluded.brief_path, archive_path = excluded.archive_path, "
+                    "updated_at = excluded.updated_at",
+                    (key, case_number, profile, source_hash, PENDING, total_chunks,
+                     str(brief_path), str(archive_path), self._now()))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def set_state(self, filepath, state: str):
+        self._execute("UPDATE files SET state = ?, updated_at = ? WHERE path = ?",
+                      (state, self._now(), self._key(filepath)))
+
+    def chunk_summary(self, filepath, index: int, chunk_hash: str) -> Optional[str]:
+        """Summary recorded for this chunk, if its text has not changed"""
+        rows = self._execute("SELECT summary FROM chunks WHERE path = ? AND idx = ? AND chunk_hash = ?",
+                             (self._key(filepath), index, chunk_hash))
+        return rows[0][0] if rows else None
+
+    def record_chunk(self, filepath, index: int, chunk_hash: str, summary: str):
+        self._execute(
+            "INSERT OR REPLACE INTO chunks (path, idx, chunk_hash, summary, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (self._key(filepath), index, chunk_hash, summary, self._now()))
+
+    def chunk_count(self, filepath) -> int:
+        """Number of chunk summaries recorded for a file that has not finished"""
+        return self._execute("SELECT COUNT(*) FROM chunks WHERE path = ?", (self._key(filepath),))[0][0]
+
+    def finish_file(self, filepath):
+        """Mark a file done and drop its chunk records"""
+        key = self._key(filepath)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM chunks WHERE path = ?", (key,))
+            self._conn.execute("UPDATE files SET state = ?, updated_at = ? WHERE path = ?",
+                               (DONE, self._now(), key))
+            self._conn.execute("COMMIT")
+
+    def record_fingerprint(self, filepath, case_number: str, profile: str, exact_hash: str,
+                           signature: bytes, brief_path, archive_path):
+        """Remember a briefed opinion's fingerprint so later duplicates can reuse its work"""
+        self._execute(
+            "INSERT OR REPLACE INTO fingerprints (path, case_number, profile, exact_hash, signature, "
+            "brief_path, archive_path, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._key(filepath), case_number, profile, exact_hash, signature,
+             str(brief_path), str(archive_path), self._now()))
+
+    def fingerprints(self, profile: str) -> List[dict]:
+        rows = self._execute(
+            "SELECT path, case_number, exact_hash, signature, brief_path, archive_path "
+            "FROM fingerprints WHERE profile = ?", (profile,))
+        keys = ('path', 'case_number', 'exact_hash', 'signature', 'brief_path', 'archive_path')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
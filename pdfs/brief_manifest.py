@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Per-Brief Chunk Manifests
+Stores the content hash and summary of every chunk next to each brief so an
+amended opinion (or a near-duplicate of it) only has its changed chunks
+re-summarized before the final reduce is run again
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from chunker import ChunkRef
+
+MANIFEST_SUFFIX = ".chunks.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_path(brief_path) -> Path:
+    brief_path = Path(brief_path)
+    return brief_path.with_name(brief_path.name + MANIFEST_SUFFIX)
+
+
+class BriefManifest:
+    """Source hash, model, chunking key and per-chunk hashes/summaries behind one brief
+
+    chunking is a hash of the chunk prompt and chunking parameters; it is
+    None for manifests written before it was recorded, which match no key.
+    """
+
+    def __init__(self, source_hash: str, profile: str, model: str, chunks: List[dict],
+                 chunking: Optional[str] = None):
+        self.source_hash = source_hash
+        self.profile = profile
+        self.model = model
+        self.chunks = chunks
+        self.chunking = chunking
+
+    @classmethod
+    def build(cls, source_hash: str, profile: str, model: str, chunking: str, chunk_refs: List[ChunkRef],
+              summaries: List[str]) -> "BriefManifest":
+        chunks = []
+        for ref, summary in zip(chunk_refs, summaries):
+            chunks.append({"hash": ref.hash, "length": ref.length, "prefix": ref.prefix, "summary": summary})
+        return cls(source_hash, profile, model, chunks, chunking)
+
+    @classmethod
+    def load(cls, brief_path) -> Optional["BriefManifest"]:
+        """Manifest written alongside brief_path, or None if it is missing or unreadable"""
+        try:
+            with open(manifest_path(brief_path), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return cls(data["source_hash"], data["profile"], data["model"], data["chunks"], data.get("chunking"))
+
+    def save(self, brief_path):
+        path = manifest_path(brief_path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        data = {
+            "version": MANIFEST_VERSION,
+            "source_hash": self.source_hash,
+            "profile": self.profile,
+            "model": self.model,
+            "chunking": self.chunking,
+            "chunks": self.chunks
+        }
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def references(self) -> List[ChunkRef]:
+        return [ChunkRef(c["hash"], c["length"], c["prefix"]) for c in self.chunks]
+
+    def summary(self, index: int) -> str:
+        return self.chunks[index]["summary"]
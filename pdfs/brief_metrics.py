@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Per-Call LLM Metrics for the Brief Pipeline
+Records wall time, queue wait, prompt/response sizes, outcome, retries and
+(when the server reports them) prefill and model-load time of every Ollama
+call, writes them in Prometheus text format and prints a per-run summary of
+which call kinds and opinions dominated the runtime
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_METRICS_FILE = Path(__file__).resolve().parent.parent / "logs" / "brief_metrics.prom"
+
+# Call outcomes
+OK = "ok"
+EMPTY = "empty"  # the model answered with nothing; used to become an empty summary silently
+ERROR = "error"
+
+LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+class CallRecord:
+    __slots__ = ('kind', 'file', 'backend', 'wall_s', 'queue_s', 'prompt_chars', 'response_chars',
+                 'prompt_tokens', 'response_tokens', 'outcome', 'error', 'retries',
+                 'prompt_eval_tokens', 'prefill_s', 'load_s')
+
+    def __init__(self, kind: str, file: Optional[str], backend: str, wall_s: float, queue_s: float,
+                 prompt_chars: int, response_chars: int, prompt_tokens: int, response_tokens: int,
+                 outcome: str, error: Optional[str] = None, retries: int = 0,
+                 prompt_eval_tokens: Optional[int] = None, prefill_s: Optional[float] = None,
+                 load_s: Optional[float] = None):
+        self.kind = kind
+        self.file = file
+        self.backend = backend
+        self.wall_s = wall_s
+        self.queue_s = queue_s
+        self.prompt_chars = prompt_chars
+        self.response_chars = response_chars
+        self.prompt_tokens = prompt_tokens
+        self.response_tokens = response_tokens
+        self.outcome = outcome
+        self.error = error
+        self.retries = retries
+        # From Ollama's final message; prompt tokens found in a slot's cache are not evaluated again
+        self.prompt_eval_tokens = prompt_eval_tokens
+        self.prefill_s = prefill_s
+        self.load_s = load_s
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class CallMetrics:
+    """Thread-safe collector of CallRecords for one run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records: List[CallRecord] = []
+        self.cache_hits: Dict[str, int] = {}
+
+    def record(self, record: CallRecord):
+        with self._lock:
+            self.records.append(record)
+
+    def cache_hit(self, kind: str):
+        with self._lock:
+            self.cache_hits[kind] = self.cache_hits.get(kind, 0) + 1
+
+    def _snapshot(self):
+        with self._lock:
+            return list(self.records), dict(self.cache_hits)
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        records, cache_hits = self._snapshot()
+        kinds = sorted({r.kind for r in records} | set(cache_hits))
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("brief_llm_calls_total", "counter", "LLM calls by call kind and outcome")
+        counts = {}
+        for r in records:
+            counts[(r.kind, r.outcome)] = counts.get((r.kind, r.outcome), 0) + 1
+        for (kind, outcome), count in sorted(counts.items()):
+            lines.append(f"brief_llm_calls_total{_labels(kind=kind, outcome=outcome)} {count}")
+
+        family("brief_llm_cache_hits_total", "counter", "Prompts answered from the chunk cache")
+        for kind in sorted(cache_hits):
+            lines.append(f"brief_llm_cache_hits_total{_labels(kind=kind)} {cache_hits[kind]}")
+
+        family("brief_llm_errors_total", "counter", "Failed LLM calls by error type")
+        errors = {}
+        for r in records:
+            if r.error:
+                errors[(r.kind, r.error)] = errors.get((r.kind, r.error), 0) + 1
+        for (kind, error), count in sorted(errors.items()):
+            lines.append(f"brief_llm_errors_total{_labels(kind=kind, error=error)} {count}")
+
+        sums = (
+            ("brief_llm_retries_total", "Retried attempts and reconnects of LLM calls", 'retries'),
+            ("brief_llm_queue_seconds_total", "Seconds calls waited for a concurrency slot", 'queue_s'),
+            ("brief_llm_prompt_chars_total", "Prompt characters sent", 'prompt_chars'),
+            ("brief_llm_response_chars_total", "Response characters received", 'response_chars'),
+            ("brief_llm_prompt_tokens_total", "Estimated prompt tokens sent", 'prompt_tokens'),
+            ("brief_llm_response_tokens_total", "Estimated response tokens received", 'response_tokens'),
+            ("brief_llm_prompt_eval_tokens_total", "Prompt tokens the server had to evaluate", 'prompt_eval_tokens'),
+            ("brief_llm_prefill_seconds_total", "Server time spent evaluating prompts", 'prefill_s'),
+            ("brief_llm_load_seconds_total", "Server time spent loading the model", 'load_s')
+        )
+        for name, help_text, attribute in sums:
+            family(name, "counter", help_text)
+            for kind in kinds:
+                total = sum(getattr(r, attribute) or 0 for r in records if r.kind == kind)
+                lines.append(f"{name}{_labels(kind=kind)} {round(total, 3)}")
+
+        family("brief_llm_call_seconds", "histogram", "Wall time of LLM calls")
+        for kind in kinds:
+            latencies = [r.wall_s for r in records if r.kind == kind]
+            for bound in LATENCY_BUCKETS:
+                count = sum(1 for latency in latencies if latency <= bound)
+                lines.append(f"brief_llm_call_seconds_bucket{_labels(kind=kind, le=bound)} {count}")
+            lines.append(f"brief_llm_call_seconds_bucket{_labels(kind=kind, le='+Inf')} {len(latencies)}")
+            lines.append(f"brief_llm_call_seconds_sum{_labels(kind=kind)} {round(sum(latencies), 3)}")
+            lines.append(f"brief_llm_call_seconds_count{_labels(kind=kind)} {len(latencies)}")
+
+        family("brief_llm_file_seconds_total", "counter", "LLM wall time spent on each opinion")
+        for file, seconds in self.by_file():
+            lines.append(f"brief_llm_file_seconds_total{_labels(file=file)} {round(seconds, 3)}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=DEFAULT_METRICS_FILE):
+        """Atomically replace path, e.g. for node_exporter's textfile collector"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+    def by_file(self) -> List[tuple]:
+        """(file, LLM seconds) for every opinion, most expensive first"""
+        records, _ = self._snapshot()
+        totals = {}
+        for r in records:
+            if r.file:
+                totals[r.file] = totals.get(r.file, 0.0) + r.wall_s
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def summary(self, top_files: int = 5) -> str:
+        """Plain-text table of calls per kind and the opinions that took longest"""
+        records, cache_hits = self._snapshot()
+        lines = [f"  {'Kind':<8}{'calls':>7}{'cached':>8}{'empty':>7}{'errors':>8}{'retries':>9}"
+                 f"{'total':>10}{'mean':>9}{'p95':>9}{'prefill':>9}{'prompt tok':>12}{'resp tok':>10}"]
+        for kind in sorted({r.kind for r in records} | set(cache_hits)):
+            group = [r for r in records if r.kind == kind]
+            latencies = [r.wall_s for r in group]
+            lines.append(
+                f"  {kind:<8}{len(group):>7}{cache_hits.get(kind, 0):>8}"
+                f"{sum(1 for r in group if r.outcome == EMPTY):>7}{sum(1 for r in group if r.outcome == ERROR):>8}"
+                f"{sum(r.retries for r in group):>9}{sum(latencies):>9.1f}s"
+                f"{(sum(latencies) / len(latencies) if latencies else 0):>8.2f}s{_percentile(latencies, 0.95):>8.2f}s"
+                f"{sum(r.prefill_s or 0 for r in group):>8.1f}s"
+                f"{sum(r.prompt_tokens for r in group):>12}{sum(r.response_tokens for r in group):>10}")
+        slowest = self.by_file()[:top_files]
+        if slowest:
+            lines.append("  Slowest opinions (LLM seconds):")
+            for file, seconds in slowest:
+                lines.append(f"    {seconds:8.1f}s  {file}")
+        return "\n".join(lines)
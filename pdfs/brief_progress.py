@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Structured Progress Events for Brief Generation
+Appends one JSON object per line (chunk started/finished, tokens, latency)
+so the website updaters and other tools can tail a running batch
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+DEFAULT_PROGRESS_FILE = Path(__file__).resolve().parent.parent / "logs" / "brief_progress.jsonl"
+
+
+class ProgressLog:
+    """Thread-safe JSON-lines event writer; a no-op when path is None"""
+
+    def __init__(self, path=DEFAULT_PROGRESS_FILE):
+        self.path = Path(path) if path else None
+        self.run_id = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def emit(self, event: str, **fields):
+        if not self._file:
+            return
+        record = {
+            "ts": datetime.now().isoformat(timespec='milliseconds'),
+            "mono": round(time.monotonic(), 3),
+            "run": self.run_id,
+            "event": event
+        }
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def read_events(path=DEFAULT_PROGRESS_FILE, offset: int = 0) -> Tuple[List[dict], int]:
+    """Read complete events appended after byte offset; returns (events, new_offset)
+
+    Call repeatedly with the returned offset to tail the file. A trailing
+    line that is still being written is left for the next call.
+    """
+    path = Path(path)
+    if not path.exists():
+        return [], offset
+    if os.path.getsize(path) < offset:
+        offset = 0  # file was rotated or truncated
+
+    events = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            try:
+                events.append(json.loads(raw))
+            except ValueError:
+                continue
+    return events, offset
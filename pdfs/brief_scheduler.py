@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Cross-File Scheduler for the Brief Pipeline
+Keeps one shared worker pool busy across opinions, so chunk summaries for
+the next opinion run while the final brief for the current one generates
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Generator, Iterable, Iterator, List, Optional, Tuple, Union
+
+# A plan is a generator that yields lists of zero-argument callables (one
+# stage of parallel LLM work), receives the list of their results back, and
+# finally returns the file's result. A stage may also be an iterator of
+# callables, which is pulled lazily so that at most max_tasks_per_file of
+# its tasks exist at once; its results still come back as one ordered list.
+# If a task raises, the first exception is thrown into the plan at that
+# yield instead, so a plan can catch it and clean up or return early.
+Plan = Generator[Union[List[Callable[[], Any]], Iterator[Callable[[], Any]]], List[Any], Any]
+
+_STOP = (float('inf'),)
+
+
+class _Job:
+    def __init__(self, order: int, key, plan: Plan, score: float = 0):
+        self.order = order
+        self.key = key
+        self.plan = plan
+        self.score = score  # lower runs first; fixed when the file is admitted
+        self.stage = 0
+        self.results = []
+        self.remaining = 0
+        self.lock = threading.Lock()
+        self.source = None  # task iterator of a streaming stage
+        self.exhausted = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class BriefScheduler:
+    """Run many staged file plans on one bounded worker pool
+
+    Tasks are prioritised by stage, deepest first, then by the file's
+    priority score and admission order, so a file's final brief jumps ahead
+    of queued chunk work for other files. At most ``max_files_in_flight``
+    plans are admitted at once to bound memory, and ``run`` yields results
+    in the order files were admitted.
+    """
+
+    def __init__(self, max_workers: int = 4, max_files_in_flight: int = 2, max_tasks_per_file: int = 16):
+        self.max_workers = max(1, max_workers)
+        self.max_files_in_flight = max(1, max_files_in_flight)
+        self.max_tasks_per_file = max(1, max_tasks_per_file)
+        self._queue = queue.PriorityQueue()
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._active = 0
+        self._stopping = False
+
+    def _submit(self, priority, job, index, task):
+        self._queue.put((priority, next(self._seq), job, index, task))
+
+    def _finish(self, job: _Job, result=None, error=None):
+        with self._cond:
+            job.result = result
+            job.error = error
+            job.done = True
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _pull(self, job: _Job, count: int):
+        """Submit up to count more tasks from a streaming stage; call with job.lock held"""
+        while count > 0 and not job.exhausted:
+            try:
+                task = next(job.source)
+            except StopIteration:
+                job.exhausted = True
+                return
+            except Exception as e:
+                job.error = e
+                job.exhausted = True
+                return
+            index = len(job.results)
+            job.results.append(None)
+            job.remaining += 1
+            self._submit((-job.stage, job.score, job.order, index), job, index, task)
+            count -= 1
+
+    def _advance(self, job: _Job, value, error: Optional[BaseException] = None):
+        """Feed results (or a task's exception) into the plan and queue its next stage"""
+        while True:
+            try:
+                stage = job.plan.throw(error) if error is not None else job.plan.send(value)
+            except StopIteration as stop:
+                self._finish(job, result=stop.value)
+                return
+            except Exception as e:
+                self._finish(job, error=e)
+                return
+
+            job.stage += 1
+            with job.lock:
+                if isinstance(stage, (list, tuple)):
+                    job.source = None
+                    job.results = [None] * len(stage)
+                    job.remaining = len(stage)
+                    for index, task in enumerate(stage):
+                        self._submit((-job.stage, job.score, job.order, index), job, index, task)
+                else:
+                    job.source = iter(stage)
+                    job.exhausted = False
+                    job.results = []
+                    job.remaining = 0
+                    self._pull(job, self.max_tasks_per_file)
+                if job.remaining:
+                    return
+                job.source = None
+                error, job.error = job.error, None
+            value = job.results
+
+    def _worker(self):
+        while True:
+            priority, _, job, index, task = self._queue.get()
+            if priority == _STOP:
+                return
+
+            value, error = None, None
+            if not self._stopping and job.error is None:
+                try:
+                    value = task()
+                except Exception as e:
+                    error = e
+
+            with job.lock:
+                if error is not None and job.error is None:
+                    job.error = error
+                job.results[index] = value
+                job.remaining -= 1
+                if job.source is not None and job.error is None and not self._stopping:
+                    self._pull(job, 1)
+                last = job.remaining == 0
+                if last:
+                    job.source = None
+                    error, job.error = job.error, None
+
+            if not last:
+                continue
+            if self._stopping:
+                self._finish(job, error=error)
+            else:
+                self._advance(job, job.results, error)
+
+    def _arrivals(self, plans, priority: Callable[[Any], float], clock: Callable[[], float]):
+        """Waiting list of [priority, arrival time, key, plan] entries and a function that says whether more may come
+
+        A list or tuple of plans arrives all at once. Any other iterable is
+        read by a background thread, so each plan is stamped when it is
+        actually yielded (e.g. once its PDF is extracted) and admission does
+        not wait for the rest.
+        """
+        waiting = []
+        if isinstance(plans, (list, tuple)):
+            arrived = clock()
+            waiting.extend([priority(key), arrived, key, plan] for key, plan in plans)
+            return waiting, lambda: False
+
+        state = {'feeding': True, 'error': None}
+
+        def feed():
+            try:
+                for key, plan in plans:
+                    if self._stopping:
+                        return
+                    entry = [priority(key), clock(), key, plan]
+                    with self._cond:
+                        waiting.append(entry)
+                        self._cond.notify_all()
+            except Exception as e:
+                state['error'] = e
+            finally:
+                with self._cond:
+                    state['feeding'] = False
+                    self._cond.notify_all()
+
+        def feeding() -> bool:
+            """Whether more plans may come; call with self._cond held. Re-raises the input's error once it is over"""
+            if not state['feeding'] and state['error'] is not None and not waiting:
+                raise state['error']
+            return state['feeding']
+
+        threading.Thread(target=feed, daemon=True).start()
+        return waiting, feeding
+
+    def run(self, plans: Iterable[Tuple[Any, Plan]], priority: Optional[Callable[[Any], float]] = None,
+            aging: float = 0.0, clock: Callable[[], float] = time.monotonic) -> Iterator[Tuple[Any, Any]]:
+        """Yield (key, result) for each (key, plan) in admission order
+
+        Without priority, files are admitted in input order. With it, the
+        waiting file with the lowest priority(key) - aging * seconds since it
+        arrived is admitted next, so cheap files go first but a costly one
+        overtakes newer cheap ones once it has waited long enough. Plans
+        given as a list all arrive when the run starts; from any other
+        iterable each arrives when it is yielded. Arrival and admission
+        times are read from clock.
+
+        An exception a file's plan does not handle (its own, or one of its
+        tasks' thrown into it) is re-raised when that file's turn comes.
+        """
+        self._stopping = False
+        if priority is None:
+            # Every file ties, so the oldest arrival is admitted first
+            priority, aging = (lambda key: 0), 0.0
+        # The input is read by _arrivals, never on this thread or under
+        # self._cond, so waiting for the next file (e.g. while its PDF is
+        # extracted) holds up neither the workers nor finished results
+        waiting, feeding = self._arrivals(plans, priority, clock)
+        pending = deque()
+        order = itertools.count()
+
+        workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.max_workers)]
+        for worker in workers:
+            worker.start()
+
+        def admit():
+            """Admit waiting files while there is room; never waits for more to arrive"""
+            while True:
+                with self._cond:
+                    if self._active >= self.max_files_in_flight or not waiting:
+                        return
+                    now = clock()
+                    best = min(range(len(waiting)),
+                               key=lambda i: (waiting[i][0] - aging * (now - waiting[i][1]), i))
+                    score, arrived_at, key, plan = waiting.pop(best)
+                    job = _Job(next(order), key, plan, score - aging * (now - arrived_at))
+                    pending.append(job)
+                    self._active += 1
+                self._advance(job, None)
+
+        try:
+            while True:
+                admit()
+                with self._cond:
+                    while not (pending and pending[0].done):
+                        if waiting and self._active < self.max_files_in_flight:
+                            break  # room for a file that arrived meanwhile
+                        if not pending and not waiting and not feeding():
+                            return
+                        self._cond.wait()
+                    head = pending.popleft() if pending and pending[0].done else None
+                if head is None:
+                    continue
+
+                admit()
+                if head.error is not None:
+                    raise head.error
+                yield head.key, head.result
+        finally:
+            self._stopping = True
+            for _ in workers:
+                self._submit(_STOP, None, None, None)
+            for worker in workers:
+                worker.join()
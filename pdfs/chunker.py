@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Paragraph and Sentence Aware Chunker for Court Opinions
+Packs whole paragraphs (or sentences, when a paragraph is too long) into
+chunks sized by an estimated token count instead of a fixed character count
+"""
+
+import hashlib
+import math
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+CHARS_PER_TOKEN = 4.0
+
+# Abbreviations that end with a period but almost never end a sentence in
+# California opinions and citations
+ABBREVIATIONS = {
+    'app', 'art', 'assn', 'bus', 'cal', 'cf', 'ch', 'civ', 'co', 'code', 'com',
+    'corp', 'ct', 'dept', 'dist', 'dr', 'e.g', 'eds', 'etc', 'evid', 'fam', 'fn',
+    'gov', 'id', 'i.e', 'inc', 'jr', 'ltd', 'mr', 'mrs', 'ms', 'no', 'nos', 'p',
+    'pen', 'pp', 'prob', 'proc', 'rptr', 'sec', 'seq', 'sr', 'st', 'stat', 'subd',
+    'supp', 'supra', 'u.s', 'v', 'vs', 'welf', 'inst'
+}
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'[.!?]["\'”’)\]]*\s+')
+_WORD_BEFORE = re.compile(r'([\w.]+)[.!?]["\'”’)\]]*$')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate for llama-family tokenizers"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def chunk_token_budget(context_window: int, prompt_template: str = "", response_reserve: int = 1024) -> int:
+    """Tokens left for opinion text once the prompt and the response are accounted for"""
+    overhead = estimate_tokens(prompt_template)
+    return max(256, context_window - overhead - response_reserve)
+
+
+def split_paragraphs(text: str) -> List[str]:
+    paragraphs = (p.strip() for p in _PARAGRAPH_SPLIT.split(text))
+    return [p for p in paragraphs if p]
+
+
+def split_sentences(paragraph: str) -> List[str]:
+    """Split on sentence punctuation, skipping citation abbreviations and initials"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(paragraph):
+        word = _WORD_BEFORE.search(paragraph[max(start, match.start() - 20):match.end()].rstrip())
+        if word and paragraph[match.start()] == '.':
+            token = word.group(1).lower()
+            if token in ABBREVIATIONS or len(token) == 1:
+                continue
+        sentence = paragraph[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = paragraph[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _hard_split(text: str, max_tokens: int) -> List[str]:
+    """Last resort for a single sentence over budget: split on whitespace"""
+    limit = int(max_tokens * CHARS_PER_TOKEN)
+    pieces = []
+    while len(text) > limit:
+        cut = text.rfind(' ', 0, limit)
+        if cut <= 0:
+            cut = limit
+        pieces.append(text[:cut].strip())
+        text = text[cut:].strip()
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+def _units(paragraphs: Iterable[str], max_tokens: int):
+    """Yield (unit_text, starts_paragraph) pieces that each fit in max_tokens"""
+    for paragraph in paragraphs:
+        if estimate_tokens(paragraph) <= max_tokens:
+            yield paragraph, True
+            continue
+        first = True
+        for sentence in split_sentences(paragraph):
+            pieces = [sentence] if estimate_tokens(sentence) <= max_tokens else _hard_split(sentence, max_tokens)
+            for piece in pieces:
+                yield piece, first
+                first = False
+
+
+def _join(units) -> str:
+    parts = []
+    for i, (unit, starts_paragraph) in enumerate(units):
+        if i:
+            parts.append("\n\n" if starts_paragraph else " ")
+        parts.append(unit)
+    return "".join(parts)
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """Pack paragraphs/sentences into chunks of at most max_tokens estimated tokens
+
+    With overlap_tokens > 0, each chunk after the first starts with the
+    trailing units of the previous chunk, up to that many tokens.
+    """
+    return list(iter_chunks(split_paragraphs(text), max_tokens, overlap_tokens))
+
+
+def iter_chunks(paragraphs: Iterable[str], max_tokens: int, overlap_tokens: int = 0) -> Iterator[str]:
+    """chunk_text over an iterable of paragraphs, yielding each chunk as soon as it is full"""
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+    current = []
+    current_tokens = 0
+
+    for unit, starts_paragraph in _units(paragraphs, max_tokens):
+        unit_tokens = estimate_tokens(unit) + 1
+        if current and current_tokens + unit_tokens > max_tokens:
+            yield _join(current)
+            carried = []
+            carried_tokens = 0
+            for prev_unit, prev_starts in reversed(current):
+                prev_tokens = estimate_tokens(prev_unit) + 1
+                if carried_tokens + prev_tokens > overlap_tokens:
+                    break
+                carried.insert(0, (prev_unit, prev_starts))
+                carried_tokens += prev_tokens
+            current, current_tokens = carried, carried_tokens
+            if current and current_tokens + unit_tokens > max_tokens:
+                current, current_tokens = [], 0
+        current.append((unit, starts_paragraph))
+        current_tokens += unit_tokens
+
+    if current:
+        yield _join(current)
+
+
+class ChunkRef:
+    """Identity of a chunk without its text: content hash, length and a short prefix to search for"""
+
+    __slots__ = ('hash', 'length', 'prefix')
+    PREFIX_CHARS = 64
+
+    def __init__(self, hash: str, length: int, prefix: str):
+        self.hash = hash
+        self.length = length
+        self.prefix = prefix
+
+    @classmethod
+    def of(cls, chunk: str) -> "ChunkRef":
+        return cls(hashlib.sha256(chunk.encode('utf-8')).hexdigest(), len(chunk), chunk[:cls.PREFIX_CHARS])
+
+    def matches(self, text: str, position: int) -> bool:
+        candidate = text[position:position + self.length]
+        return len(candidate) == self.length and hashlib.sha256(candidate.encode('utf-8')).hexdigest() == self.hash
+
+
+def align_chunks(text: str, references: List[ChunkRef], max_tokens: int) -> List[Tuple[str, Optional[int]]]:
+    """Chunk a new version of a text whose previous chunks are known only by ChunkRef
+
+    Previous chunks that still appear verbatim (in order) are kept as they
+    are so their summaries can be reused; only the text between them is
+    re-chunked. Returns (chunk, reference_index or None) pairs. Assumes the
+    previous chunks were made without overlap.
+    """
+    canonical = _join(_units(split_paragraphs(text), max_tokens))
+    aligned = []
+    cursor = 0
+
+    def add_gap(end):
+        gap = canonical[cursor:end]
+        if gap.strip():
+            aligned.extend((chunk, None) for chunk in chunk_text(gap, max_tokens))
+
+    for ref_index, ref in enumerate(references):
+        if not ref.prefix or math.ceil(ref.length / CHARS_PER_TOKEN) > max_tokens:
+            continue
+        position = canonical.find(ref.prefix, cursor)
+        while position >= 0 and not ref.matches(canonical, position):
+            position = canonical.find(ref.prefix, position + 1)
+        if position < 0:
+            continue
+        add_gap(position)
+        aligned.append((canonical[position:position + ref.length], ref_index))
+        cursor = position + ref.length
+    add_gap(len(canonical))
+    return aligned
+
+
+def chunk_stats(chunks: List[str], max_tokens: Optional[int] = None) -> Dict[str, float]:
+    """Summary statistics for a list of chunks"""
+    return size_stats([estimate_tokens(chunk) for chunk in chunks], max_tokens)
+
+
+def size_stats(sizes: List[int], max_tokens: Optional[int] = None) -> Dict[str, float]:
+    """chunk_stats from chunk sizes in tokens"""
+    stats = {
+        'chunks': len(sizes),
+        'total_tokens': sum(sizes),
+        'min_tokens': min(sizes) if sizes else 0,
+        'max_tokens': max(sizes) if sizes else 0,
+        'mean_tokens': round(sum(sizes) / len(sizes), 1) if sizes else 0
+    }
+    if max_tokens:
+        stats['budget_tokens'] = max_tokens
+        stats['fill_ratio'] = round(stats['mean_tokens'] / max_tokens, 3)
+    return stats
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Retries and a Circuit Breaker for LLM Calls
+Bounded retries with jittered exponential backoff for transient Ollama
+failures, and a breaker that holds every worker back while the server is
+down instead of letting each one burn its retries against a dead socket
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+from ollama_client import OllamaError
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(OllamaError):
+    """Raised when the server stayed unreachable for longer than a caller will wait"""
+
+
+class RetryPolicy:
+    """How many times to retry a failed call and how long to sleep in between
+
+    Delays use "full jitter": a uniform draw between zero and the capped
+    exponential delay, so workers that failed together do not retry together.
+    """
+
+    def __init__(self, retries: int = 3, base_delay: float = 2.0, max_delay: float = 60.0,
+                 rng: Optional[random.Random] = None):
+        self.retries = max(0, retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delays(self) -> Iterator[float]:
+        """Seconds to sleep before each retry"""
+        for attempt in range(self.retries):
+            yield self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Stops LLM calls after repeated failures and lets a single probe test recovery
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    ``wait()`` blocks every caller for ``cooldown`` seconds. Then one caller
+    is let through as a probe: success closes the breaker, failure reopens it
+    with the cooldown doubled (up to ``max_cooldown``). A caller that has
+    been held for more than ``max_wait`` seconds gets CircuitOpenError.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 15.0, max_cooldown: float = 120.0,
+                 max_wait: float = 900.0, log: Optional[Callable[[str], None]] = print):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.max_wait = max_wait
+        self.log = log
+        self.state = CLOSED
+        self.trips = 0
+
+        self._cond = threading.Condition()
+        self._failures = 0
+        self._cooldown = cooldown
+        self._opened_at = 0.0
+
+    def wait(self):
+        """Block until a call may be made; raises CircuitOpenError after max_wait seconds"""
+        deadline = time.monotonic() + self.max_wait
+        with self._cond:
+            while True:
+                if self.state == CLOSED:
+                    return
+                now = time.monotonic()
+                if self.state == OPEN and now >= self._opened_at + self._cooldown:
+                    self.state = HALF_OPEN  # this caller is the probe
+                    return
+                if now >= deadline:
+                    raise CircuitOpenError(f"Ollama unavailable for over {self.max_wait:.0f}s")
+                if self.state == OPEN:
+                    timeout = min(self._opened_at + self._cooldown, deadline) - now
+                else:
+                    timeout = deadline - now  # a probe is in flight
+                self._cond.wait(timeout)
+
+    def record_success(self):
+        with self._cond:
+            if self.state != CLOSED and self.log:
+                self.log("  🔌 Ollama is responding again; resuming LLM calls")
+            self.state = CLOSED
+            self._failures = 0
+            self._cooldown = self.base_cooldown
+            self._cond.notify_all()
+
+    def record_failure(self):
+        with self._cond:
+            self._failures += 1
+            if self.state == HALF_OPEN:
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._open()
+            elif self.state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.trips += 1
+        self._opened_at = time.monotonic()
+        if self.log:
+            self.log(f"  ⛔ Ollama failed {self._failures} times in a row; pausing LLM calls for {self._cooldown:.0f}s")
+        self._cond.notify_all()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client for the Local Ollama Server
+Replaces one `ollama run` subprocess per prompt with keep-alive connections
+to the Ollama HTTP API and streams tokens as they are generated
+"""
+
+import http.client
+import json
+import os
+import queue
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlparse
+
+DEFAULT_HOST = "http://127.0.0.1:11434"
+
+
+class OllamaError(RuntimeError):
+    """Raised when the Ollama server returns an error or an unusable response"""
+
+
+class OllamaClient:
+    """Thread-safe Ollama client backed by a pool of keep-alive connections
+
+    Each call borrows a connection from the pool, so a ThreadPoolExecutor
+    with N workers ends up holding at most N open sockets to the server.
+    """
+
+    def __init__(self, host: Optional[str] = None, model: str = "llama3",
+                 pool_size: int = 4, timeout: float = 600.0, options: Optional[dict] = None,
+                 keep_alive=None):
+        host = host or os.environ.get("OLLAMA_HOST") or DEFAULT_HOST
+        if "://" not in host:
+            host = f"http://{host}"
+        parsed = urlparse(host)
+        self.scheme = parsed.scheme
+        self.hostname = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 11434
+        self.model = model
+        self.timeout = timeout
+        self.options = options or {}
+        self.keep_alive = keep_alive  # e.g. "30m"; keeps the model and its prompt caches loaded
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _new_connection(self):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.hostname, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.hostname, self.port, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(self, conn, path: str, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        conn.request("POST", path, body=body, headers={
+            "Content-Type": "application/json",
+            "Connection": "keep-alive"
+        })
+        return conn.getresponse()
+
+    def stream(self, prompt: str, on_retry: Optional[Callable[[], None]] = None,
+               on_done: Optional[Callable[[dict], None]] = None, **params) -> Iterator[str]:
+        """Yield response tokens for prompt as the server generates them
+
+        on_retry, if given, is called when a stale pooled connection forces a
+        second attempt; on_done gets the final message, with Ollama's
+        prompt_eval_count/prompt_eval_duration/load_duration statistics.
+        """
+        payload = {"model": self.model, "prompt": prompt, "stream": True}
+        if self.options:
+            payload["options"] = self.options
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        payload.update(params)
+
+        conn = self._acquire()
+        reusable = False
+        try:
+            try:
+                response = self._post(conn, "/api/generate", payload)
+            except (http.client.HTTPException, ConnectionError):
+                # A pooled socket may have been closed by the server; retry once fresh
+                conn.close()
+                if on_retry:
+                    on_retry()
+                conn = self._new_connection()
+                response = self._post(conn, "/api/generate", payload)
+
+            if response.status != 200:
+                detail = response.read().decode('utf-8', errors='replace')
+                raise OllamaError(f"Ollama returned HTTP {response.status}: {detail}")
+
+            for line in response:
+                line = line.strip()
+                if not line:
+                    continue
+                message = json.loads(line)
+                if message.get("error"):
+                    raise OllamaError(message["error"])
+                token = message.get("response", "")
+                if token:
+                    yield token
+                if message.get("done"):
+                    if on_done:
+                        on_done(message)
+                    break
+
+            # Drain anything left so the connection can be reused
+            response.read()
+            reusable = not response.will_close
+        finally:
+            if reusable:
+                self._release(conn)
+            else:
+                conn.close()
+
+    def generate(self, prompt: str, on_token: Optional[Callable[[str], None]] = None,
+                 on_retry: Optional[Callable[[], None]] = None, on_done: Optional[Callable[[dict], None]] = None,
+                 **params) -> str:
+        """Return the full response for prompt, passing each token to on_token if given"""
+        tokens = []
+        for token in self.stream(prompt, on_retry=on_retry, on_done=on_done, **params):
+            tokens.append(token)
+            if on_token:
+                on_token(token)
+        return "".join(tokens).strip()
+
+    def close(self):
+        """Close every pooled connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Stub Ollama Server for Tests
+Speaks enough of the Ollama HTTP API (/api/generate, /api/tags) to exercise
+OllamaClient and the brief_cases.py scripts without a real model. With a
+prefill rate it also models model loading, keep_alive and per-slot prompt
+caches, so prompt-prefix reuse can be measured offline
+
+Usage:
+    python ollama_stub_server.py --port 11435
+    python ollama_stub_server.py --prefill-rate 2000 --load-time 2 --slots 4
+    OLLAMA_HOST=http://127.0.0.1:11435 python brief_cases.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+DEFAULT_KEEP_ALIVE_S = 300.0  # Ollama unloads an idle model after 5 minutes
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)(ms|s|m|h)?$')
+
+
+def parse_keep_alive(value, default: float = DEFAULT_KEEP_ALIVE_S) -> float:
+    """Seconds for an Ollama keep_alive value ("30m", "10s", 300, -1 for forever)"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float('inf') if value < 0 else float(value)
+    match = _DURATION.match(str(value).strip())
+    if not match:
+        return float('inf') if str(value).strip().startswith('-') else default
+    unit = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[match.group(2) or 's']
+    return float(match.group(1)) * unit
+
+
+def _common_prefix(a: List[str], b: List[str]) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class PromptCache:
+    """Model residency and per-slot prompt caches, like Ollama's runner
+
+    Each request takes the free slot whose cached tokens share the longest
+    prefix with its prompt and only pays prefill for the rest. An idle model
+    is unloaded (dropping every slot) once its keep_alive has passed.
+    Tokens are whitespace-separated words.
+    """
+
+    def __init__(self, slots: int = 1, load_time: float = 0.0, default_keep_alive: float = DEFAULT_KEEP_ALIVE_S):
+        self.load_time = load_time
+        self.default_keep_alive = default_keep_alive
+        self._cond = threading.Condition()
+        self._slots = [[] for _ in range(max(1, slots))]
+        self._busy = [False] * len(self._slots)
+        self._loaded = False
+        self._expires = 0.0
+        self._ready_at = 0.0
+
+    def acquire(self, tokens: List[str], keep_alive=None):
+        """(slot, cached prefix tokens, seconds spent loading the model)"""
+        with self._cond:
+            while all(self._busy):
+                self._cond.wait()
+            now = time.monotonic()
+            if not self._loaded or (now > self._expires and not any(self._busy)):
+                self._slots = [[] for _ in self._slots]
+                self._loaded = True
+                self._ready_at = now + self.load_time
+            load = max(0.0, self._ready_at - now)  # requests arriving mid-load wait for it too
+            free = [i for i, busy in enumerate(self._busy) if not busy]
+            slot = max(free, key=lambda i: _common_prefix(self._slots[i], tokens))
+            self._busy[slot] = True
+            return slot, _common_prefix(self._slots[slot], tokens), load
+
+    def release(self, slot: int, tokens: List[str], keep_alive=None):
+        with self._cond:
+            self._slots[slot] = tokens
+            self._busy[slot] = False
+            self._expires = time.monotonic() + parse_keep_alive(keep_alive, self.default_keep_alive)
+            self._cond.notify()
+
+
+def default_responder(prompt: str) -> str:
+    """Deterministic canned response that mentions how much text it was given"""
+    words = prompt.split()
+    return f"Stub summary of {len(words)} words beginning with {' '.join(words[:5])}."
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, payload: dict):
+        data = json.dumps(payload).encode('utf-8') + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": f"{self.server.model}:latest"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        with server.lock:
+            server.requests.append(request)
+
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        with server.lock:
+            failure = server.failures.pop(0) if server.failures else None
+        if failure:
+            status, error = failure
+            if status != 200:
+                self._send_json(status, {"error": error})
+                return
+            # Ollama reports errors after the headers as a stream line
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._write_chunk({"error": error})
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            return
+
+        prompt = request.get("prompt", "")
+        text = server.responder(prompt)
+        tokens = text.split(" ")
+        num_predict = (request.get("options") or {}).get("num_predict")
+        if num_predict is not None and num_predict >= 0:
+            tokens = tokens[:max(1, num_predict)]
+            text = " ".join(tokens)
+        stats = {"eval_count": len(tokens)}
+        if server.prompt_cache:
+            prompt_tokens = prompt.split()
+            slot, cached, load = server.prompt_cache.acquire(prompt_tokens, request.get("keep_alive"))
+            prefill = (len(prompt_tokens) - cached) / server.prefill_rate
+            time.sleep(load + prefill)
+            server.prompt_cache.release(slot, prompt_tokens, request.get("keep_alive"))
+            stats.update({
+                "load_duration": int(load * 1e9),
+                "prompt_eval_count": len(prompt_tokens) - cached,
+                "prompt_eval_duration": int(prefill * 1e9)
+            })
+        if server.latency:
+            time.sleep(server.latency)
+
+        if not request.get("stream", True):
+            self._send_json(200, {"model": request.get("model"), "response": text, "done": True, **stats})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if server.token_delay:
+                time.sleep(server.token_delay)
+            self._write_chunk({
+                "model": request.get("model"),
+                "response": token if i == 0 else f" {token}",
+                "done": False
+            })
+        self._write_chunk({
+            "model": request.get("model"),
+            "response": "",
+            "done": True,
+            **stats
+        })
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        if server.drop_connections:
+            # Close without a Connection: close header, like a server dropping idle sockets
+            self.close_connection = True
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    """In-process fake Ollama server; records every request it receives
+
+    fail_next() queues error responses and drop_connections makes it close
+    each connection after answering, for testing the client's error paths.
+
+    With prefill_rate (prompt tokens per second) set, prompt evaluation,
+    model loading and per-slot prompt caching are simulated as well.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 responder: Optional[Callable[[str], str]] = None,
+                 latency: float = 0.0, token_delay: float = 0.0, model: str = "llama3",
+                 prefill_rate: float = 0.0, load_time: float = 0.0, slots: int = 1,
+                 default_keep_alive: float = DEFAULT_KEEP_ALIVE_S):
+        super().__init__((host, port), _StubHandler)
+        self.responder = responder or default_responder
+        self.latency = latency
+        self.token_delay = token_delay
+        self.model = model
+        self.prefill_rate = prefill_rate
+        self.prompt_cache = PromptCache(slots, load_time, default_keep_alive) if prefill_rate else None
+        self.requests = []
+        self.connections = 0
+        self.failures = []
+        self.drop_connections = False
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, status: int, error: str):
+        """Answer the next /api/generate with an HTTP error, or with an error stream line for status 200"""
+        with self.lock:
+            self.failures.append((status, error))
+
+    def start(self):
+        """Serve in a background thread and return self"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before responding")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed tokens")
+    parser.add_argument("--prefill-rate", type=float, default=0.0, help="Prompt tokens per second; 0 = no prefill model")
+    parser.add_argument("--load-time", type=float, default=0.0, help="Seconds to load the model after it was unloaded")
+    parser.add_argument("--slots", type=int, default=1, help="Parallel slots, each with its own prompt cache")
+    parser.add_argument("--keep-alive", type=float, default=DEFAULT_KEEP_ALIVE_S, help="Default keep_alive seconds")
+    args = parser.parse_args()
+
+    server = StubOllamaServer(args.host, args.port, latency=args.latency, token_delay=args.token_delay,
+                              prefill_rate=args.prefill_rate, load_time=args.load_time, slots=args.slots,
+                              default_keep_alive=args.keep_alive)
+    print(f"🧪 Stub Ollama server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
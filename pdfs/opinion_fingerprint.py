@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Opinion Fingerprints for Duplicate Detection
+Normalized-text hashes catch the same opinion arriving twice, and MinHash
+signatures over word shingles catch near duplicates such as a modified
+opinion or a published re-issue of an unpublished one
+"""
+
+import hashlib
+import heapq
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SKETCH_SIZE = 128  # bottom-k MinHash: the k smallest shingle hashes
+SHINGLE_WORDS = 5
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase words separated by single spaces; drops punctuation, layout and page breaks"""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def minhash(hashes: set) -> Tuple[int, ...]:
+    """Bottom-k sketch: one hash function, keep the SKETCH_SIZE smallest values
+
+    Unlike one min per permutation this costs a single pass over the
+    shingles, which matters for multi-hundred-page records.
+    """
+    return tuple(heapq.nsmallest(SKETCH_SIZE, hashes))
+
+
+class Fingerprint:
+    """Exact and near-duplicate identity of one opinion's text"""
+
+    __slots__ = ('exact_hash', 'signature', '_members')
+
+    def __init__(self, exact_hash: str, signature: Tuple[int, ...]):
+        self.exact_hash = exact_hash
+        self.signature = signature
+        self._members = frozenset(signature)
+
+    @classmethod
+    def from_text(cls, text: str) -> "Fingerprint":
+        return cls.from_paragraphs([text])
+
+    @classmethod
+    def from_paragraphs(cls, paragraphs: Iterable[str]) -> "Fingerprint":
+        """Fingerprint text streamed paragraph by paragraph; equal to from_text of the whole text"""
+        digest = hashlib.sha256()
+        hashes = set()
+        tail = []  # last SHINGLE_WORDS - 1 words, so shingles span paragraph breaks
+        words_seen = 0
+        for paragraph in paragraphs:
+            words = normalize_text(paragraph).split()
+            if not words:
+                continue
+            digest.update(((" " if words_seen else "") + " ".join(words)).encode('utf-8'))
+            run = tail + words
+            hashes.update(zlib.crc32(" ".join(run[i:i + SHINGLE_WORDS]).encode('utf-8'))
+                          for i in range(len(run) - SHINGLE_WORDS + 1))
+            tail = run[-(SHINGLE_WORDS - 1):]
+            words_seen += len(words)
+        if 0 < words_seen < SHINGLE_WORDS:
+            hashes.add(zlib.crc32(" ".join(tail).encode('utf-8')))
+        return cls(digest.hexdigest(), minhash(hashes))
+
+    def similarity(self, other: "Fingerprint") -> float:
+        """Estimated Jaccard similarity of the two texts' shingle sets"""
+        if self.exact_hash == other.exact_hash:
+            return 1.0
+        # The k smallest hashes of the union are a uniform sample of it;
+        # count how many of them both texts contain
+        union = heapq.nsmallest(SKETCH_SIZE, self._members | other._members)
+        if not union:
+            return 0.0
+        same = sum(1 for value in union if value in self._members and value in other._members)
+        return same / len(union)
+
+    def signature_bytes(self) -> bytes:
+        return array('Q', self.signature).tobytes()
+
+    @classmethod
+    def from_stored(cls, exact_hash: str, signature: bytes) -> "Fingerprint":
+        values = array('Q')
+        values.frombytes(signature)
+        return cls(exact_hash, tuple(values))
+
+
+class DuplicateIndex:
+    """In-memory lookup of fingerprints by exact hash, then by estimated similarity"""
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self._exact: Dict[str, object] = {}
+        self._fingerprints: Dict[object, Fingerprint] = {}
+
+    def add(self, key, fingerprint: Fingerprint):
+        self._fingerprints[key] = fingerprint
+        self._exact.setdefault(fingerprint.exact_hash, key)
+
+    def match(self, fingerprint: Fingerprint) -> Optional[Tuple[object, float, bool]]:
+        """(key, similarity, exact) of the closest indexed text at or above the threshold, or None
+
+        Only an identical normalized text is exact; a MinHash estimate of 1.0 is not.
+        """
+        key = self._exact.get(fingerprint.exact_hash)
+        if key is not None:
+            return key, 1.0, True
+
+        best = None
+        for candidate, other in self._fingerprints.items():
+            if fingerprint._members.isdisjoint(other._members):
+                continue
+            similarity = fingerprint.similarity(other)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity, False)
+        return best
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Streaming Opinion Reader
+Reads opinion text files in fixed-size blocks and yields paragraphs as they
+are completed, so multi-hundred-page records never have to be held in
+memory as one string
+"""
+
+import hashlib
+import re
+from typing import Callable, Iterator, Optional
+
+READ_BLOCK_SIZE = 64 * 1024
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+
+
+def read_blocks(filepath, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """Text of a file block by block, decoded exactly like Path.read_text(encoding='utf-8', errors='ignore')"""
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            text = f.read(block_size)
+            if not text:
+                break
+            yield text
+
+
+def read_paragraphs(filepath, block_size: int = READ_BLOCK_SIZE,
+                    on_text: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+    """Yield the same paragraphs as chunker.split_paragraphs(read_text()) without reading the whole file
+
+    on_text, if given, is called with every decoded block (e.g. to hash the
+    text in the same pass).
+    """
+    pending = ""
+    for block in read_blocks(filepath, block_size):
+        if on_text:
+            on_text(block)
+        # Only the trailing whitespace of what is pending can start a separator
+        scan_from = len(pending.rstrip())
+        pending += block
+        start = 0
+        for match in _PARAGRAPH_SPLIT.finditer(pending, scan_from):
+            if match.end() == len(pending):
+                break  # the separator may continue into the next block
+            paragraph = pending[start:match.start()].strip()
+            if paragraph:
+                yield paragraph
+            start = match.end()
+        pending = pending[start:]
+
+    paragraph = pending.strip()
+    if paragraph:
+        yield paragraph
+
+
+def file_hash(filepath, block_size: int = READ_BLOCK_SIZE) -> str:
+    """sha256 of the decoded text; equal to brief_journal.text_hash(path.read_text(errors='ignore'))"""
+    digest = hashlib.sha256()
+    for block in read_blocks(filepath, block_size):
+        digest.update(block.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def text_hasher():
+    """(update, hexdigest) pair for hashing decoded blocks passed to read_paragraphs' on_text"""
+    digest = hashlib.sha256()
+    return (lambda block: digest.update(block.encode('utf-8'))), digest.hexdigest
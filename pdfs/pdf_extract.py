@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Parallel PDF-to-Text Extraction
+Extracts opinion PDFs page range by page range in a process pool, caches
+every page by the PDF's content hash so a re-run or an unchanged re-download
+costs nothing, and writes each opinion's .txt page by page as soon as the
+pages ahead of it are done, handing finished opinions to the brief pipeline
+while later PDFs are still being extracted
+
+Uses pypdf when it is installed, else poppler's pdftotext.
+
+Usage:
+    python pdf_extract.py                                   # published -> published_text, unpublished -> unpublished_text
+    python pdf_extract.py --dir published=published_text --workers 4
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from brief_cache import ChunkCache
+
+DEFAULT_PAGE_CACHE_DIR = Path(__file__).resolve().parent / ".page_cache"
+DEFAULT_PAGE_CACHE_MAX_MB = 256
+PAGES_PER_TASK = 8  # each task parses the PDF once, so very small ranges waste work
+PAGE_SEPARATOR = "\n\n"  # a paragraph break, so opinion_reader can split long opinions at page ends
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class PdfExtractError(Exception):
+    """Raised when no extraction backend is available or a PDF cannot be read"""
+
+
+def extraction_backend() -> Optional[str]:
+    """"pypdf", "pdftotext" or None"""
+    try:
+        import pypdf  # noqa: F401
+        return "pypdf"
+    except ImportError:
+        pass
+    if shutil.which("pdftotext") and shutil.which("pdfinfo"):
+        return "pdftotext"
+    return None
+
+
+def pdf_hash(pdf_path, block_size: int = HASH_BLOCK_SIZE) -> str:
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Worker functions run in the process pool, so they must stay at module level
+def page_count(pdf_path: str, backend: str) -> int:
+    if backend == "pypdf":
+        import pypdf
+        logging.getLogger("pypdf").setLevel(logging.ERROR)  # damaged xref tables are common and harmless
+        return len(pypdf.PdfReader(pdf_path).pages)
+    result = subprocess.run(["pdfinfo", pdf_path], capture_output=True, text=True, errors='ignore')
+    for line in result.stdout.splitlines():
+        if line.startswith("Pages:"):
+            return int(line.split(":", 1)[1])
+    raise PdfExtractError(f"pdfinfo could not read {pdf_path}: {result.stderr.strip()}")
+
+
+def extract_pages(pdf_path: str, backend: str, first: int, last: int) -> List[str]:
+    """Text of pages first..last (0-based, inclusive)"""
+    if backend == "pypdf":
+        import pypdf
+        logging.getLogger("pypdf").setLevel(logging.ERROR)
+        reader = pypdf.PdfReader(pdf_path)
+        return [(reader.pages[number].extract_text() or "") for number in range(first, last + 1)]
+    result = subprocess.run(["pdftotext", "-f", str(first + 1), "-l", str(last + 1), pdf_path, "-"],
+                            capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    if result.returncode != 0:
+        raise PdfExtractError(f"pdftotext failed on {pdf_path}: {result.stderr.strip()}")
+    pages = result.stdout.split("\f")  # pdftotext ends every page with a form feed
+    return (pages + [""] * (last - first + 1))[:last - first + 1]
+
+
+def case_number(filename) -> str:
+    """Leading case number of an opinion, text or brief file name, e.g. B330596 for B330596_(Case_Brief)_..."""
+    return Path(filename).name.split('_')[0].split('.')[0].upper()
+
+
+def extracted_case_numbers(text_dir) -> Set[str]:
+    """Case numbers with an opinion text or brief anywhere under text_dir
+
+    Briefed opinions are archived to subfolders and their names need not
+    match the PDF's (B330596_Nelson_v_Huhn_unpublished.pdf was briefed from
+    B330596_Trust_v_Huhn_unpublished.txt), so only the case number counts.
+    """
+    return {case_number(path.name) for path in Path(text_dir).rglob('*.txt')}
+
+
+def extraction_jobs(pdf_dir, text_dir) -> List[Tuple[Path, Path]]:
+    """(pdf, txt) pairs for the PDFs in pdf_dir whose case has no text or brief under text_dir yet"""
+    text_dir = Path(text_dir)
+    text_dir.mkdir(parents=True, exist_ok=True)
+    done = extracted_case_numbers(text_dir)
+    jobs = []
+    for pdf_path in sorted(Path(pdf_dir).glob('*.pdf')):
+        number = case_number(pdf_path.name)
+        if number not in done:
+            done.add(number)  # one text per case, even if two PDFs name it
+            jobs.append((pdf_path, text_dir / f"{pdf_path.stem}.txt"))
+    return jobs
+
+
+class _Document:
+    """One PDF being extracted: its pages so far and its .partial output"""
+
+    def __init__(self, pdf_path: Path, txt_path: Path, digest: str):
+        self.pdf_path = pdf_path
+        self.txt_path = txt_path
+        self.digest = digest
+        self.pages: Dict[int, str] = {}
+        self.total: Optional[int] = None
+        self.written = 0
+        self.cached = 0
+        self.failed = False
+        self.partial_path = txt_path.with_name(txt_path.name + ".partial")
+        self._out = None
+
+    def write_ready(self):
+        """Append every page that has no gap before it"""
+        if self._out is None:
+            self._out = open(self.partial_path, 'w', encoding='utf-8')
+        while self.written in self.pages:
+            if self.written:
+                self._out.write(PAGE_SEPARATOR)
+            self._out.write(self.pages.pop(self.written))
+            self.written += 1
+
+    @property
+    def done(self) -> bool:
+        return self.total is not None and self.written == self.total
+
+    def finish(self):
+        self._out.close()
+        os.replace(self.partial_path, self.txt_path)
+
+    def abandon(self):
+        if self._out is not None:
+            self._out.close()
+        try:
+            self.partial_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class PdfExtractor:
+    """Process pool plus page cache shared by every PDF in a batch"""
+
+    def __init__(self, cache_dir=DEFAULT_PAGE_CACHE_DIR, cache_max_mb: int = DEFAULT_PAGE_CACHE_MAX_MB,
+                 workers: Optional[int] = None, pages_per_task: int = PAGES_PER_TASK):
+        self.backend = extraction_backend()
+        self.cache = ChunkCache(cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.pages_per_task = max(1, pages_per_task)
+        self.pages_extracted = 0
+        self.pages_cached = 0
+
+    def _key(self, digest: str, what: str) -> str:
+        return ChunkCache.make_key(self.backend, "pdf", digest, what)
+
+    def _cached_pages(self, document: _Document):
+        count = self.cache.get(self._key(document.digest, "pages"))
+        if count is None:
+            return
+        document.total = int(count)
+        for number in range(document.total):
+            text = self.cache.get(self._key(document.digest, str(number)))
+            if text is not None:
+                document.pages[number] = text
+                document.cached += 1
+
+    def _missing_ranges(self, document: _Document) -> Iterator[Tuple[int, int]]:
+        """(first, last) runs of uncached pages, at most pages_per_task long"""
+        first = last = None
+        for number in range(document.total):
+            if number in document.pages:
+                continue
+            if first is not None and number == last + 1 and number - first < self.pages_per_task:
+                last = number
+                continue
+            if first is not None:
+                yield first, last
+            first = last = number
+        if first is not None:
+            yield first, last
+
+    def extract(self, jobs: Iterable[Tuple[Path, Path]]) -> Iterator[Tuple[Path, Path]]:
+        """Yield (pdf, txt) for each PDF once its text file is complete, in order of completion
+
+        A PDF that cannot be read is reported and skipped; its partial output is removed.
+        """
+        if self.backend is None:
+            raise PdfExtractError("No PDF backend: install pypdf (pip install pypdf) or poppler's pdftotext")
+        documents = []
+        for pdf_path, txt_path in jobs:
+            document = _Document(Path(pdf_path), Path(txt_path), pdf_hash(pdf_path))
+            self._cached_pages(document)
+            documents.append(document)
+        if not documents:
+            return
+
+        started = time.monotonic()
+        futures = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Page counts first, then page ranges in PDF order, so the pool
+            # works on every PDF while the earliest ones finish first
+            for document in documents:
+                if document.total is None:
+                    futures[pool.submit(page_count, str(document.pdf_path), self.backend)] = (document, None)
+                else:
+                    self._submit_ranges(pool, futures, document)
+            for document in documents:
+                if document.total is not None and not document.failed:
+                    yield from self._advance(document)
+
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    document, first = futures.pop(future)
+                    if document.failed:
+                        continue
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        document.failed = True
+                        document.abandon()
+                        print(f"  ⚠️ Could not extract {document.pdf_path.name}: {e}")
+                        continue
+                    if first is None:
+                        document.total = result
+                        self.cache.put(self._key(document.digest, "pages"), str(result))
+                        self._submit_ranges(pool, futures, document)
+                    else:
+                        for offset, text in enumerate(result):
+                            document.pages[first + offset] = text
+                            self.cache.put(self._key(document.digest, str(first + offset)), text)
+                        self.pages_extracted += len(result)
+                    yield from self._advance(document)
+
+        print(f"📑 Extracted {self.pages_extracted} pages ({self.pages_cached} from cache) "
+              f"from {len(documents)} PDFs in {time.monotonic() - started:.1f}s")
+
+    def _submit_ranges(self, pool, futures, document: _Document):
+        for first, last in self._missing_ranges(document):
+            futures[pool.submit(extract_pages, str(document.pdf_path), self.backend, first, last)] = (document, first)
+
+    def _advance(self, document: _Document) -> Iterator[Tuple[Path, Path]]:
+        document.write_ready()
+        if document.done:
+            document.finish()
+            self.pages_cached += document.cached
+            print(f"  📑 {document.pdf_path.name}: {document.total} pages → {document.txt_path.name}")
+            yield document.pdf_path, document.txt_path
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Extract opinion PDFs to text files for the brief pipeline")
+    parser.add_argument("--dir", action="append", metavar="PDFDIR=TEXTDIR",
+                        help="PDF directory and the text directory to write to; may be repeated")
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: CPU count)")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_PAGE_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    base = Path(__file__).resolve().parent
+    pairs = [entry.partition("=")[::2] for entry in args.dir or []]
+    if not pairs:
+        pairs = [(base / "published", base / "published_text"), (base / "unpublished", base / "unpublished_text")]
+    jobs = []
+    for pdf_dir, text_dir in pairs:
+        if not text_dir:
+            parser.error(f"expected PDFDIR=TEXTDIR, got {pdf_dir!r}")
+        jobs.extend(extraction_jobs(pdf_dir, text_dir))
+    if not jobs:
+        print("✅ Every PDF already has a text file")
+        return 0
+
+    extractor = PdfExtractor(args.cache_dir, workers=args.workers)
+    try:
+        extracted = sum(1 for _ in extractor.extract(jobs))
+    except PdfExtractError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0 if extracted == len(jobs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Hierarchical Map-Reduce for Chunk Summaries
+Merges chunk summaries in groups, level by level, until the whole set fits
+the final brief prompt's budget, so the final prompt stays bounded no
+matter how long the opinion is
+"""
+
+from functools import partial
+from typing import Callable, List
+
+from chunker import estimate_tokens
+
+MAX_LEVELS = 8
+
+
+def group_summaries(summaries: List[str], group_budget: int) -> List[List[str]]:
+    """Greedily pack consecutive summaries into groups that fit group_budget
+
+    Every group holds at least two summaries when there are two or more,
+    so each merge level is guaranteed to shrink the set.
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+    for summary in summaries:
+        tokens = estimate_tokens(summary) + 1
+        if len(current) >= 2 and current_tokens + tokens > group_budget:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(summary)
+        current_tokens += tokens
+    if current:
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        else:
+            groups.append(current)
+    return groups
+
+
+def reduce_summaries(summaries: List[str], final_budget: int, group_budget: int,
+                     merge: Callable[[int, List[str]], str]):
+    """Plan fragment for BriefScheduler: ``yield from`` it inside a file plan
+
+    Yields one batch of parallel merge calls per level and returns the
+    reduced list of summaries once their combined size fits final_budget.
+    ``merge(level, group)`` must return a single merged summary.
+    """
+    level = 0
+    while len(summaries) > 1 and level < MAX_LEVELS:
+        if estimate_tokens("\n\n".join(summaries)) <= final_budget:
+            break
+        groups = group_summaries(summaries, group_budget)
+        level += 1
+        merged = yield [partial(merge, level, group) for group in groups]
+        # Keep a failed merge's inputs so nothing is silently dropped
+        summaries = [summary or "\n\n".join(group) for summary, group in zip(merged, groups)]
+    return summaries
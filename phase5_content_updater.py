@@ -66,8 +66,8 @@ def run_comprehensive_updater():
 def manual_html_update(updater):
     """Manual HTML update as fallback"""
     try:
-        import json
         import re
+        from episode import episodes_json
         
         print("🔧 Performing manual HTML update...")
         
@@ -81,7 +81,7 @@ def manual_html_update(updater):
             html_content = f.read()
         
         # Convert episodes to JavaScript format
-        episodes_js = json.dumps(updater.all_episodes, indent=8)
+        episodes_js = episodes_json(updater.all_episodes)
         
         # Update episodes array in HTML
         pattern = r'const episodes = \[.*?\];'
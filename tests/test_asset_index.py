@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Website asset index tests
+Run with: python -m pytest tests/
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from asset_index import BRIEF, OPINION, PDF, TEXT, AssetIndex
+
+FILES = (
+    "texts/B333052_(Case_Brief)_Conservatorship_of_ANNE_S_(published).txt",
+    "texts/B333052_Conservatorship_of_ANNE_S_published.txt",
+    "texts/Notes_on_B341350.txt",
+    "texts/S282314_Estate_of_Bailey.txt",
+    "pdfs/published/B333052_Conservatorship_of_ANNE_S_published.pdf",
+    "pdfs/unpublished/B333052_Conservatorship_of_ANNE_S_unpublished.pdf",
+    "pdfs/unpublished/B341350_a_Minor_unpublished.pdf",
+)
+
+
+class AssetIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.website = Path(self.tmp.name)
+        for name in FILES:
+            self.add(name)
+        self.index = AssetIndex(self.website)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add(self, name: str):
+        path = self.website / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+
+    def test_case_assets_by_kind(self):
+        self.assertEqual(self.index.lookup("b333052", BRIEF),
+                         "texts/B333052_(Case_Brief)_Conservatorship_of_ANNE_S_(published).txt")
+        self.assertEqual(self.index.lookup("B333052", OPINION), "texts/B333052_Conservatorship_of_ANNE_S_published.txt")
+        self.assertEqual(self.index.lookup("S282314", OPINION), "texts/S282314_Estate_of_Bailey.txt")
+
+    def test_published_pdf_comes_first(self):
+        self.assertEqual(self.index.lookup("B333052", PDF), "pdfs/published/B333052_Conservatorship_of_ANNE_S_published.pdf")
+        self.assertEqual(self.index.lookup("B341350", PDF), "pdfs/unpublished/B341350_a_Minor_unpublished.pdf")
+
+    def test_case_number_anywhere_in_the_name_is_a_text_but_not_an_opinion(self):
+        self.assertEqual(self.index.lookup("B341350", TEXT), "texts/Notes_on_B341350.txt")
+        self.assertIsNone(self.index.lookup("B341350", OPINION))
+        self.assertIsNone(self.index.lookup("B341350", BRIEF))
+
+    def test_missing_assets(self):
+        self.assertIsNone(self.index.lookup("B999999", PDF))
+        self.assertIsNone(self.index.lookup("", TEXT))
+        self.assertIsNone(AssetIndex(self.website / "missing").lookup("B333052", PDF))
+
+    def test_file_name_lookups(self):
+        self.assertEqual(self.index.text_file("s282314_estate_of_bailey.txt", ignore_case=True),
+                         "texts/S282314_Estate_of_Bailey.txt")
+        self.assertIsNone(self.index.text_file("s282314_estate_of_bailey.txt"))
+        self.assertEqual(self.index.pdf_file("B341350_a_Minor_unpublished.pdf"),
+                         "pdfs/unpublished/B341350_a_Minor_unpublished.pdf")
+
+    def test_signature_changes_only_with_the_files(self):
+        signature = self.index.signature()
+        self.index.refresh()
+        self.assertEqual(self.index.signature(), signature)
+        self.add("texts/B400000_Estate_of_New_published.txt")
+        self.index.refresh()
+        self.assertNotEqual(self.index.signature(), signature)
+        self.assertEqual(self.index.lookup("B400000", OPINION), "texts/B400000_Estate_of_New_published.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Brief index tests
+Run with: python -m pytest tests/
+"""
+
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from brief_index import BriefIndex, export_csv, read_brief, scan_briefs
+
+JULY = "2025-07_Case_Briefs_(Published)"
+AUGUST = "2025-08_Case_Briefs_(Published)"
+
+
+class BriefIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.index = BriefIndex(self.dir / "brief_index.sqlite3")
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def brief(self, folder: str, case_number: str, text: str) -> Path:
+        path = self.dir / "published_text" / folder / f"{case_number}_(Case_Brief)_Estate_of_{case_number}_(published).txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def add(self, folder: str, case_number: str, text: str, metrics=None) -> Path:
+        path = self.brief(folder, case_number, text)
+        self.index.append([BriefIndex.record(path, case_number, f"Estate of {case_number}", "Published",
+                                             "journal_article", f"{case_number}.txt", metrics)])
+        return path
+
+    def test_brief_is_read_back_whole_after_it_is_rewritten(self):
+        path = self.add(JULY, "B1", "Short brief.")
+        path.write_text("A longer brief, rewritten since it was indexed.", encoding="utf-8")
+        record = self.index.latest("b1")
+        self.assertEqual(record['month'], "2025-07")
+        self.assertEqual(read_brief(record), "A longer brief, rewritten since it was indexed.")
+        path.unlink()
+        self.assertIsNone(read_brief(record))
+
+    def test_skipped_file_keeps_its_metrics(self):
+        self.add(JULY, "B1", "Brief.", {'chunks': 4, 'elapsed_s': 12.5})
+        self.add(JULY, "B1", "Brief.")
+        record = self.index.latest("B1")
+        self.assertEqual((record['chunks'], record['elapsed_s']), (4, 12.5))
+
+    def test_export_csv_by_folder(self):
+        self.add(JULY, "B1", "July brief, one.\nTwo lines.")
+        self.add(JULY, "B2", "Another July brief.")
+        self.add(AUGUST, "B3", "August brief.")
+        folder = self.dir / "published_text" / JULY
+        csv_path = folder / "0000-Brief_Summaries.csv"
+        self.assertEqual(export_csv(self.index, csv_path, folder=folder), 2)
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([(row['filename'], row['brief']) for row in rows],
+                         [("B1.txt", "July brief, one.\nTwo lines."), ("B2.txt", "Another July brief.")])
+
+    def test_scan_finds_briefs_written_before_the_index(self):
+        self.brief(JULY, "B1", "Old brief.")
+        self.brief(AUGUST, "B2", "Old brief.")
+        records = scan_briefs(self.dir / "published_text")
+        self.assertEqual(self.index.append(records, replace=False), 2)
+        self.assertEqual([record['month'] for record in self.index.records(status="Published")],
+                         ["2025-07", "2025-08"])
+
+
+if __name__ == "__main__":
+    unittest.main()
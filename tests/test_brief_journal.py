@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Brief journal resume tests
+Run with: python -m pytest tests/
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from brief_journal import ARCHIVING, DONE, PENDING, BriefJournal, text_hash
+
+OPINION = "B330596_Trust_v_Huhn_unpublished.txt"
+CHUNKS = ["First part of the opinion.", "Second part.", "Third part."]
+
+
+class BriefJournalResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.path = self.dir / "brief_journal.sqlite3"
+        self.opinion = self.dir / OPINION
+        self.journal = BriefJournal(self.path)
+
+    def tearDown(self):
+        self.journal.close()
+        self.tmp.cleanup()
+
+    def reopen(self):
+        """Simulate the batch dying and a new run opening the journal"""
+        self.journal.close()
+        self.journal = BriefJournal(self.path)
+
+    def start(self, source_hash: str = "v1"):
+        self.journal.start_file(self.opinion, "B330596", "unpublished", source_hash, len(CHUNKS),
+                                self.dir / "brief.txt", self.dir / "archive" / OPINION)
+
+    def summarize(self, count: int):
+        for index, chunk in enumerate(CHUNKS[:count]):
+            self.journal.record_chunk(self.opinion, index, text_hash(chunk), f"summary {index}")
+
+    def test_finished_chunks_are_reused_after_a_crash(self):
+        self.start()
+        self.summarize(2)
+        self.reopen()
+        self.start()
+        self.assertEqual(self.journal.get_file(self.opinion)['state'], PENDING)
+        self.assertEqual(self.journal.chunk_count(self.opinion), 2)
+        summaries = [self.journal.chunk_summary(self.opinion, i, text_hash(chunk)) for i, chunk in enumerate(CHUNKS)]
+        self.assertEqual(summaries, ["summary 0", "summary 1", None])
+
+    def test_changed_chunk_is_not_reused(self):
+        self.start()
+        self.summarize(1)
+        self.assertIsNone(self.journal.chunk_summary(self.opinion, 0, text_hash("Edited first part.")))
+
+    def test_changed_source_drops_every_chunk(self):
+        self.start("v1")
+        self.summarize(3)
+        self.reopen()
+        self.start("v2")
+        self.assertEqual(self.journal.chunk_count(self.opinion), 0)
+
+    def test_interrupted_archive_move_is_visible_after_a_crash(self):
+        self.start()
+        self.journal.set_state(self.opinion, ARCHIVING)
+        self.reopen()
+        record = self.journal.get_file(self.opinion)
+        self.assertEqual(record['state'], ARCHIVING)
+        self.assertEqual(record['archive_path'], str(self.dir / "archive" / OPINION))
+
+    def test_finish_drops_chunks(self):
+        self.start()
+        self.summarize(3)
+        self.journal.finish_file(self.opinion)
+        self.reopen()
+        self.assertEqual(self.journal.get_file(self.opinion)['state'], DONE)
+        self.assertEqual(self.journal.chunk_count(self.opinion), 0)
+
+    def test_fingerprints_are_kept_per_profile(self):
+        self.journal.record_fingerprint(self.opinion, "B330596", "unpublished", "hash", b"\x01\x02",
+                                        self.dir / "brief.txt", self.dir / "archive" / OPINION)
+        self.reopen()
+        [fingerprint] = self.journal.fingerprints("unpublished")
+        self.assertEqual((fingerprint['case_number'], fingerprint['signature']), ("B330596", b"\x01\x02"))
+        self.assertEqual(self.journal.fingerprints("published"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Brief manifest tests
+Run with: python -m pytest tests/
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from brief_manifest import BriefManifest, manifest_path
+from chunker import ChunkRef
+
+CHUNKS = ["First chunk of the opinion.", "Second chunk."]
+
+
+class BriefManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.brief_path = Path(self.tmp.name) / "B1_(Case_Brief)_Estate_of_X_(published).txt"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_keeps_the_chunking_key(self):
+        manifest = BriefManifest.build("source", "journal_article", "llama3", "chunking-v1",
+                                       [ChunkRef.of(chunk) for chunk in CHUNKS], ["one", "two"])
+        manifest.save(self.brief_path)
+        loaded = BriefManifest.load(self.brief_path)
+        self.assertEqual((loaded.source_hash, loaded.profile, loaded.model, loaded.chunking),
+                         ("source", "journal_article", "llama3", "chunking-v1"))
+        self.assertEqual([ref.hash for ref in loaded.references()], [ChunkRef.of(chunk).hash for chunk in CHUNKS])
+        self.assertEqual(loaded.summary(1), "two")
+
+    def test_manifest_without_a_chunking_key_still_loads(self):
+        manifest_path(self.brief_path).write_text(json.dumps({
+            "version": 1, "source_hash": "source", "profile": "journal_article", "model": "llama3", "chunks": []
+        }), encoding="utf-8")
+        loaded = BriefManifest.load(self.brief_path)
+        self.assertEqual(loaded.source_hash, "source")
+        self.assertIsNone(loaded.chunking)
+
+    def test_missing_or_unreadable_manifest(self):
+        self.assertIsNone(BriefManifest.load(self.brief_path))
+        manifest_path(self.brief_path).write_text("{not json", encoding="utf-8")
+        self.assertIsNone(BriefManifest.load(self.brief_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
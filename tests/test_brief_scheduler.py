@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+BriefScheduler admission order tests
+Run with: python -m pytest tests/
+"""
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from brief_scheduler import BriefScheduler
+
+PRIORITIES = {'blocker': 0, 'big': 1000, 'a': 1, 'b': 2, 'c': 3}
+GAP = 0.1  # seconds between the big file's arrival and the small ones'
+
+
+class Clock:
+    """Manual clock, so arrival times do not depend on thread timing"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def plan(wait: threading.Event = None):
+    """One stage with one task, which waits for the event if given"""
+    results = yield [lambda: wait.wait(5) if wait else None]
+    return len(results)
+
+
+def arrivals(clock: Clock):
+    """The big, low-priority file arrives with the blocker; the small ones GAP seconds later, before the blocker ends"""
+    all_arrived = threading.Event()
+    yield 'blocker', plan(all_arrived)
+    yield 'big', plan()
+    clock.now += GAP
+    for key in ('a', 'b', 'c'):
+        yield key, plan()
+    all_arrived.set()
+
+
+def admission_order(plans, aging: float, clock: Clock = None):
+    scheduler = BriefScheduler(max_workers=1, max_files_in_flight=1)
+    return [key for key, _ in scheduler.run(plans, priority=PRIORITIES.__getitem__, aging=aging,
+                                            clock=clock or Clock())]
+
+
+class AdmissionOrderTest(unittest.TestCase):
+    def test_priority_without_aging(self):
+        clock = Clock()
+        self.assertEqual(admission_order(arrivals(clock), 0, clock), ['blocker', 'a', 'b', 'c', 'big'])
+
+    def test_big_file_overtakes_newer_small_ones_once_it_has_waited(self):
+        # When the blocker finishes, big has waited GAP longer than a, worth 10,000 at this rate
+        clock = Clock()
+        self.assertEqual(admission_order(arrivals(clock), 100000, clock), ['blocker', 'big', 'a', 'b', 'c'])
+
+    def test_big_file_waits_while_the_head_start_is_too_small(self):
+        clock = Clock()
+        self.assertEqual(admission_order(arrivals(clock), 10, clock), ['blocker', 'a', 'b', 'c', 'big'])
+
+    def test_plans_listed_together_arrive_together(self):
+        plans = [('big', plan()), ('a', plan()), ('b', plan()), ('c', plan())]
+        self.assertEqual(admission_order(plans, 1e9), ['a', 'b', 'c', 'big'])
+
+    def test_input_order_without_priority(self):
+        scheduler = BriefScheduler(max_workers=2, max_files_in_flight=2)
+        plans = ((key, plan()) for key in ('big', 'a', 'b'))
+        self.assertEqual([key for key, _ in scheduler.run(plans)], ['big', 'a', 'b'])
+
+    def test_input_is_read_while_admitted_files_run(self):
+        delivered = threading.Event()
+
+        def extracted():
+            yield 'a', plan()
+            # The next PDF is still being extracted when a's brief is done
+            if not delivered.wait(5):
+                raise TimeoutError("a was not delivered while the input was busy")
+            yield 'b', plan()
+
+        scheduler = BriefScheduler(max_workers=1, max_files_in_flight=2)
+        keys = []
+        for key, _ in scheduler.run(extracted()):
+            keys.append(key)
+            delivered.set()
+        self.assertEqual(keys, ['a', 'b'])
+
+    def test_input_error_is_raised(self):
+        def broken():
+            yield 'a', plan()
+            raise ValueError("unreadable opinion")
+
+        with self.assertRaises(ValueError):
+            admission_order(broken(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Chunker tests
+Run with: python -m pytest tests/
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from chunker import ChunkRef, align_chunks, chunk_text, estimate_tokens, split_sentences
+
+OPINION = "\n\n".join(
+    f"Paragraph {n} holds that the trust was valid. The court in Estate of Smith (1999) 70 Cal.App.4th 1 "
+    f"agreed. See Prob. Code, § 15200, subd. (a)." for n in range(12)
+)
+
+
+class SplitSentencesTest(unittest.TestCase):
+    def test_citation_abbreviations_do_not_end_sentences(self):
+        self.assertEqual(split_sentences("In Smith v. Jones, supra, 70 Cal. 4th at p. 12, it ended! Affirmed. Costs."),
+                         ["In Smith v. Jones, supra, 70 Cal. 4th at p. 12, it ended!", "Affirmed.", "Costs."])
+
+    def test_initials_do_not_end_sentences(self):
+        self.assertEqual(split_sentences("Judge J. Smith ruled. Affirmed."), ["Judge J. Smith ruled.", "Affirmed."])
+
+
+class ChunkTextTest(unittest.TestCase):
+    def test_chunks_fit_the_budget_and_keep_every_paragraph(self):
+        chunks = chunk_text(OPINION, max_tokens=80)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(estimate_tokens(chunk) <= 80 for chunk in chunks))
+        self.assertEqual("\n\n".join(chunks), OPINION)
+
+    def test_long_paragraph_splits_on_sentences(self):
+        paragraph = " ".join(f"Sentence number {n} is here." for n in range(40))
+        chunks = chunk_text(paragraph, max_tokens=30)
+        self.assertTrue(all(chunk.endswith(".") for chunk in chunks))
+        self.assertEqual(" ".join(chunks), paragraph)
+
+    def test_overlong_sentence_is_hard_split(self):
+        chunks = chunk_text("word " * 200, max_tokens=20)
+        self.assertTrue(all(estimate_tokens(chunk) <= 20 for chunk in chunks))
+        self.assertEqual(" ".join(chunks).split(), ["word"] * 200)
+
+    def test_overlap_repeats_trailing_units(self):
+        chunks = chunk_text(OPINION, max_tokens=80, overlap_tokens=40)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertTrue(chunk.startswith(previous.split("\n\n")[-1]))
+
+
+class AlignChunksTest(unittest.TestCase):
+    def test_unchanged_chunks_are_reused_after_an_edit(self):
+        old = chunk_text(OPINION, max_tokens=80)
+        refs = [ChunkRef.of(chunk) for chunk in old]
+        edited = OPINION.replace("Paragraph 5 holds", "Paragraph 5, as modified, holds")
+        aligned = align_chunks(edited, refs, max_tokens=80)
+        reused = [index for _, index in aligned if index is not None]
+        self.assertEqual(len(reused), len(old) - 1)
+        self.assertEqual(reused, sorted(reused))
+        self.assertEqual("\n\n".join(chunk for chunk, _ in aligned), edited)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Episode store tests
+Run with: python -m pytest tests/
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from episode import BRIEF, CASE_BRIEF, OPINION, PODCAST, PROCESSED_CASE, Episode
+from episode_store import SITE_SOURCES, EpisodeStore
+
+
+def episode(case_number: str, type: str = OPINION, date: str = "2025-07-01", title: str = None) -> Episode:
+    return Episode(0, type, title or f"{case_number} {type}", "Court of Appeal", date, case_number,
+                   "Description", f"audio/{case_number}.mp3", f"text/{case_number}.txt")
+
+
+def shown(store: EpisodeStore):
+    return [(e.id, e.case_number, e.type, e.title) for e in store.episodes()]
+
+
+class EpisodeStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "episode_store.sqlite3"
+        self.store = EpisodeStore(self.path, SITE_SOURCES)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_one_episode_per_case_and_type_newest_first(self):
+        self.store.sync(CASE_BRIEF, [("B1", episode("B1", BRIEF, "2025-07-02"))], "v1")
+        self.store.sync(PODCAST, [
+            ("B1", episode("B1", OPINION, "2025-07-01")),
+            ("B2", episode("B2", OPINION, "2025-07-03")),
+            ("B2-dup", episode("B2", OPINION, "2025-07-03", title="later entry")),
+        ], "v1")
+        self.assertEqual(shown(self.store), [
+            (1, "B2", OPINION, "B2 opinion"),
+            (2, "B1", BRIEF, "B1 brief"),
+            (3, "B1", OPINION, "B1 opinion"),
+        ])
+
+    def test_earlier_source_wins(self):
+        self.store.sync(PODCAST, [("B1", episode("B1", title="podcast"))], "v1")
+        self.store.sync(CASE_BRIEF, [("B1", episode("B1", title="brief source"))], "v1")
+        self.assertEqual([e.title for e in self.store.episodes()], ["brief source"])
+
+    def test_fallback_only_fills_missing_case_numbers(self):
+        self.store.sync(PROCESSED_CASE, [("B1", episode("B1", BRIEF)), ("B2", episode("B2"))], "v1")
+        self.store.sync(PODCAST, [("B1", episode("B1"))], "v1")
+        self.assertEqual([(e.case_number, e.type) for e in self.store.episodes()], [("B2", OPINION), ("B1", OPINION)])
+        # Removing the podcast episode brings back what it was hiding
+        self.assertTrue(self.store.remove(PODCAST, "B1"))
+        self.assertEqual(len(self.store.episodes()), 2)
+
+    def test_sync_replaces_a_source_and_records_its_state(self):
+        self.store.sync(PODCAST, [("B1", episode("B1")), ("B2", episode("B2"))], "v1")
+        self.assertTrue(self.store.is_current(PODCAST, "v1"))
+        self.store.sync(PODCAST, [("B3", episode("B3"))], "v2")
+        self.assertFalse(self.store.is_current(PODCAST, "v1"))
+        self.assertEqual(self.store.count(PODCAST), 1)
+
+    def test_upsert_and_remove_clear_the_state_and_bump_the_revision(self):
+        self.store.sync(PODCAST, [("B1", episode("B1"))], "v1")
+        revision = self.store.revision()
+        self.store.upsert(PODCAST, "B1", episode("B1", title="corrected"))
+        self.store.upsert(PODCAST, "B2", episode("B2"))
+        self.assertFalse(self.store.is_current(PODCAST, "v1"))
+        self.assertEqual(self.store.revision(), revision + 2)
+        self.assertEqual([row['key'] for row in self.store.lookup("B1")], ["B1"])
+        self.assertEqual(self.store.lookup("B1")[0]['episode'].title, "corrected")
+        self.assertFalse(self.store.remove(PODCAST, "B9"))
+        self.assertEqual(self.store.revision(), revision + 2)
+
+    def test_episodes_survive_reopening(self):
+        self.store.sync(PODCAST, [("B1", episode("B1"))], "v1")
+        self.store.close()
+        self.store = EpisodeStore(self.path, SITE_SOURCES)
+        self.assertEqual([e.to_dict() for e in self.store.episodes()],
+                         [dict(episode("B1").to_dict(), id=1)])
+        self.assertTrue(self.store.is_current(PODCAST, "v1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
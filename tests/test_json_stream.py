@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON ingestion tests
+Run with: python -m pytest tests/
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from json_stream import iter_members, project
+
+DATA = {
+    "processed_cases": {
+        "B330596": {"title": "Trust v. Huhn", "file_info": {"audio_result": "a.mp3", "pdf": "x"}, "score": 12.5e3},
+        "S282314": {"title": "Estate of É \"Quoted\"", "nested": {"list": [1, 2.25, -3e-2, None, True]}},
+        "B341350": {"title": "a Minor", "file_info": "missing"}
+    },
+    "last_run": "2025-07-31",
+    "count": 3
+}
+
+
+class IterMembersTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "processed_cases.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text: str):
+        self.path.write_text(text, encoding="utf-8")
+
+    def test_matches_json_load_at_every_block_size(self):
+        self.write(json.dumps(DATA, indent=2))
+        expected = list(DATA["processed_cases"].items())
+        for block_size in (1, 2, 3, 7, 64, 1 << 20):
+            with self.subTest(block_size=block_size):
+                members = list(iter_members(self.path, ("processed_cases",), block_size=block_size))
+                self.assertEqual(members, expected)
+
+    def test_top_level_members(self):
+        self.write(json.dumps(DATA))
+        self.assertEqual([key for key, _ in iter_members(self.path, block_size=5)],
+                         ["processed_cases", "last_run", "count"])
+
+    def test_fields_are_projected(self):
+        self.write(json.dumps(DATA))
+        fields = {"title": None, "file_info": {"audio_result": None}}
+        members = dict(iter_members(self.path, ("processed_cases",), fields))
+        self.assertEqual(members["B330596"], {"title": "Trust v. Huhn", "file_info": {"audio_result": "a.mp3"}})
+        self.assertEqual(members["B341350"], {"title": "a Minor", "file_info": "missing"})
+        self.assertEqual(project([1], fields), [1])
+
+    def test_missing_or_non_object_prefix_yields_nothing(self):
+        self.write(json.dumps(DATA))
+        self.assertEqual(list(iter_members(self.path, ("processed_briefs",))), [])
+        self.assertEqual(list(iter_members(self.path, ("last_run",))), [])
+
+    def test_numbers_cut_by_the_buffer(self):
+        self.write('{"a": 12.75e2, "b": -0.5, "c": 100}')
+        for block_size in range(1, 12):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(list(iter_members(self.path, block_size=block_size)),
+                                 [("a", 1275.0), ("b", -0.5), ("c", 100)])
+
+    def test_empty_object(self):
+        self.write('{"processed_cases": {}}')
+        self.assertEqual(list(iter_members(self.path, ("processed_cases",))), [])
+
+    def test_malformed_json_raises_value_error(self):
+        for text in ('{"a": 1 "b": 2}', '{"a": 1}, 2', '{"a": [1, 2}', '{a: 1}'):
+            with self.subTest(text=text):
+                self.write(text)
+                with self.assertRaises(ValueError):
+                    list(iter_members(self.path, block_size=3))
+
+
+if __name__ == "__main__":
+    unittest.main()
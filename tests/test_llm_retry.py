@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Retry policy and circuit breaker tests
+Run with: python -m pytest tests/
+"""
+
+import random
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from llm_retry import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_delays_are_jittered_below_the_capped_exponential(self):
+        policy = RetryPolicy(retries=6, base_delay=2.0, max_delay=10.0, rng=random.Random(7))
+        delays = list(policy.delays())
+        self.assertEqual(len(delays), 6)
+        for attempt, delay in enumerate(delays):
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(10.0, 2.0 * 2 ** attempt))
+        self.assertEqual(len(set(delays)), 6)
+
+    def test_no_retries(self):
+        self.assertEqual(list(RetryPolicy(retries=-1).delays()), [])
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def breaker(self, **kwargs):
+        return CircuitBreaker(log=None, **kwargs)
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = self.breaker(failure_threshold=3, cooldown=60)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(breaker.trips, 1)
+
+    def test_open_breaker_holds_callers_until_max_wait(self):
+        breaker = self.breaker(failure_threshold=1, cooldown=60, max_wait=0.05)
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.wait()
+
+    def test_one_probe_after_the_cooldown(self):
+        breaker = self.breaker(failure_threshold=1, cooldown=0.01, max_wait=0.2)
+        breaker.record_failure()
+        breaker.wait()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        # A second caller waits for the probe's outcome
+        with self.assertRaises(CircuitOpenError):
+            breaker.wait()
+
+    def test_probe_success_releases_waiting_callers(self):
+        breaker = self.breaker(failure_threshold=1, cooldown=0.01, max_wait=5)
+        breaker.record_failure()
+        breaker.wait()
+        released = []
+        waiter = threading.Thread(target=lambda: released.append(breaker.wait()))
+        waiter.start()
+        breaker.record_success()
+        waiter.join(5)
+        self.assertEqual(released, [None])
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_probe_failure_doubles_the_cooldown_up_to_the_cap(self):
+        breaker = self.breaker(failure_threshold=1, cooldown=0.02, max_cooldown=0.05)
+        breaker.record_failure()
+        breaker.wait()
+        for cooldown in (0.04, 0.05):
+            breaker.record_failure()
+            self.assertEqual(breaker.state, OPEN)
+            started = time.monotonic()
+            breaker.wait()
+            self.assertGreaterEqual(time.monotonic() - started, cooldown * 0.9)
+            self.assertEqual(breaker.state, HALF_OPEN)
+
+    def test_success_resets_the_cooldown(self):
+        breaker = self.breaker(failure_threshold=1, cooldown=0.01)
+        breaker.record_failure()
+        breaker.wait()
+        breaker.record_failure()
+        breaker.wait()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.trips, 2)
+        breaker.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+OllamaClient tests against the in-process stub server
+Run with: python -m pytest tests/
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from ollama_client import OllamaClient, OllamaError
+from ollama_stub_server import StubOllamaServer
+
+
+class OllamaClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StubOllamaServer(responder=lambda prompt: f"Brief of {prompt}").start()
+        self.client = OllamaClient(host=self.server.url, pool_size=1, timeout=10)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_streamed_tokens_assemble_into_the_response(self):
+        tokens = []
+        done = []
+        text = self.client.generate("the opinion", on_token=tokens.append, on_done=done.append)
+        self.assertEqual(text, "Brief of the opinion")
+        self.assertEqual(tokens, ["Brief", " of", " the", " opinion"])
+        self.assertEqual(done[0]["eval_count"], 4)
+        self.assertTrue(self.server.requests[0]["stream"])
+
+    def test_options_and_keep_alive_are_sent(self):
+        client = OllamaClient(host=self.server.url, options={"num_predict": 2}, keep_alive="30m")
+        try:
+            self.assertEqual(client.generate("the opinion"), "Brief of")
+        finally:
+            client.close()
+        self.assertEqual(self.server.requests[0]["keep_alive"], "30m")
+
+    def test_connection_is_reused(self):
+        for prompt in ("one", "two", "three"):
+            self.client.generate(prompt)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_stale_pooled_connection_is_retried_once(self):
+        self.server.drop_connections = True
+        retries = []
+        self.client.generate("one", on_retry=lambda: retries.append(1))
+        self.assertEqual(self.client.generate("two", on_retry=lambda: retries.append(1)), "Brief of two")
+        self.assertEqual(retries, [1])
+        self.assertEqual(self.server.connections, 2)
+
+    def test_http_error_status_raises(self):
+        self.server.fail_next(500, "model runner crashed")
+        with self.assertRaisesRegex(OllamaError, "HTTP 500: .*model runner crashed"):
+            self.client.generate("one")
+        self.assertEqual(self.client.generate("two"), "Brief of two")
+
+    def test_missing_model_raises(self):
+        self.server.fail_next(404, "model 'llama3' not found")
+        with self.assertRaisesRegex(OllamaError, "HTTP 404"):
+            self.client.generate("one")
+
+    def test_error_stream_line_raises(self):
+        self.server.fail_next(200, "out of memory")
+        with self.assertRaisesRegex(OllamaError, "^out of memory$"):
+            self.client.generate("one")
+        self.assertEqual(self.client.generate("two"), "Brief of two")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+PDF extraction job selection tests
+Run with: python -m pytest tests/
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from pdf_extract import case_number, extraction_jobs
+
+
+class ExtractionJobsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.pdf_dir = root / "unpublished"
+        self.text_dir = root / "unpublished_text"
+        self.pdf_dir.mkdir()
+        self.text_dir.mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def touch(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("text", encoding="utf-8")
+
+    def jobs(self):
+        return [pdf.name for pdf, _ in extraction_jobs(self.pdf_dir, self.text_dir)]
+
+    def test_case_number(self):
+        self.assertEqual(case_number("B330596_Nelson_v_Huhn_unpublished.pdf"), "B330596")
+        self.assertEqual(case_number("B330596_(Case_Brief)_Trust_v_Huhn.txt"), "B330596")
+        self.assertEqual(case_number("s282314.pdf"), "S282314")
+
+    def test_new_pdf_is_extracted_next_to_the_text_dir(self):
+        self.touch(self.pdf_dir / "B341350_a_Minor_unpublished.pdf")
+        [(pdf, txt)] = extraction_jobs(self.pdf_dir, self.text_dir)
+        self.assertEqual(txt, self.text_dir / "B341350_a_Minor_unpublished.txt")
+
+    def test_archived_text_with_another_name_counts(self):
+        self.touch(self.pdf_dir / "B330596_Nelson_v_Huhn_unpublished.pdf")
+        self.touch(self.text_dir / "2025-07_(Unpublished)" / "B330596_Trust_v_Huhn_unpublished.txt")
+        self.assertEqual(self.jobs(), [])
+
+    def test_brief_counts(self):
+        self.touch(self.pdf_dir / "B330596_Nelson_v_Huhn_unpublished.pdf")
+        self.touch(self.text_dir / "2025-07_Case_Briefs_(Unpublished)" / "B330596_(Case_Brief)_Trust_v_Huhn.txt")
+        self.assertEqual(self.jobs(), [])
+
+    def test_one_text_per_case(self):
+        self.touch(self.pdf_dir / "B330596_Nelson_v_Huhn_unpublished.pdf")
+        self.touch(self.pdf_dir / "B330596_Nelson_v_Huhn_modified.pdf")
+        self.touch(self.pdf_dir / "B341350_a_Minor_unpublished.pdf")
+        self.assertEqual(self.jobs(), ["B330596_Nelson_v_Huhn_modified.pdf", "B341350_a_Minor_unpublished.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
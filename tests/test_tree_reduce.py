@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tree reduction tests
+Run with: python -m pytest tests/
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "pdfs"))
+from brief_scheduler import BriefScheduler
+from tree_reduce import group_summaries, reduce_summaries
+
+SUMMARY = "x" * 40  # 10 tokens
+
+
+def drive(fragment):
+    """Run a plan fragment inline, returning (batch sizes, result)"""
+    batches = []
+    try:
+        batch = next(fragment)
+        while True:
+            batches.append(len(batch))
+            batch = fragment.send([task() for task in batch])
+    except StopIteration as stop:
+        return batches, stop.value
+
+
+class GroupSummariesTest(unittest.TestCase):
+    def test_groups_fit_the_budget(self):
+        self.assertEqual([len(group) for group in group_summaries([SUMMARY] * 6, group_budget=22)], [2, 2, 2])
+
+    def test_every_group_has_two_summaries(self):
+        groups = group_summaries([SUMMARY] * 5, group_budget=1)
+        self.assertEqual([len(group) for group in groups], [2, 3])
+
+
+class ReduceSummariesTest(unittest.TestCase):
+    def test_summaries_that_fit_are_left_alone(self):
+        batches, result = drive(reduce_summaries([SUMMARY] * 3, 100, 22, lambda level, group: "merged"))
+        self.assertEqual(batches, [])
+        self.assertEqual(result, [SUMMARY] * 3)
+
+    def test_merges_level_by_level_until_it_fits(self):
+        def merge(level, group):
+            return f"L{level}:" + "y" * 36
+
+        batches, result = drive(reduce_summaries([SUMMARY] * 8, final_budget=25, group_budget=22, merge=merge))
+        self.assertEqual(batches, [4, 2])
+        self.assertEqual(len(result), 2)
+        self.assertTrue(all(summary.startswith("L2:") for summary in result))
+
+    def test_failed_merge_keeps_its_inputs(self):
+        batches, result = drive(reduce_summaries(["a" * 40, "b" * 40, "c" * 40, "d" * 40], final_budget=25,
+                                                 group_budget=22, merge=lambda level, group: None if level == 1 else "m"))
+        self.assertEqual(batches, [2, 1])
+        self.assertEqual(result, ["m"])
+
+    def test_runs_as_a_scheduler_plan(self):
+        def plan():
+            summaries = yield from reduce_summaries([SUMMARY] * 8, 25, 22, lambda level, group: "z" * 40)
+            return summaries
+
+        results = list(BriefScheduler(max_workers=2).run([('opinion', plan())]))
+        self.assertEqual(results, [('opinion', ["z" * 40, "z" * 40])])
+
+
+if __name__ == "__main__":
+    unittest.main()
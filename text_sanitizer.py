@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Shared Text Sanitizer
+One-pass cleanup of briefs, descriptions and titles for TTS and display,
+replacing the chains of re.sub calls that were repeated across
+brief_cases.py and the website updaters
+
+Each profile runs a prebuilt str.translate table for single-character
+removals, then at most one compiled alternation for the multi-character
+rules, then whitespace normalization. str.translate is only fast on ASCII
+text, so non-ASCII text falls back to a character class built from the
+same table when the table only deletes.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+Replacement = Union[str, Callable[[re.Match], str]]
+
+
+class SanitizerProfile:
+    """A named set of cleanup rules compiled once at import time"""
+
+    def __init__(self, name: str, delete: str = "", translate: Optional[Dict[str, str]] = None,
+                 rules: Optional[List[Tuple[str, Replacement]]] = None,
+                 collapse_whitespace: bool = True, post: Optional[Callable[[str], str]] = None):
+        self.name = name
+        table = {ord(ch): None for ch in delete}
+        for ch, replacement in (translate or {}).items():
+            table[ord(ch)] = replacement
+        self.table = table
+        self.delete_pattern = None
+        if delete and not translate:
+            self.delete_pattern = re.compile("[" + re.escape(delete) + "]+")
+        self.collapse_whitespace = collapse_whitespace
+        self.post = post
+
+        self.pattern = None
+        self.replacements = []
+        if rules:
+            groups = []
+            for index, (regex, replacement) in enumerate(rules):
+                groups.append(f"(?P<r{index}>{regex})")
+                self.replacements.append(replacement)
+            self.pattern = re.compile("|".join(groups))
+
+    def _replace(self, match: re.Match) -> str:
+        replacement = self.replacements[int(match.lastgroup[1:])]
+        return replacement(match) if callable(replacement) else replacement
+
+    def __call__(self, text: str) -> str:
+        if not text:
+            return ""
+        if self.table:
+            if self.delete_pattern is None or text.isascii():
+                text = text.translate(self.table)
+            else:
+                text = self.delete_pattern.sub("", text)
+        if self.pattern is not None:
+            text = self.pattern.sub(self._replace, text)
+        if self.collapse_whitespace:
+            text = " ".join(text.split())
+        if self.post:
+            text = self.post(text)
+        return text
+
+
+# Characters the TTS engine reads aloud or chokes on
+_FORMATTING_CHARS = (
+    "*"            # asterisks
+    "•▪▫◦‣⁃"       # bullet points
+    "─━┄┅┈┉"       # line characters
+    "▬▭▮▯▰▱"       # block characters
+    "[]{}"         # brackets
+    "#"            # hash marks
+)
+
+TTS = SanitizerProfile(
+    "tts",
+    delete=_FORMATTING_CHARS
+)
+
+# Whitespace runs (newlines included) collapsed to one space, nothing else changed
+WHITESPACE = SanitizerProfile("whitespace")
+
+PROFILES = {profile.name: profile for profile in (TTS, WHITESPACE)}
+
+# Titles are a few dozen characters, where a profile's per-match callback
+# costs more than it saves; two C-level substitutions and str methods win
+_TITLE_EXTENSION = re.compile(r"\.(?:pdf|txt|mp3)$", re.IGNORECASE)
+_TITLE_EDITION = re.compile(r"_published|_unpublished")
+
+
+def sanitize(text: str, profile: Union[str, SanitizerProfile] = TTS) -> str:
+    """Clean text with a profile object or its name ('tts', 'whitespace')"""
+    if isinstance(profile, str):
+        profile = PROFILES[profile]
+    return profile(text)
+
+
+def clean_title(title: str) -> str:
+    """Standardize an episode title, e.g. 'B333052_Estate_of_X_published.pdf' -> 'B333052 Estate Of X'"""
+    if not title:
+        return "Untitled Case"
+    title = _TITLE_EDITION.sub("", _TITLE_EXTENSION.sub("", title))
+    return " ".join(title.replace("_", " ").split()).title()